@@ -0,0 +1,212 @@
+"""
+Benchmark of the inference latency of saved PPO policies (e.g. the gain-scheduling policies in ``data/``),
+for single observations and batches, with the different ways of running the policy:
+
+- ``predict``: ``BasePolicy.predict()`` (eager PyTorch)
+- ``predictor``, ``predictor_no_grad``: ``PolicyPredictor`` with and without ``th.inference_mode()``
+- ``predictor_script``, ``predictor_compile``: ``PolicyPredictor`` with a TorchScript trace / ``th.compile()`` network
+- ``numpy``: deterministic actor exported to NumPy arrays (MLP policies only)
+
+For each policy, variant and batch size, it reports the p50/p99 latency of one call,
+the throughput (observations per second), the memory used by the variant
+and the max difference with the actions of ``predict()``.
+
+Usage: python -m benchmarks.bench_policy_inference --policies "data/policy-PPO5-v*/policy.zip" --output results.json
+"""
+import argparse
+import gc
+import glob
+import json
+import platform
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import torch as th
+from torch import nn
+
+import stable_baselines3 as sb3
+from stable_baselines3 import PPO
+from stable_baselines3.common.policies import ActorCriticPolicy, BasePolicy
+from stable_baselines3.common.torch_layers import FlattenExtractor
+
+try:
+    # Check memory used by the variants
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class NumpyMlpPolicy:
+    """
+    Deterministic actor of an MLP ``ActorCriticPolicy`` with a Gaussian action distribution,
+    exported to NumPy arrays: ``action_net(policy_net(obs))``, clipped to the action space.
+
+    :param policy: The policy to export
+    """
+
+    activations: Dict[type, Callable[[np.ndarray], np.ndarray]] = {
+        nn.Tanh: np.tanh,
+        nn.ReLU: lambda x: np.maximum(x, 0.0),
+        nn.Identity: lambda x: x,
+    }
+
+    def __init__(self, policy: ActorCriticPolicy):
+        assert isinstance(policy.pi_features_extractor, FlattenExtractor), "Only MLP policies can be exported"
+        assert not policy.use_sde and not policy.squash_output, "Only Gaussian action distributions can be exported"
+        self.layers: List[Callable[[np.ndarray], np.ndarray]] = []
+        for module in [*policy.mlp_extractor.policy_net, policy.action_net]:
+            if isinstance(module, nn.Linear):
+                weight = module.weight.detach().cpu().numpy().T.astype(np.float32)
+                bias = module.bias.detach().cpu().numpy().astype(np.float32)
+                self.layers.append(lambda x, weight=weight, bias=bias: x @ weight + bias)
+            else:
+                assert type(module) in self.activations, f"Unsupported layer {module}"
+                self.layers.append(self.activations[type(module)])
+        self.observation_dim = int(np.prod(policy.observation_space.shape))  # type: ignore[arg-type]
+        self.low = policy.action_space.low  # type: ignore[attr-defined]
+        self.high = policy.action_space.high  # type: ignore[attr-defined]
+
+    def __call__(self, observation: np.ndarray) -> np.ndarray:
+        x = np.asarray(observation, dtype=np.float32).reshape(-1, self.observation_dim)
+        for layer in self.layers:
+            x = layer(x)
+        return np.clip(x, self.low, self.high).reshape((*observation.shape[:-1], -1))
+
+
+def make_variants(policy: BasePolicy, max_batch_size: int) -> Dict[str, Callable[[], Callable[[np.ndarray], np.ndarray]]]:
+    """
+    :return: Factory of each variant, creating a function mapping observations to deterministic actions
+    """
+    return {
+        "predict": lambda: lambda obs: policy.predict(obs, deterministic=True)[0],
+        "predictor": lambda: policy.make_predictor(max_batch_size=max_batch_size),
+        "predictor_no_grad": lambda: policy.make_predictor(max_batch_size=max_batch_size, inference_mode=False),
+        "predictor_script": lambda: policy.make_predictor(max_batch_size=max_batch_size, backend="script"),
+        "predictor_compile": lambda: policy.make_predictor(max_batch_size=max_batch_size, backend="compile"),
+        "numpy": lambda: NumpyMlpPolicy(policy),  # type: ignore[arg-type]
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    if psutil is None:
+        return None
+    gc.collect()
+    return psutil.Process().memory_info().rss
+
+
+def time_calls(
+    predict: Callable[[np.ndarray], np.ndarray], observations: np.ndarray, n_calls: int, n_warmup: int
+) -> np.ndarray:
+    """
+    :return: Latency (in seconds) of each call
+    """
+    for _ in range(n_warmup):
+        predict(observations)
+    timings = np.zeros(n_calls)
+    for idx in range(n_calls):
+        start = time.perf_counter_ns()
+        predict(observations)
+        timings[idx] = time.perf_counter_ns() - start
+    return timings * 1e-9
+
+
+def benchmark_policy(path: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    # The schedules are not needed for inference (and may not be deserializable)
+    model = PPO.load(path, device=args.device, custom_objects={"lr_schedule": 0.0, "clip_range": 0.0})
+    policy = model.policy
+    policy.set_training_mode(False)
+    rng = np.random.default_rng(0)
+    n_params = sum(param.numel() for param in policy.parameters())
+    results = []
+    for name, make_variant in make_variants(policy, max(args.batch_sizes)).items():
+        if name not in args.variants:
+            continue
+        rss_before = rss_bytes()
+        try:
+            predict = make_variant()
+        except Exception as error:
+            print(f"{path} {name}: skipped ({type(error).__name__}: {error})")
+            continue
+        for batch_size in args.batch_sizes:
+            # Observations drawn around the origin, the observation space is usually unbounded
+            observations = rng.normal(size=(batch_size, *policy.observation_space.shape)).astype(np.float32)
+            if batch_size == 1 and not args.batched_single:
+                observations = observations[0]
+            reference, _ = policy.predict(observations, deterministic=True)
+            max_error = float(np.max(np.abs(np.asarray(predict(observations)) - reference)))
+            timings = time_calls(predict, observations, args.n_calls, args.n_warmup)
+            rss_after = rss_bytes()
+            results.append(
+                {
+                    "policy": path,
+                    "variant": name,
+                    "batch_size": batch_size,
+                    "n_calls": args.n_calls,
+                    "p50_us": 1e6 * float(np.percentile(timings, 50)),
+                    "p99_us": 1e6 * float(np.percentile(timings, 99)),
+                    "mean_us": 1e6 * float(np.mean(timings)),
+                    "throughput_obs_per_s": batch_size / float(np.mean(timings)),
+                    "n_params": n_params,
+                    "rss_delta_bytes": None if rss_before is None else rss_after - rss_before,  # type: ignore[operator]
+                    "max_abs_error": max_error,
+                }
+            )
+        del predict
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--policies", type=str, nargs="+", default=["data/policy-PPO5-v*/policy.zip"], help="Glob patterns")
+    parser.add_argument(
+        "--variants",
+        type=str,
+        nargs="+",
+        default=["predict", "predictor", "predictor_no_grad", "predictor_script", "predictor_compile", "numpy"],
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--batched-single", action="store_true", help="Pass single observations with a batch dimension")
+    parser.add_argument("--n-calls", type=int, default=2000)
+    parser.add_argument("--n-warmup", type=int, default=100)
+    parser.add_argument("--n-threads", type=int, default=1, help="Number of PyTorch threads, as in the control loop")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    th.set_num_threads(args.n_threads)
+    paths = sorted(path for pattern in args.policies for path in glob.glob(pattern))
+    assert len(paths) > 0, f"No policy found matching {args.policies}"
+
+    results = []
+    for path in paths:
+        results.extend(benchmark_policy(path, args))
+
+    print(f"{'policy':<32} {'variant':<18} {'batch':>5} {'p50 (us)':>10} {'p99 (us)':>10} {'obs/s':>12} {'error':>9}")
+    for result in results:
+        print(
+            f"{result['policy']:<32} {result['variant']:<18} {result['batch_size']:>5}"
+            f" {result['p50_us']:>10.1f} {result['p99_us']:>10.1f}"
+            f" {result['throughput_obs_per_s']:>12.0f} {result['max_abs_error']:>9.1e}"
+        )
+
+    if args.output is not None:
+        report = {
+            "system": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "torch": th.__version__,
+                "numpy": np.__version__,
+                "stable_baselines3": sb3.__version__,
+                "device": args.device,
+                "n_threads": args.n_threads,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as file_handler:
+            json.dump(report, file_handler, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
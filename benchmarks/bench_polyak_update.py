@@ -0,0 +1,107 @@
+"""
+Benchmark of the soft update of target networks (``polyak_update``),
+compared to the previous implementation looping over the parameters.
+
+On CPU, the update is memory bound and both implementations run at the same speed
+(within the noise of the measurements): the fused version only reduces the number of kernel launches,
+which is what matters on accelerators (e.g. CUDA).
+
+Usage: python -m benchmarks.bench_polyak_update --n-layers 2 --layer-size 256 --device cpu
+"""
+import argparse
+import time
+from typing import Callable, Iterable, List
+
+import numpy as np
+import torch as th
+from torch import nn
+
+from stable_baselines3.common.utils import polyak_update, zip_strict
+
+
+def polyak_update_loop(params: Iterable[th.Tensor], target_params: Iterable[th.Tensor], tau: float) -> None:
+    """
+    Previous implementation of ``polyak_update``: two kernels per parameter.
+    """
+    with th.no_grad():
+        for param, target_param in zip_strict(params, target_params):
+            target_param.data.mul_(1 - tau)
+            th.add(target_param.data, param.data, alpha=tau, out=target_param.data)
+
+
+def make_critic(n_critics: int, n_layers: int, layer_size: int, input_dim: int) -> nn.ModuleList:
+    """
+    Twin Q-networks, as in SAC/TD3.
+    """
+    critics = []
+    for _ in range(n_critics):
+        layers: List[nn.Module] = []
+        last_dim = input_dim
+        for _ in range(n_layers):
+            layers += [nn.Linear(last_dim, layer_size), nn.ReLU()]
+            last_dim = layer_size
+        layers.append(nn.Linear(last_dim, 1))
+        critics.append(nn.Sequential(*layers))
+    return nn.ModuleList(critics)
+
+
+def time_updates(update_fn: Callable, critic: nn.Module, critic_target: nn.Module, n_updates: int, device: th.device) -> float:
+    """
+    :return: Mean time of one update, in seconds
+    """
+    params, target_params = list(critic.parameters()), list(critic_target.parameters())
+    # Warmup
+    for _ in range(10):
+        update_fn(params, target_params, 0.005)
+    if device.type == "cuda":
+        th.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(n_updates):
+        update_fn(params, target_params, 0.005)
+    if device.type == "cuda":
+        th.cuda.synchronize()
+    return (time.perf_counter() - start) / n_updates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-critics", type=int, default=2)
+    parser.add_argument("--n-layers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--layer-size", type=int, default=256)
+    parser.add_argument("--input-dim", type=int, default=16)
+    parser.add_argument("--n-updates", type=int, default=2000)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    device = th.device(args.device)
+    implementations = {"loop": polyak_update_loop, "polyak_update": polyak_update}
+    print(f"n_critics={args.n_critics} layer_size={args.layer_size} device={device}")
+    for n_layers in args.n_layers:
+        critic = make_critic(args.n_critics, n_layers, args.layer_size, args.input_dim).to(device)
+        timings = {}
+        for name, update_fn in implementations.items():
+            critic_target = make_critic(args.n_critics, n_layers, args.layer_size, args.input_dim).to(device)
+            critic_target.load_state_dict(critic.state_dict())
+            timings[name] = time_updates(update_fn, critic, critic_target, args.n_updates, device)
+        n_params = len(list(critic.parameters()))
+        print(
+            f"n_layers={n_layers:<3} ({n_params:3d} tensors)"
+            + "".join(f" | {name}: {1e6 * timing:8.1f} us" for name, timing in timings.items())
+            + f" | speedup: {timings['loop'] / timings['polyak_update']:.2f}x"
+        )
+
+    # Both implementations give the same result
+    critic = make_critic(args.n_critics, 2, args.layer_size, args.input_dim)
+    critic_target = make_critic(args.n_critics, 2, args.layer_size, args.input_dim)
+    results = []
+    for update_fn in implementations.values():
+        target = make_critic(args.n_critics, 2, args.layer_size, args.input_dim)
+        target.load_state_dict(critic_target.state_dict())
+        update_fn(critic.parameters(), target.parameters(), 0.005)
+        results.append([param.detach().numpy() for param in target.parameters()])
+    same = all(np.array_equal(loop_param, fused_param) for loop_param, fused_param in zip(*results))
+    print(f"Same result as the loop: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark of the minibatch sampling cost of the rollout buffers, per epoch.
+
+Usage: python -m benchmarks.bench_rollout_buffer --n-envs 16 --n-steps 2048 --batch-size 64
+"""
+import argparse
+import time
+
+import numpy as np
+import torch as th
+from gymnasium import spaces
+
+from stable_baselines3.common.buffers import PackedRolloutBuffer, RolloutBuffer, TorchRolloutBuffer
+
+
+def fill_buffer(buffer: RolloutBuffer, rng: np.random.Generator) -> None:
+    obs_shape = buffer.obs_shape
+    for _ in range(buffer.buffer_size):
+        buffer.add(
+            rng.random((buffer.n_envs, *obs_shape), dtype=np.float32),
+            rng.random((buffer.n_envs, buffer.action_dim), dtype=np.float32),
+            rng.random(buffer.n_envs, dtype=np.float32),
+            np.zeros(buffer.n_envs, dtype=np.float32),
+            th.rand(buffer.n_envs, 1),
+            th.rand(buffer.n_envs),
+        )
+    buffer.compute_returns_and_advantage(last_values=th.zeros(buffer.n_envs, 1), dones=np.zeros(buffer.n_envs))
+
+
+def time_epochs(buffer: RolloutBuffer, n_epochs: int, batch_size: int) -> np.ndarray:
+    """
+    :return: Time (in seconds) needed to iterate over all minibatches, for each epoch
+    """
+    timings = np.zeros(n_epochs)
+    for epoch in range(n_epochs):
+        start = time.perf_counter()
+        for rollout_data in buffer.get(batch_size):
+            # Make sure the data is really materialized
+            rollout_data.observations.sum()
+        timings[epoch] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-envs", type=int, default=16)
+    parser.add_argument("--n-steps", type=int, default=2048)
+    parser.add_argument("--obs-dim", type=int, default=6)
+    parser.add_argument("--action-dim", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-epochs", type=int, default=10)
+    parser.add_argument("--n-rollouts", type=int, default=3)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    observation_space = spaces.Box(-1, 1, (args.obs_dim,), dtype=np.float32)
+    action_space = spaces.Box(-1, 1, (args.action_dim,), dtype=np.float32)
+    buffer_classes = {
+        "RolloutBuffer": (RolloutBuffer, {}),
+        "PackedRolloutBuffer": (PackedRolloutBuffer, {"n_epochs": args.n_epochs}),
+        "TorchRolloutBuffer": (TorchRolloutBuffer, {}),
+    }
+
+    print(f"n_envs={args.n_envs} n_steps={args.n_steps} batch_size={args.batch_size} n_epochs={args.n_epochs}")
+    for name, (buffer_class, kwargs) in buffer_classes.items():
+        buffer = buffer_class(
+            args.n_steps, observation_space, action_space, device=args.device, n_envs=args.n_envs, **kwargs
+        )
+        rng = np.random.default_rng(0)
+        # The first epoch of each rollout includes the preparation of the data (flatten, packing)
+        first_epochs, other_epochs = [], []
+        for _ in range(args.n_rollouts):
+            buffer.reset()
+            fill_buffer(buffer, rng)
+            timings = time_epochs(buffer, args.n_epochs, args.batch_size)
+            first_epochs.append(timings[0])
+            other_epochs.extend(timings[1:])
+        print(
+            f"{name:<20} first epoch: {1e3 * np.mean(first_epochs):8.2f} ms"
+            f" | next epochs: {1e3 * np.mean(other_epochs):8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
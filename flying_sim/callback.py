@@ -79,7 +79,7 @@ class CustomCallback(BaseCallback):
             plt.legend()
             plt.grid()
             plt.title('Step Reference Tracking')
-            self.logger.record(f"trajectory/trajectory_{i+1}_{self.num_timesteps}", Figure(figure, close=True), exclude=("stdout", "log", "json", "csv"))
+            self.logger.record(f"trajectory/trajectory_{i+1}_{self.num_timesteps}", Figure(figure, close=True), exclude=("stdout", "log", "json", "csv", "binary"))
             plt.close()
 
             success += info['reach_count']
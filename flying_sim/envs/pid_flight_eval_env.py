@@ -37,6 +37,7 @@ class PIDFlightEvalEnv(gym.Env):
         self.deviation_count = 0
         self.timeout_count = 0
         self.is_success = False
+        self.outcome = ""
 
         self.time = []
         self.reference = np.zeros((self.n_steps, 6))
@@ -80,6 +81,7 @@ class PIDFlightEvalEnv(gym.Env):
                 'deviation_count': self.deviation_count,
                 'timeout_count': self.timeout_count,
                 'is_success': self.is_success,
+                'outcome': self.outcome,
                 'train': self.train,
                 'log_interval': self.config.training.log_interval,
                 'num_steps': self.config.ppo.num_steps,
@@ -107,6 +109,7 @@ class PIDFlightEvalEnv(gym.Env):
         self.error = 0
 
         self.is_success = False
+        self.outcome = ""
 
         return observation, info
 
@@ -139,15 +142,18 @@ class PIDFlightEvalEnv(gym.Env):
             if self.train:
                 self.reach_count += 1
             self.is_success = True
+            self.outcome = "reached"
             # print("Goal reached with reward: {}".format(reward))
         elif deviated:
             # Drone became unstable and deviated from path
+            self.outcome = "deviated"
             reward = -5
             if self.train:
                 self.deviation_count += 1
             # print("Drone deviated with: {}".format(np.linalg.norm(self.drone.state[:2] - desired_state[:2])))
         elif terminated:
             # Drone did not reach goal in time
+            self.outcome = "timeout"
             reward = -1
             if self.train:
                 self.timeout_count += 1
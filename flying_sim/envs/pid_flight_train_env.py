@@ -38,6 +38,7 @@ class PIDFlightTrainEnv(gym.Env):
         self.deviation_count = 0
         self.timeout_count = 0
         self.is_success = False
+        self.outcome = ""
 
         self.time = []
         self.reference = np.zeros((self.n_steps, 6))
@@ -78,6 +79,7 @@ class PIDFlightTrainEnv(gym.Env):
                 'deviation_count': self.deviation_count,
                 'timeout_count': self.timeout_count,
                 'is_success': self.is_success,
+                'outcome': self.outcome,
                 'train': self.train,
                 'log_interval': self.config.training.log_interval,
                 'num_steps': self.config.ppo.num_steps,
@@ -105,6 +107,7 @@ class PIDFlightTrainEnv(gym.Env):
         self.error = 0
 
         self.is_success = False
+        self.outcome = ""
 
         return observation, info
 
@@ -136,15 +139,18 @@ class PIDFlightTrainEnv(gym.Env):
             if self.train:
                 self.reach_count += 1
             self.is_success = True
+            self.outcome = "reached"
             print("Goal reached with reward: {}".format(reward))
         elif deviated:
             # Drone became unstable and deviated from path
+            self.outcome = "deviated"
             reward = -5
             if self.train:
                 self.deviation_count += 1
             print("Drone deviated with: {}".format(deviation))
         elif terminated:
             # Drone did not reach goal in time
+            self.outcome = "timeout"
             reward = -1
             if self.train:
                 self.timeout_count += 1
@@ -6,6 +6,7 @@ import time
 import warnings
 from abc import ABC, abstractmethod
 from collections import deque
+from concurrent.futures import Future
 from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
 
 import gymnasium as gym
@@ -21,7 +22,13 @@ from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.common.noise import ActionNoise
 from stable_baselines3.common.policies import BasePolicy
 from stable_baselines3.common.preprocessing import check_for_nested_spaces, is_image_space, is_image_space_channels_first
-from stable_baselines3.common.save_util import load_from_zip_file, recursive_getattr, recursive_setattr, save_to_zip_file
+from stable_baselines3.common.save_util import (
+    load_from_zip_file,
+    recursive_getattr,
+    recursive_setattr,
+    save_checkpoint,
+    save_to_zip_file,
+)
 from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, Schedule, TensorDict
 from stable_baselines3.common.utils import (
     check_for_correct_spaces,
@@ -643,10 +650,11 @@ class BaseAlgorithm(ABC):
         custom_objects: Optional[Dict[str, Any]] = None,
         print_system_info: bool = False,
         force_reset: bool = True,
+        mmap: bool = False,
         **kwargs,
     ) -> SelfBaseAlgorithm:
         """
-        Load the model from a zip-file.
+        Load the model from a zip-file (or a directory written with ``save(..., as_directory=True)``).
         Warning: ``load`` re-creates the model from scratch, it does not update it in-place!
         For an in-place load use ``set_parameters`` instead.
 
@@ -666,6 +674,8 @@ class BaseAlgorithm(ABC):
         :param force_reset: Force call to ``reset()`` before training
             to avoid unexpected behavior.
             See https://github.com/DLR-RM/stable-baselines3/issues/597
+        :param mmap: Whether to memory-map the parameters, when loading from a directory
+            written with ``save(..., as_directory=True)``
         :param kwargs: extra arguments to change the model when loading
         :return: new model instance with loaded parameters
         """
@@ -678,6 +688,7 @@ class BaseAlgorithm(ABC):
             device=device,
             custom_objects=custom_objects,
             print_system_info=print_system_info,
+            mmap=mmap,
         )
 
         assert data is not None, "No data found in the saved file"
@@ -794,13 +805,20 @@ class BaseAlgorithm(ABC):
         path: Union[str, pathlib.Path, io.BufferedIOBase],
         exclude: Optional[Iterable[str]] = None,
         include: Optional[Iterable[str]] = None,
-    ) -> None:
+        asynchronous: bool = False,
+        as_directory: bool = False,
+    ) -> Optional[Future]:
         """
         Save all the attributes of the object and the model parameters in a zip-file.
 
         :param path: path to the file where the rl agent should be saved
         :param exclude: name of parameters that should be excluded in addition to the default ones
         :param include: name of parameters that might be excluded but should be included anyway
+        :param asynchronous: Whether to write the file in a background thread,
+            the parameters are copied to CPU memory first (see ``save_util.save_checkpoint()``)
+        :param as_directory: Whether to save to a directory instead of a zip-file,
+            whose tensors can be memory-mapped when loading
+        :return: When ``asynchronous``, a future that completes once the model is written
         """
         # Copy parameter list so we don't mutate the original dict
         data = self.__dict__.copy()
@@ -837,4 +855,15 @@ class BaseAlgorithm(ABC):
         # Build dict of state_dicts
         params_to_save = self.get_parameters()
 
+        if asynchronous or as_directory:
+            assert isinstance(path, (str, pathlib.Path)), "Only paths are supported for asynchronous or directory saves"
+            return save_checkpoint(
+                path,
+                data=data,
+                params=params_to_save,
+                pytorch_variables=pytorch_variables,
+                as_directory=as_directory,
+                asynchronous=asynchronous,
+            )
         save_to_zip_file(path, data=data, params=params_to_save, pytorch_variables=pytorch_variables)
+        return None
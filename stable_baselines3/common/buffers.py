@@ -1,4 +1,8 @@
+import os
+import shutil
+import tempfile
 import warnings
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
@@ -7,9 +11,11 @@ import torch as th
 from gymnasium import spaces
 
 from stable_baselines3.common.preprocessing import get_action_dim, get_obs_shape
+from stable_baselines3.common.segment_tree import MinSegmentTree, SumSegmentTree
 from stable_baselines3.common.type_aliases import (
     DictReplayBufferSamples,
     DictRolloutBufferSamples,
+    PrioritizedReplayBufferSamples,
     ReplayBufferSamples,
     RolloutBufferSamples,
 )
@@ -180,6 +186,8 @@ class ReplayBuffer(BaseBuffer):
     rewards: np.ndarray
     dones: np.ndarray
     timeouts: np.ndarray
+    # Whether the arrays are stored in RAM (checked against the available memory)
+    _stored_in_memory: bool = True
 
     def __init__(
         self,
@@ -209,24 +217,22 @@ class ReplayBuffer(BaseBuffer):
             )
         self.optimize_memory_usage = optimize_memory_usage
 
-        self.observations = np.zeros((self.buffer_size, self.n_envs, *self.obs_shape), dtype=observation_space.dtype)
+        self.observations = self._allocate("observations", (*self.obs_shape,), observation_space.dtype)
 
         if not optimize_memory_usage:
             # When optimizing memory, `observations` contains also the next observation
-            self.next_observations = np.zeros((self.buffer_size, self.n_envs, *self.obs_shape), dtype=observation_space.dtype)
+            self.next_observations = self._allocate("next_observations", (*self.obs_shape,), observation_space.dtype)
 
-        self.actions = np.zeros(
-            (self.buffer_size, self.n_envs, self.action_dim), dtype=self._maybe_cast_dtype(action_space.dtype)
-        )
+        self.actions = self._allocate("actions", (self.action_dim,), self._maybe_cast_dtype(action_space.dtype))
 
-        self.rewards = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.dones = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
+        self.rewards = self._allocate("rewards", (), np.float32)
+        self.dones = self._allocate("dones", (), np.float32)
         # Handle timeouts termination properly if needed
         # see https://github.com/DLR-RM/stable-baselines3/issues/284
         self.handle_timeout_termination = handle_timeout_termination
-        self.timeouts = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
+        self.timeouts = self._allocate("timeouts", (), np.float32)
 
-        if psutil is not None:
+        if psutil is not None and self._stored_in_memory:
             total_memory_usage: float = (
                 self.observations.nbytes + self.actions.nbytes + self.rewards.nbytes + self.dones.nbytes
             )
@@ -243,6 +249,17 @@ class ReplayBuffer(BaseBuffer):
                     f"replay buffer {total_memory_usage:.2f}GB > {mem_available:.2f}GB"
                 )
 
+    def _allocate(self, name: str, shape: Tuple[int, ...], dtype: np.typing.DTypeLike) -> np.ndarray:
+        """
+        Allocate the storage of a field of the buffer.
+
+        :param name: Name of the field (e.g. ``"observations"``)
+        :param shape: Shape of one element, the array has shape ``(buffer_size, n_envs, *shape)``
+        :param dtype: Data type of the array
+        :return: The zero-initialized array
+        """
+        return np.zeros((self.buffer_size, self.n_envs, *shape), dtype=dtype)
+
     def add(
         self,
         obs: np.ndarray,
@@ -303,9 +320,15 @@ class ReplayBuffer(BaseBuffer):
             batch_inds = np.random.randint(0, self.pos, size=batch_size)
         return self._get_samples(batch_inds, env=env)
 
-    def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> ReplayBufferSamples:
-        # Sample randomly the env idx
-        env_indices = np.random.randint(0, high=self.n_envs, size=(len(batch_inds),))
+    def _get_samples(
+        self,
+        batch_inds: np.ndarray,
+        env: Optional[VecNormalize] = None,
+        env_indices: Optional[np.ndarray] = None,
+    ) -> ReplayBufferSamples:
+        if env_indices is None:
+            # Sample randomly the env idx
+            env_indices = np.random.randint(0, high=self.n_envs, size=(len(batch_inds),))
 
         if self.optimize_memory_usage:
             next_obs = self._normalize_obs(self.observations[(batch_inds + 1) % self.buffer_size, env_indices, :], env)
@@ -339,6 +362,343 @@ class ReplayBuffer(BaseBuffer):
         return dtype
 
 
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Prioritized experience replay buffer (Schaul et al. 2016, https://arxiv.org/abs/1511.05952):
+    transitions are sampled with a probability proportional to ``priority ** alpha``,
+    the priorities (absolute TD errors) being stored in a sum-tree and a min-tree.
+    The samples contain the importance sampling weights to apply to the loss,
+    and the indices of the transitions to update their priorities (see ``update_priorities()``).
+
+    DQN, SAC and TD3 weight their critic loss and feed back the TD errors when using this buffer.
+
+    :param buffer_size: Max number of element in the buffer
+    :param observation_space: Observation space
+    :param action_space: Action space
+    :param device: PyTorch device
+    :param n_envs: Number of parallel environments
+    :param optimize_memory_usage: Not supported
+    :param handle_timeout_termination: Handle timeout termination (due to timelimit)
+        separately and treat the task as infinite horizon task.
+        https://github.com/DLR-RM/stable-baselines3/issues/284
+    :param alpha: How much prioritization is used (0: uniform sampling, 1: full prioritization)
+    :param beta: Initial importance sampling exponent (0: no correction, 1: full correction)
+    :param final_beta: Importance sampling exponent at the end of training,
+        ``beta`` is linearly annealed to it (see ``update_beta()``)
+    :param epsilon: Added to the priorities so every transition can be sampled
+    """
+
+    def __init__(
+        self,
+        buffer_size: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+        device: Union[th.device, str] = "auto",
+        n_envs: int = 1,
+        optimize_memory_usage: bool = False,
+        handle_timeout_termination: bool = True,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        final_beta: float = 1.0,
+        epsilon: float = 1e-6,
+    ):
+        if optimize_memory_usage:
+            raise ValueError("PrioritizedReplayBuffer does not support optimize_memory_usage = True")
+        super().__init__(
+            buffer_size,
+            observation_space,
+            action_space,
+            device,
+            n_envs=n_envs,
+            optimize_memory_usage=optimize_memory_usage,
+            handle_timeout_termination=handle_timeout_termination,
+        )
+        self.alpha = alpha
+        self.initial_beta = beta
+        self.beta = beta
+        self.final_beta = final_beta
+        self.epsilon = epsilon
+        # One leaf per transition, at index ``pos * n_envs + env_idx``
+        self.sum_tree = SumSegmentTree(self.buffer_size * self.n_envs)
+        self.min_tree = MinSegmentTree(self.buffer_size * self.n_envs)
+        self.max_priority = 1.0
+
+    def update_beta(self, progress_remaining: float) -> None:
+        """
+        Anneal the importance sampling exponent linearly from ``beta`` to ``final_beta``.
+
+        :param progress_remaining: Remaining progress of the training (from 1 to 0)
+        """
+        self.beta = self.final_beta + (self.initial_beta - self.final_beta) * progress_remaining
+
+    def add(
+        self,
+        obs: np.ndarray,
+        next_obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        done: np.ndarray,
+        infos: List[Dict[str, Any]],
+    ) -> None:
+        # New transitions get the max priority so they are sampled at least once
+        indices = self.pos * self.n_envs + np.arange(self.n_envs)
+        self.sum_tree[indices] = self.max_priority**self.alpha
+        self.min_tree[indices] = self.max_priority**self.alpha
+        super().add(obs, next_obs, action, reward, done, infos)
+
+    def sample(  # type: ignore[override]
+        self,
+        batch_size: int,
+        env: Optional[VecNormalize] = None,
+    ) -> PrioritizedReplayBufferSamples:
+        """
+        Sample elements from the replay buffer, proportionally to their priority.
+
+        :param batch_size: Number of element to sample
+        :param env: associated gym VecEnv
+            to normalize the observations/rewards when sampling
+        :return:
+        """
+        n_transitions = self.size() * self.n_envs
+        total_priority = self.sum_tree.reduce()
+        # Stratified sampling: one sample per segment of the total priority
+        prefixsums = (np.arange(batch_size) + np.random.uniform(size=batch_size)) * (total_priority / batch_size)
+        # Guard against rounding errors, the filled leaves come first
+        indices = np.minimum(self.sum_tree.find_prefixsum_idx(prefixsums), n_transitions - 1)
+
+        # Importance sampling weights, normalized by the max weight
+        probabilities = self.sum_tree[indices] / total_priority
+        min_probability = self.min_tree.reduce() / total_priority
+        weights = (probabilities / min_probability) ** (-self.beta)
+
+        samples = self._get_samples(indices // self.n_envs, env=env, env_indices=indices % self.n_envs)
+        return PrioritizedReplayBufferSamples(
+            **samples._asdict(),
+            weights=self.to_torch(weights.astype(np.float32).reshape(-1, 1)),
+            indices=indices,
+        )
+
+    def update_priorities(self, indices: np.ndarray, priorities: Union[np.ndarray, th.Tensor]) -> None:
+        """
+        Update the priorities of sampled transitions.
+
+        :param indices: Indices of the transitions (``indices`` field of the samples)
+        :param priorities: New priorities, usually the absolute TD errors
+        """
+        if isinstance(priorities, th.Tensor):
+            priorities = priorities.detach().cpu().numpy()
+        priorities = np.abs(priorities).flatten() + self.epsilon
+        self.sum_tree[indices] = priorities**self.alpha
+        self.min_tree[indices] = priorities**self.alpha
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+
+class NStepReplayBuffer(ReplayBuffer):
+    """
+    Replay buffer computing n-step returns at sample time:
+    the rewards of the (up to) ``n_steps`` transitions following a sampled one are discounted and summed,
+    and the value is bootstrapped from the last observation with a discount of ``gamma ** n``.
+    The accumulation stops at the end of an episode (termination or timeout)
+    and at the most recent transition of the env.
+    The samples contain the discount factors to apply to the bootstrapped value.
+
+    :param buffer_size: Max number of element in the buffer
+    :param observation_space: Observation space
+    :param action_space: Action space
+    :param device: PyTorch device
+    :param n_envs: Number of parallel environments
+    :param optimize_memory_usage: Not supported
+    :param handle_timeout_termination: Handle timeout termination (due to timelimit)
+        separately and treat the task as infinite horizon task.
+        https://github.com/DLR-RM/stable-baselines3/issues/284
+    :param n_steps: Number of steps of the returns
+    :param gamma: Discount factor (set to the one of the algorithm by off-policy algorithms)
+    """
+
+    def __init__(
+        self,
+        buffer_size: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+        device: Union[th.device, str] = "auto",
+        n_envs: int = 1,
+        optimize_memory_usage: bool = False,
+        handle_timeout_termination: bool = True,
+        n_steps: int = 3,
+        gamma: float = 0.99,
+    ):
+        if optimize_memory_usage:
+            raise ValueError("NStepReplayBuffer does not support optimize_memory_usage = True")
+        super().__init__(
+            buffer_size,
+            observation_space,
+            action_space,
+            device,
+            n_envs=n_envs,
+            optimize_memory_usage=optimize_memory_usage,
+            handle_timeout_termination=handle_timeout_termination,
+        )
+        self.n_steps = n_steps
+        self.gamma = gamma
+
+    def _get_samples(
+        self,
+        batch_inds: np.ndarray,
+        env: Optional[VecNormalize] = None,
+        env_indices: Optional[np.ndarray] = None,
+    ) -> ReplayBufferSamples:
+        if env_indices is None:
+            # Sample randomly the env idx
+            env_indices = np.random.randint(0, high=self.n_envs, size=(len(batch_inds),))
+
+        # Indices of the n transitions following each sampled one, shape (batch_size, n_steps)
+        steps = np.arange(self.n_steps)
+        step_inds = (batch_inds[:, np.newaxis] + steps) % self.buffer_size
+        env_inds = env_indices[:, np.newaxis]
+        dones = self.dones[step_inds, env_inds]
+        # Number of transitions after each sampled one (included) that were already written
+        n_available = (self.pos - batch_inds - 1) % self.buffer_size + 1
+        # Stop after the end of the episode and before the write position
+        dones_before = np.cumsum(dones, axis=1) - dones
+        mask = (dones_before == 0) & (steps < n_available[:, np.newaxis])
+
+        n_valid = mask.sum(axis=1)
+        last_inds = step_inds[np.arange(len(batch_inds)), n_valid - 1]
+        rewards = (self._normalize_reward(self.rewards[step_inds, env_inds], env) * mask * self.gamma**steps).sum(axis=1)
+        # Only use dones that are not due to timeouts
+        # deactivated by default (timeouts is initialized as an array of False)
+        last_dones = self.dones[last_inds, env_indices] * (1 - self.timeouts[last_inds, env_indices])
+
+        data = (
+            self._normalize_obs(self.observations[batch_inds, env_indices, :], env),
+            self.actions[batch_inds, env_indices, :],
+            self._normalize_obs(self.next_observations[last_inds, env_indices, :], env),
+            last_dones.reshape(-1, 1),
+            rewards.astype(np.float32).reshape(-1, 1),
+            (self.gamma**n_valid).astype(np.float32).reshape(-1, 1),
+        )
+        return ReplayBufferSamples(*tuple(map(self.to_torch, data)))
+
+
+class MemmapReplayBuffer(ReplayBuffer):
+    """
+    Replay buffer whose arrays are memory-mapped ``.npy`` files in a directory,
+    so its capacity is limited by the disk instead of the RAM.
+
+    Pickling the buffer (for instance with ``save_replay_buffer()``) copies the arrays
+    to a new snapshot directory next to ``storage_dir`` (``<storage_dir>_snapshot_<suffix>``)
+    and only stores its location, so later writes to the buffer do not change the saved data.
+    Unpickling it (``load_replay_buffer()``) copies the snapshot to a new temporary directory
+    and maps the copy: the snapshot must not be moved or deleted in between, and it is left untouched.
+    The temporary directories created by the buffer are removed by ``close()``
+    (or when the buffer is garbage collected).
+
+    :param buffer_size: Max number of element in the buffer
+    :param observation_space: Observation space
+    :param action_space: Action space
+    :param device: PyTorch device
+    :param n_envs: Number of parallel environments
+    :param optimize_memory_usage: Enable a memory efficient variant (see ``ReplayBuffer``)
+    :param handle_timeout_termination: Handle timeout termination (due to timelimit)
+        separately and treat the task as infinite horizon task.
+        https://github.com/DLR-RM/stable-baselines3/issues/284
+    :param storage_dir: Directory where the arrays are stored (created if needed,
+        existing arrays are overwritten). If None, a temporary directory is created.
+    """
+
+    _stored_in_memory = False
+
+    def __init__(
+        self,
+        buffer_size: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+        device: Union[th.device, str] = "auto",
+        n_envs: int = 1,
+        optimize_memory_usage: bool = False,
+        handle_timeout_termination: bool = True,
+        storage_dir: Optional[str] = None,
+    ):
+        self._cleanup: Optional[weakref.finalize] = None
+        if storage_dir is None:
+            storage_dir = self._make_temporary_storage()
+        os.makedirs(storage_dir, exist_ok=True)
+        self.storage_dir = storage_dir
+        # Names of the memory-mapped arrays
+        self._array_names: List[str] = []
+        super().__init__(
+            buffer_size,
+            observation_space,
+            action_space,
+            device,
+            n_envs=n_envs,
+            optimize_memory_usage=optimize_memory_usage,
+            handle_timeout_termination=handle_timeout_termination,
+        )
+
+    def _allocate(self, name: str, shape: Tuple[int, ...], dtype: np.typing.DTypeLike) -> np.ndarray:
+        self._array_names.append(name)
+        # The file is sparse: disk space is only used once the elements are written
+        return np.lib.format.open_memmap(
+            self._array_path(name), mode="w+", dtype=dtype, shape=(self.buffer_size, self.n_envs, *shape)
+        )
+
+    def _make_temporary_storage(self) -> str:
+        """
+        Create a temporary storage directory, removed with the buffer.
+
+        :return: Path of the directory
+        """
+        storage_dir = tempfile.mkdtemp(prefix="sb3_replay_buffer_")
+        self._cleanup = weakref.finalize(self, shutil.rmtree, storage_dir, ignore_errors=True)
+        return storage_dir
+
+    def _array_path(self, name: str, storage_dir: Optional[str] = None) -> str:
+        return os.path.join(self.storage_dir if storage_dir is None else storage_dir, f"{name}.npy")
+
+    def flush(self) -> None:
+        """
+        Write the pending changes of the arrays to disk.
+        """
+        for name in self._array_names:
+            getattr(self, name).flush()
+
+    def close(self) -> None:
+        """
+        Unmap the arrays and remove the storage directory if it was created by the buffer.
+        The buffer cannot be used afterward.
+        """
+        for name in self._array_names:
+            if hasattr(self, name):
+                delattr(self, name)
+        if self._cleanup is not None:
+            self._cleanup()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.flush()
+        # Snapshot of the arrays, the storage keeps being written after the buffer is saved
+        storage_dir = os.path.abspath(self.storage_dir).rstrip(os.sep)
+        snapshot_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(storage_dir)}_snapshot_", dir=os.path.dirname(storage_dir))
+        for name in self._array_names:
+            shutil.copyfile(self._array_path(name), self._array_path(name, snapshot_dir))
+        state = self.__dict__.copy()
+        state["storage_dir"] = snapshot_dir
+        del state["_cleanup"]
+        for name in self._array_names:
+            del state[name]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        # Work on a copy, so the snapshot can be loaded again
+        snapshot_dir = self.storage_dir
+        self._cleanup = None
+        self.storage_dir = self._make_temporary_storage()
+        for name in self._array_names:
+            shutil.copyfile(self._array_path(name, snapshot_dir), self._array_path(name))
+            setattr(self, name, np.load(self._array_path(name), mmap_mode="r+"))
+
+
 class RolloutBuffer(BaseBuffer):
     """
     Rollout buffer used in on-policy algorithms like A2C/PPO.
@@ -396,6 +756,8 @@ class RolloutBuffer(BaseBuffer):
         self.values = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
         self.log_probs = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
         self.advantages = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
+        # Next position of each env, only used by ``add_envs()``
+        self.env_pos = np.zeros(self.n_envs, dtype=np.int64)
         self.generator_ready = False
         super().reset()
 
@@ -477,6 +839,50 @@ class RolloutBuffer(BaseBuffer):
         if self.pos == self.buffer_size:
             self.full = True
 
+    def add_envs(
+        self,
+        env_indices: np.ndarray,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        episode_start: np.ndarray,
+        value: th.Tensor,
+        log_prob: th.Tensor,
+    ) -> None:
+        """
+        Add a transition for a subset of the envs only, when the envs
+        do not step in lock-step (asynchronous ``VecEnv``).
+        Each env fills its own column of the buffer, so its trajectory stays contiguous,
+        the buffer is full once every env has added ``buffer_size`` transitions.
+
+        :param env_indices: Indices of the envs the transitions come from
+        :param obs: Observation
+        :param action: Action
+        :param reward:
+        :param episode_start: Start of episode signal.
+        :param value: estimated value of the current state
+            following the current policy.
+        :param log_prob: log probability of the action
+            following the current policy.
+        """
+        n_envs = len(env_indices)
+        if isinstance(self.observation_space, spaces.Discrete):
+            obs = obs.reshape((n_envs, *self.obs_shape))
+        action = action.reshape((n_envs, self.action_dim))
+
+        positions = self.env_pos[env_indices]
+        assert np.all(positions < self.buffer_size), "The rollout buffer is already full for some of the envs"
+        self.observations[positions, env_indices] = obs
+        self.actions[positions, env_indices] = action
+        self.rewards[positions, env_indices] = reward
+        self.episode_starts[positions, env_indices] = episode_start
+        self.values[positions, env_indices] = value.clone().cpu().numpy().flatten()
+        self.log_probs[positions, env_indices] = log_prob.clone().cpu().numpy().flatten()
+        self.env_pos[env_indices] += 1
+        if np.all(self.env_pos == self.buffer_size):
+            self.pos = self.buffer_size
+            self.full = True
+
     def get(self, batch_size: Optional[int] = None) -> Generator[RolloutBufferSamples, None, None]:
         assert self.full, ""
         indices = np.random.permutation(self.buffer_size * self.n_envs)
@@ -520,6 +926,320 @@ class RolloutBuffer(BaseBuffer):
         return RolloutBufferSamples(*tuple(map(self.to_torch, data)))
 
 
+class PackedRolloutBuffer(RolloutBuffer):
+    """
+    Rollout buffer that packs all the fields used for training
+    in one contiguous 2D array once the rollout is complete,
+    so a single gather (and a single conversion to PyTorch) returns a full minibatch.
+    The shuffled indices for the ``n_epochs`` successive calls to ``get()``
+    are drawn at once, when the first epoch starts.
+
+    :param buffer_size: Max number of element in the buffer
+    :param observation_space: Observation space
+    :param action_space: Action space
+    :param device: PyTorch device
+    :param gae_lambda: Factor for trade-off of bias vs variance for Generalized Advantage Estimator
+        Equivalent to classic advantage when set to 1.
+    :param gamma: Discount factor
+    :param n_envs: Number of parallel environments
+    :param n_epochs: Number of passes over the buffer per rollout, to precompute the shuffled indices
+        (set automatically to the ``n_epochs`` of PPO)
+    """
+
+    packed: Optional[np.ndarray]
+    index_plans: Optional[np.ndarray]
+
+    def __init__(
+        self,
+        buffer_size: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+        device: Union[th.device, str] = "auto",
+        gae_lambda: float = 1,
+        gamma: float = 0.99,
+        n_envs: int = 1,
+        n_epochs: int = 1,
+    ):
+        assert not isinstance(observation_space, spaces.Dict), "PackedRolloutBuffer does not support Dict obs space"
+        assert n_epochs > 0, "`n_epochs` must be positive"
+        self.n_epochs = n_epochs
+        super().__init__(buffer_size, observation_space, action_space, device, gae_lambda, gamma, n_envs=n_envs)
+        obs_dim = int(np.prod(self.obs_shape))
+        # Columns of each field in the packed array
+        offsets = np.cumsum([0, obs_dim, self.action_dim, 1, 1, 1, 1])
+        self.field_slices = [slice(start, end) for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def reset(self) -> None:
+        self.packed = None
+        self.index_plans = None
+        self.plan_idx = 0
+        super().reset()
+
+    def _pack(self) -> np.ndarray:
+        """
+        Copy the (swapped and flattened) fields used for training into one array.
+
+        :return: Array of shape (buffer_size * n_envs, n_columns)
+        """
+        n_samples = self.buffer_size * self.n_envs
+        packed = np.empty((n_samples, self.field_slices[-1].stop), dtype=np.float32)
+        fields = (self.observations, self.actions, self.values, self.log_probs, self.advantages, self.returns)
+        for field, field_slice in zip(fields, self.field_slices):
+            packed[:, field_slice] = field.reshape(n_samples, -1)
+        return packed
+
+    def get(self, batch_size: Optional[int] = None) -> Generator[RolloutBufferSamples, None, None]:
+        assert self.full, ""
+        n_samples = self.buffer_size * self.n_envs
+        # Prepare the data
+        if not self.generator_ready:
+            _tensor_names = [
+                "observations",
+                "actions",
+                "values",
+                "log_probs",
+                "advantages",
+                "returns",
+            ]
+
+            for tensor in _tensor_names:
+                self.__dict__[tensor] = self.swap_and_flatten(self.__dict__[tensor])
+            self.packed = self._pack()
+            self.generator_ready = True
+
+        # Draw the permutations of all epochs at once
+        if self.index_plans is None or self.plan_idx == self.n_epochs:
+            # Seeded from the global generator, for reproducibility with ``set_random_seed()``
+            rng = np.random.default_rng(np.random.randint(2**31))
+            self.index_plans = rng.permuted(np.tile(np.arange(n_samples), (self.n_epochs, 1)), axis=1)
+            self.plan_idx = 0
+        indices = self.index_plans[self.plan_idx]
+        self.plan_idx += 1
+
+        # Return everything, don't create minibatches
+        if batch_size is None:
+            batch_size = n_samples
+
+        start_idx = 0
+        while start_idx < n_samples:
+            yield self._get_samples(indices[start_idx : start_idx + batch_size])
+            start_idx += batch_size
+
+    def _get_samples(
+        self,
+        batch_inds: np.ndarray,
+        env: Optional[VecNormalize] = None,
+    ) -> RolloutBufferSamples:
+        assert self.packed is not None
+        # Single gather and single transfer, the fields are views of the minibatch
+        batch = self.to_torch(self.packed[batch_inds], copy=False)
+        obs_slice, actions_slice, values_slice, log_probs_slice, advantages_slice, returns_slice = self.field_slices
+        return RolloutBufferSamples(
+            observations=batch[:, obs_slice].reshape(-1, *self.obs_shape),
+            actions=batch[:, actions_slice],
+            old_values=batch[:, values_slice.start],
+            old_log_prob=batch[:, log_probs_slice.start],
+            advantages=batch[:, advantages_slice.start],
+            returns=batch[:, returns_slice.start],
+        )
+
+
+class TorchRolloutBuffer(RolloutBuffer):
+    """
+    Rollout buffer that keeps all its storage as preallocated PyTorch tensors
+    on the training device, to be used in place of ``RolloutBuffer`` with A2C/PPO.
+
+    Values and log probabilities stay on the device (no NumPy round-trip),
+    observations coming from the env are staged in pinned host memory
+    (when training on GPU) and copied asynchronously.
+    The flattened view of the buffer is obtained without copy
+    and minibatches are gathered directly from the device tensors.
+
+    NOTE: the samples are ordered step-major (and not env-major as in ``RolloutBuffer``),
+    this does not matter as minibatches are drawn from a random permutation.
+
+    :param buffer_size: Max number of element in the buffer
+    :param observation_space: Observation space
+    :param action_space: Action space
+    :param device: PyTorch device
+    :param gae_lambda: Factor for trade-off of bias vs variance for Generalized Advantage Estimator
+        Equivalent to classic advantage when set to 1.
+    :param gamma: Discount factor
+    :param n_envs: Number of parallel environments
+    """
+
+    observations: th.Tensor  # type: ignore[assignment]
+    actions: th.Tensor  # type: ignore[assignment]
+    rewards: th.Tensor  # type: ignore[assignment]
+    advantages: th.Tensor  # type: ignore[assignment]
+    returns: th.Tensor  # type: ignore[assignment]
+    episode_starts: th.Tensor  # type: ignore[assignment]
+    log_probs: th.Tensor  # type: ignore[assignment]
+    values: th.Tensor  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        buffer_size: int,
+        observation_space: spaces.Space,
+        action_space: spaces.Space,
+        device: Union[th.device, str] = "auto",
+        gae_lambda: float = 1,
+        gamma: float = 0.99,
+        n_envs: int = 1,
+    ):
+        assert not isinstance(observation_space, spaces.Dict), "TorchRolloutBuffer does not support Dict obs space"
+        super(RolloutBuffer, self).__init__(buffer_size, observation_space, action_space, device, n_envs=n_envs)
+        self.gae_lambda = gae_lambda
+        self.gamma = gamma
+        # Pinned memory only makes sense for host to accelerator transfers
+        self.pin_memory = self.device.type == "cuda"
+        self.generator_ready = False
+        self._allocate()
+        self.reset()
+
+    def _allocate(self) -> None:
+        """
+        Preallocate the storage once, ``reset()`` only zeroes it afterward.
+        """
+
+        def zeros(*shape: int) -> th.Tensor:
+            return th.zeros(shape, dtype=th.float32, device=self.device)
+
+        self.observations = zeros(self.buffer_size, self.n_envs, *self.obs_shape)
+        self.actions = zeros(self.buffer_size, self.n_envs, self.action_dim)
+        self.rewards = zeros(self.buffer_size, self.n_envs)
+        self.returns = zeros(self.buffer_size, self.n_envs)
+        self.episode_starts = zeros(self.buffer_size, self.n_envs)
+        self.values = zeros(self.buffer_size, self.n_envs)
+        self.log_probs = zeros(self.buffer_size, self.n_envs)
+        self.advantages = zeros(self.buffer_size, self.n_envs)
+        # Host staging area for data coming from the env,
+        # one slot per step so an asynchronous copy is never overwritten during a rollout
+        self._host_observations: Optional[th.Tensor] = None
+        if self.pin_memory:
+            self._host_observations = th.zeros(
+                (self.buffer_size, self.n_envs, *self.obs_shape), dtype=th.float32, pin_memory=True
+            )
+
+    def reset(self) -> None:
+        for tensor in (
+            self.observations,
+            self.actions,
+            self.rewards,
+            self.returns,
+            self.episode_starts,
+            self.values,
+            self.log_probs,
+            self.advantages,
+        ):
+            tensor.zero_()
+        self.generator_ready = False
+        super(RolloutBuffer, self).reset()
+
+    def _from_host(self, array: np.ndarray, out: th.Tensor, host: Optional[th.Tensor] = None) -> None:
+        """
+        Copy a NumPy array coming from the env into a device tensor.
+
+        :param array: The data to copy
+        :param out: Destination tensor (on ``self.device``)
+        :param host: Optional pinned host tensor used as a staging area
+        """
+        tensor = th.as_tensor(np.asarray(array, dtype=np.float32).reshape(out.shape))
+        if host is None:
+            out.copy_(tensor)
+        else:
+            host.copy_(tensor)
+            out.copy_(host, non_blocking=True)
+
+    def compute_returns_and_advantage(self, last_values: th.Tensor, dones: np.ndarray) -> None:
+        """
+        Post-processing step: compute the lambda-return (TD(lambda) estimate)
+        and GAE(lambda) advantage, see ``RolloutBuffer.compute_returns_and_advantage()``.
+        The computation is done on the device.
+
+        :param last_values: state value estimation for the last step (one for each env)
+        :param dones: if the last step was a terminal step (one bool for each env).
+        """
+        last_values = last_values.detach().flatten().to(self.device, dtype=th.float32)
+        last_dones = th.as_tensor(np.asarray(dones, dtype=np.float32), device=self.device)
+
+        last_gae_lam = th.zeros(self.n_envs, dtype=th.float32, device=self.device)
+        for step in reversed(range(self.buffer_size)):
+            if step == self.buffer_size - 1:
+                next_non_terminal = 1.0 - last_dones
+                next_values = last_values
+            else:
+                next_non_terminal = 1.0 - self.episode_starts[step + 1]
+                next_values = self.values[step + 1]
+            delta = self.rewards[step] + self.gamma * next_values * next_non_terminal - self.values[step]
+            last_gae_lam = delta + self.gamma * self.gae_lambda * next_non_terminal * last_gae_lam
+            self.advantages[step] = last_gae_lam
+        # TD(lambda) estimator, see Github PR #375
+        th.add(self.advantages, self.values, out=self.returns)
+
+    def add(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        episode_start: np.ndarray,
+        value: th.Tensor,
+        log_prob: th.Tensor,
+    ) -> None:
+        """
+        :param obs: Observation
+        :param action: Action
+        :param reward:
+        :param episode_start: Start of episode signal.
+        :param value: estimated value of the current state
+            following the current policy.
+        :param log_prob: log probability of the action
+            following the current policy.
+        """
+        host_obs = None if self._host_observations is None else self._host_observations[self.pos]
+        self._from_host(obs, self.observations[self.pos], host_obs)
+        self._from_host(action, self.actions[self.pos])
+        self._from_host(reward, self.rewards[self.pos])
+        self._from_host(episode_start, self.episode_starts[self.pos])
+        # No device to host transfer
+        self.values[self.pos].copy_(value.detach().flatten())
+        self.log_probs[self.pos].copy_(log_prob.detach().flatten())
+        self.pos += 1
+        if self.pos == self.buffer_size:
+            self.full = True
+
+    def get(self, batch_size: Optional[int] = None) -> Generator[RolloutBufferSamples, None, None]:
+        assert self.full, ""
+        n_samples = self.buffer_size * self.n_envs
+        indices = th.randperm(n_samples, device=self.device)
+        # The storage is contiguous, flattening the first two axes is a view
+        self.generator_ready = True
+
+        # Return everything, don't create minibatches
+        if batch_size is None:
+            batch_size = n_samples
+
+        start_idx = 0
+        while start_idx < n_samples:
+            yield self._get_samples(indices[start_idx : start_idx + batch_size])  # type: ignore[arg-type]
+            start_idx += batch_size
+
+    def _get_samples(  # type: ignore[override]
+        self,
+        batch_inds: th.Tensor,
+        env: Optional[VecNormalize] = None,
+    ) -> RolloutBufferSamples:
+        n_samples = self.buffer_size * self.n_envs
+        return RolloutBufferSamples(
+            observations=self.observations.view(n_samples, *self.obs_shape)[batch_inds],
+            actions=self.actions.view(n_samples, self.action_dim)[batch_inds],
+            old_values=self.values.view(-1)[batch_inds],
+            old_log_prob=self.log_probs.view(-1)[batch_inds],
+            advantages=self.advantages.view(-1)[batch_inds],
+            returns=self.returns.view(-1)[batch_inds],
+        )
+
+
 class DictReplayBuffer(ReplayBuffer):
     """
     Dict Replay buffer used in off-policy algorithms like SAC/TD3.
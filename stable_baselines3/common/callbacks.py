@@ -1,6 +1,7 @@
 import os
 import warnings
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 
 import gymnasium as gym
@@ -21,6 +22,7 @@ except ImportError:
 
 
 from stable_baselines3.common.evaluation import evaluate_policy
+from stable_baselines3.common.shared_running_mean_std import SharedRunningMeanStd
 from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv, sync_envs_normalization
 
 if TYPE_CHECKING:
@@ -257,6 +259,10 @@ class CheckpointCallback(BaseCallback):
     :param name_prefix: Common prefix to the saved models
     :param save_replay_buffer: Save the model replay buffer
     :param save_vecnormalize: Save the ``VecNormalize`` statistics
+    :param async_save: Write the model checkpoints in a background thread,
+        so training is only paused while the parameters are copied to CPU memory
+    :param save_as_directory: Save the model checkpoints as directories instead of zip-files
+        (their parameters can then be memory-mapped when loading)
     :param verbose: Verbosity level: 0 for no output, 2 for indicating when saving model checkpoint
     """
 
@@ -267,6 +273,8 @@ class CheckpointCallback(BaseCallback):
         name_prefix: str = "rl_model",
         save_replay_buffer: bool = False,
         save_vecnormalize: bool = False,
+        async_save: bool = False,
+        save_as_directory: bool = False,
         verbose: int = 0,
     ):
         super().__init__(verbose)
@@ -275,6 +283,10 @@ class CheckpointCallback(BaseCallback):
         self.name_prefix = name_prefix
         self.save_replay_buffer = save_replay_buffer
         self.save_vecnormalize = save_vecnormalize
+        self.async_save = async_save
+        self.save_as_directory = save_as_directory
+        # Checkpoint being written in the background
+        self._pending_save: Optional[Future] = None
 
     def _init_callback(self) -> None:
         # Create folder if needed
@@ -287,15 +299,18 @@ class CheckpointCallback(BaseCallback):
 
         :param checkpoint_type: empty for the model, "replay_buffer_"
             or "vecnormalize_" for the other checkpoints.
-        :param extension: Checkpoint file extension (zip for model, pkl for others)
+        :param extension: Checkpoint file extension (zip for model, pkl for others, empty for directories)
         :return: Path to the checkpoint
         """
-        return os.path.join(self.save_path, f"{self.name_prefix}_{checkpoint_type}{self.num_timesteps}_steps.{extension}")
+        suffix = f".{extension}" if extension else ""
+        return os.path.join(self.save_path, f"{self.name_prefix}_{checkpoint_type}{self.num_timesteps}_steps{suffix}")
 
     def _on_step(self) -> bool:
         if self.n_calls % self.save_freq == 0:
-            model_path = self._checkpoint_path(extension="zip")
-            self.model.save(model_path)
+            model_path = self._checkpoint_path(extension="" if self.save_as_directory else "zip")
+            if self.async_save:
+                self._wait_pending_save()
+            self._pending_save = self.model.save(model_path, asynchronous=self.async_save, as_directory=self.save_as_directory)
             if self.verbose >= 2:
                 print(f"Saving model checkpoint to {model_path}")
 
@@ -315,6 +330,17 @@ class CheckpointCallback(BaseCallback):
 
         return True
 
+    def _wait_pending_save(self) -> None:
+        """
+        Wait for the previous checkpoint to be written (and raise its error if any).
+        """
+        if self._pending_save is not None:
+            self._pending_save.result()
+            self._pending_save = None
+
+    def _on_training_end(self) -> None:
+        self._wait_pending_save()
+
 
 class ConvertCallback(BaseCallback):
     """
@@ -676,6 +702,41 @@ class StopTrainingOnNoModelImprovement(BaseCallback):
         return continue_training
 
 
+class ReduceSharedStatisticsCallback(BaseCallback):
+    """
+    Merge the statistics pushed by the workers of ``SharedRunningMeanStd`` every ``reduce_freq`` timesteps
+    (see ``SharedRunningMeanStd.reduce()``), and once more at the end of training.
+    Without it, the workers keep normalizing with the initial statistics.
+
+    :param shared_rms: The shared statistics to reduce
+    :param reduce_freq: Number of timesteps between two reductions
+    :param verbose: Verbosity level: 0 for no output, 1 for printing the number of merged samples
+    """
+
+    def __init__(
+        self, shared_rms: Union[SharedRunningMeanStd, List[SharedRunningMeanStd]], reduce_freq: int = 1000, verbose: int = 0
+    ):
+        super().__init__(verbose=verbose)
+        self.shared_rms = shared_rms if isinstance(shared_rms, list) else [shared_rms]
+        self.reduce_freq = reduce_freq
+        self.last_time_trigger = 0
+
+    def _reduce(self) -> None:
+        for shared_rms in self.shared_rms:
+            n_samples = shared_rms.reduce()
+            if self.verbose >= 1:
+                print(f"Merged {n_samples} samples into the shared statistics at {self.num_timesteps} timesteps")
+
+    def _on_step(self) -> bool:
+        if (self.num_timesteps - self.last_time_trigger) >= self.reduce_freq:
+            self.last_time_trigger = self.num_timesteps
+            self._reduce()
+        return True
+
+    def _on_training_end(self) -> None:
+        self._reduce()
+
+
 class ProgressBarCallback(BaseCallback):
     """
     Display a progress bar when training SB3 agent
@@ -1,11 +1,12 @@
 import os
+import time
 from typing import Any, Callable, Dict, Optional, Type, Union
 
 import gymnasium as gym
 
 from stable_baselines3.common.atari_wrappers import AtariWrapper
-from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv
+from stable_baselines3.common.monitor import Monitor, ResultsWriter
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv, VecMonitor
 from stable_baselines3.common.vec_env.patch_gym import _patch_env
 
 
@@ -48,6 +49,8 @@ def make_vec_env(
     vec_env_kwargs: Optional[Dict[str, Any]] = None,
     monitor_kwargs: Optional[Dict[str, Any]] = None,
     wrapper_kwargs: Optional[Dict[str, Any]] = None,
+    shared_monitor_file: bool = False,
+    vec_monitor: bool = False,
 ) -> VecEnv:
     """
     Create a wrapped, monitored ``VecEnv``.
@@ -71,6 +74,15 @@ def make_vec_env(
     :param vec_env_kwargs: Keyword arguments to pass to the ``VecEnv`` class constructor.
     :param monitor_kwargs: Keyword arguments to pass to the ``Monitor`` class constructor.
     :param wrapper_kwargs: Keyword arguments to pass to the ``Wrapper`` class constructor.
+    :param shared_monitor_file: If True, all the ``Monitor`` wrappers write to a single
+        ``shared.monitor.csv`` file in ``monitor_dir`` instead of one file per env.
+        Only possible when the envs live in the main process (``DummyVecEnv``),
+        use a ``VecMonitor`` for ``SubprocVecEnv``. The file is closed when the ``VecEnv`` is closed.
+    :param vec_monitor: If True, the envs are not wrapped individually in a ``Monitor``,
+        the resulting ``VecEnv`` is wrapped in a ``VecMonitor`` instead
+        (``vec.monitor.csv`` in ``monitor_dir``). This lowers the per-step cost,
+        and works with any ``VecEnv`` class. Only the ``info_keywords``, ``flush_every``
+        and ``flush_interval`` entries of ``monitor_kwargs`` are used in that case.
     :return: The wrapped environment
     """
     env_kwargs = env_kwargs or {}
@@ -79,6 +91,39 @@ def make_vec_env(
     wrapper_kwargs = wrapper_kwargs or {}
     assert vec_env_kwargs is not None  # for mypy
 
+    # No custom VecEnv is passed
+    if vec_env_cls is None:
+        # Default: use a DummyVecEnv
+        vec_env_cls = DummyVecEnv
+
+    if vec_monitor and shared_monitor_file:
+        raise ValueError(
+            "`shared_monitor_file` cannot be combined with `vec_monitor`, the `VecMonitor` already writes a single file."
+        )
+
+    if shared_monitor_file and monitor_dir is None:
+        raise ValueError("`shared_monitor_file` requires a `monitor_dir` to write the shared monitor file to.")
+
+    results_writer = None
+    if shared_monitor_file:
+        assert monitor_dir is not None  # for mypy
+        if not issubclass(vec_env_cls, DummyVecEnv):
+            raise ValueError(
+                "A shared monitor file can only be used with a `DummyVecEnv`, "
+                "please use a `VecMonitor` wrapper to get a single monitor file with other VecEnvs."
+            )
+        os.makedirs(monitor_dir, exist_ok=True)
+        results_writer = ResultsWriter(
+            os.path.join(monitor_dir, "shared"),
+            header={"t_start": time.time(), "env_id": str(env_id if isinstance(env_id, str) else None)},
+            extra_keys=tuple(monitor_kwargs.get("reset_keywords", ())) + tuple(monitor_kwargs.get("info_keywords", ())),
+            override_existing=monitor_kwargs.get("override_existing", True),
+            flush_every=monitor_kwargs.get("flush_every", 1),
+            flush_interval=monitor_kwargs.get("flush_interval"),
+            # Closed with the VecEnv, when all the monitors are closed
+            close_when_unused=True,
+        )
+
     def make_env(rank: int) -> Callable[[], gym.Env]:
         def _init() -> gym.Env:
             # For type checker:
@@ -106,11 +151,13 @@ def make_vec_env(
                 env.action_space.seed(seed + rank)
             # Wrap the env in a Monitor wrapper
             # to have additional training information
-            monitor_path = os.path.join(monitor_dir, str(rank)) if monitor_dir is not None else None
-            # Create the monitor folder if needed
-            if monitor_path is not None and monitor_dir is not None:
-                os.makedirs(monitor_dir, exist_ok=True)
-            env = Monitor(env, filename=monitor_path, **monitor_kwargs)
+            # (done on the VecEnv level when using a VecMonitor)
+            if not vec_monitor:
+                monitor_path = os.path.join(monitor_dir, str(rank)) if monitor_dir is not None else None
+                # Create the monitor folder if needed
+                if monitor_path is not None and monitor_dir is not None:
+                    os.makedirs(monitor_dir, exist_ok=True)
+                env = Monitor(env, filename=monitor_path, results_writer=results_writer, **monitor_kwargs)
             # Optionally, wrap the environment with the provided wrapper
             if wrapper_class is not None:
                 env = wrapper_class(env, **wrapper_kwargs)
@@ -118,14 +165,22 @@ def make_vec_env(
 
         return _init
 
-    # No custom VecEnv is passed
-    if vec_env_cls is None:
-        # Default: use a DummyVecEnv
-        vec_env_cls = DummyVecEnv
-
     vec_env = vec_env_cls([make_env(i + start_index) for i in range(n_envs)], **vec_env_kwargs)
     # Prepare the seeds for the first reset
     vec_env.seed(seed)
+
+    if vec_monitor:
+        monitor_path = None
+        if monitor_dir is not None:
+            os.makedirs(monitor_dir, exist_ok=True)
+            monitor_path = os.path.join(monitor_dir, "vec")
+        vec_env = VecMonitor(
+            vec_env,
+            filename=monitor_path,
+            info_keywords=tuple(monitor_kwargs.get("info_keywords", ())),
+            flush_every=monitor_kwargs.get("flush_every", 1),
+            flush_interval=monitor_kwargs.get("flush_interval"),
+        )
     return vec_env
 
 
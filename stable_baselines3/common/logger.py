@@ -1,9 +1,13 @@
 import datetime
 import json
 import os
+import queue
+import struct
 import sys
 import tempfile
+import threading
 import warnings
+import weakref
 from collections import defaultdict
 from io import TextIOBase
 from typing import Any, Dict, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
@@ -55,6 +59,28 @@ class Figure:
     def __init__(self, figure: matplotlib.figure.Figure, close: bool):
         self.figure = figure
         self.close = close
+        # RGB image of the figure (CHW), once rendered
+        self.image: Optional[np.ndarray] = None
+
+    def render(self) -> "Figure":
+        """
+        Render the figure to an image now (closing it if ``close``),
+        so it can be written later even if the figure is modified or closed in the meantime.
+
+        :return: A rendered copy of this object
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        canvas = FigureCanvasAgg(self.figure)
+        canvas.draw()
+        width, height = canvas.get_width_height()
+        image = np.frombuffer(canvas.buffer_rgba(), dtype=np.uint8).reshape(height, width, 4)[:, :, :3]
+        if self.close:
+            plt.close(self.figure)
+        rendered = Figure(self.figure, self.close)
+        rendered.image = np.ascontiguousarray(np.moveaxis(image, 2, 0))
+        return rendered
 
 
 class Image:
@@ -387,6 +413,105 @@ class CSVOutputFormat(KVWriter):
         self.file.close()
 
 
+class BinaryOutputFormat(KVWriter):
+    """
+    Log to a directory, in an append-only columnar binary format.
+
+    Each key is stored in its own file of fixed-width little-endian float64 records
+    (one per dump, NaN when the key was not recorded),
+    and ``schema.json`` lists the columns with the row at which they start.
+    A new key therefore only creates a new file, existing data is never rewritten.
+    Use ``read_binary()`` to load the values.
+
+    :param folder: the directory to write the log to
+    :param flush_every: Flush the files every ``flush_every`` dumps
+        (they are always flushed when closing the writer)
+    """
+
+    schema_file = "schema.json"
+    step_file = "step.i64"
+
+    def __init__(self, folder: str, flush_every: int = 100):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.flush_every = flush_every
+        self.n_rows = 0
+        # key -> (file, first_row)
+        self.columns: Dict[str, Tuple[Any, int]] = {}
+        self.step_file_handler = open(os.path.join(folder, self.step_file), "wb")
+        self._write_schema()
+
+    def _write_schema(self) -> None:
+        schema = {
+            "version": 1,
+            "columns": [
+                {"key": key, "file": os.path.basename(file.name), "first_row": first_row}
+                for key, (file, first_row) in self.columns.items()
+            ],
+        }
+        # Atomic replacement, a reader never sees a partial schema
+        tmp_path = os.path.join(self.folder, self.schema_file + ".tmp")
+        with open(tmp_path, "w") as file_handler:
+            json.dump(schema, file_handler)
+        os.replace(tmp_path, os.path.join(self.folder, self.schema_file))
+
+    @staticmethod
+    def _to_float(value: Any) -> float:
+        if isinstance(value, Video):
+            raise FormatUnsupportedError(["binary"], "video")
+        if isinstance(value, Figure):
+            raise FormatUnsupportedError(["binary"], "figure")
+        if isinstance(value, Image):
+            raise FormatUnsupportedError(["binary"], "image")
+        if isinstance(value, HParam):
+            raise FormatUnsupportedError(["binary"], "hparam")
+        if isinstance(value, str):
+            raise FormatUnsupportedError(["binary"], "string")
+        if value is None:
+            return np.nan
+        if hasattr(value, "dtype"):
+            if value.shape != () and len(value) != 1:
+                raise FormatUnsupportedError(["binary"], "array")
+            return float(value.item())
+        return float(value)
+
+    def write(self, key_values: Dict[str, Any], key_excluded: Dict[str, Tuple[str, ...]], step: int = 0) -> None:
+        key_values = filter_excluded_keys(key_values, key_excluded, "binary")
+        row = {key: self._to_float(value) for key, value in key_values.items()}
+
+        extra_keys = row.keys() - self.columns.keys()
+        if extra_keys:
+            for key in sorted(extra_keys):
+                file_name = f"column_{len(self.columns)}.f64"
+                self.columns[key] = (open(os.path.join(self.folder, file_name), "wb"), self.n_rows)
+            self._write_schema()
+
+        for key, (file, _) in self.columns.items():
+            file.write(struct.pack("<d", row.get(key, np.nan)))
+        self.step_file_handler.write(struct.pack("<q", step))
+        self.n_rows += 1
+
+        if self.n_rows % self.flush_every == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Flush the column files, the step file last
+        as it defines the number of rows seen by the reader
+        """
+        for file, _ in self.columns.values():
+            file.flush()
+        self.step_file_handler.flush()
+
+    def close(self) -> None:
+        """
+        closes the files
+        """
+        for file, _ in self.columns.values():
+            file.close()
+        self.step_file_handler.close()
+
+
 class TensorBoardOutputFormat(KVWriter):
     """
     Dumps key/value pairs into TensorBoard's numeric format.
@@ -419,7 +544,10 @@ class TensorBoardOutputFormat(KVWriter):
                 self.writer.add_video(key, value.frames, step, value.fps)
 
             if isinstance(value, Figure):
-                self.writer.add_figure(key, value.figure, step, close=value.close)
+                if value.image is not None:
+                    self.writer.add_image(key, value.image, step, dataformats="CHW")
+                else:
+                    self.writer.add_figure(key, value.figure, step, close=value.close)
 
             if isinstance(value, Image):
                 self.writer.add_image(key, value.image, step, dataformats=value.dataformats)
@@ -447,7 +575,7 @@ def make_output_format(_format: str, log_dir: str, log_suffix: str = "") -> KVWr
     """
     return a logger for the requested format
 
-    :param _format: the requested format to log to ('stdout', 'log', 'json' or 'csv' or 'tensorboard')
+    :param _format: the requested format to log to ('stdout', 'log', 'json' or 'csv' or 'binary' or 'tensorboard')
     :param log_dir: the logging directory
     :param log_suffix: the suffix for the log file
     :return: the logger
@@ -461,6 +589,8 @@ def make_output_format(_format: str, log_dir: str, log_suffix: str = "") -> KVWr
         return JSONOutputFormat(os.path.join(log_dir, f"progress{log_suffix}.json"))
     elif _format == "csv":
         return CSVOutputFormat(os.path.join(log_dir, f"progress{log_suffix}.csv"))
+    elif _format == "binary":
+        return BinaryOutputFormat(os.path.join(log_dir, f"progress{log_suffix}.bin"))
     elif _format == "tensorboard":
         return TensorBoardOutputFormat(log_dir)
     else:
@@ -472,21 +602,123 @@ def make_output_format(_format: str, log_dir: str, log_suffix: str = "") -> KVWr
 # ================================================================
 
 
+def _snapshot_value(value: Any) -> Any:
+    """
+    Copy a recorded value that may be modified after ``dump()`` returns,
+    before it is written by the background writer thread (when ``async_dump=True``).
+    Figures are rendered to images, as matplotlib figures must not be drawn
+    while the main thread keeps using (or closes) them.
+
+    :param value: the recorded value
+    :return: the value itself when immutable, otherwise a copy
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, th.Tensor):
+        return value.detach().to("cpu", copy=True)
+    if isinstance(value, Figure):
+        return value.render()
+    if isinstance(value, Video):
+        return Video(_snapshot_value(value.frames), value.fps)
+    if isinstance(value, Image):
+        return Image(_snapshot_value(value.image), value.dataformats)
+    if isinstance(value, HParam):
+        return HParam(dict(value.hparam_dict), dict(value.metric_dict))
+    return value
+
+
+def _async_writer_loop(
+    write_queue: "queue.Queue[Optional[Tuple[str, Any]]]",
+    output_formats: List[KVWriter],
+    errors: List[Exception],
+) -> None:
+    """
+    Target of the background writer thread of the ``Logger`` (when ``async_dump=True``).
+    Drain the queue until the ``None`` sentinel is received.
+
+    :param write_queue: Queue of ``("kv", (key_values, key_excluded, step))`` or ``("seq", sequence)`` tasks
+    :param output_formats: the list of output formats
+    :param errors: Exceptions raised by the writers, to be re-raised by the logger in the main thread
+    """
+    while True:
+        task = write_queue.get()
+        try:
+            if task is None:
+                return
+            kind, payload = task
+            for _format in output_formats:
+                if kind == "kv" and isinstance(_format, KVWriter):
+                    _format.write(*payload)
+                elif kind == "seq" and isinstance(_format, SeqWriter):
+                    _format.write_sequence(payload)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            write_queue.task_done()
+
+
+def _stop_async_writer(write_queue: "queue.Queue[Optional[Tuple[str, Any]]]", writer_thread: threading.Thread) -> None:
+    """
+    Write all pending tasks and stop the background writer thread.
+    Also called at interpreter exit if the logger was not closed.
+    """
+    write_queue.put(None)
+    writer_thread.join()
+
+
 class Logger:
     """
     The logger class.
 
     :param folder: the logging location
     :param output_formats: the list of output formats
-    """
-
-    def __init__(self, folder: Optional[str], output_formats: List[KVWriter]):
+    :param async_dump: If True, ``dump()`` only snapshots the current key-values
+        (copying arrays and tensors, rendering figures) and the output formats are written by a background thread,
+        so slow writers (e.g. TensorBoard figures) do not block the training loop.
+        Outputs are guaranteed to be written after ``close()``.
+        Values can be recorded from several threads, the values recorded while ``dump()`` runs
+        are written by the next dump.
+    :param max_queue_size: Maximum number of pending dumps when using ``async_dump``,
+        ``dump()`` blocks when the writer thread is that far behind.
+    """
+
+    def __init__(
+        self,
+        folder: Optional[str],
+        output_formats: List[KVWriter],
+        async_dump: bool = False,
+        max_queue_size: int = 16,
+    ):
         self.name_to_value: Dict[str, float] = defaultdict(float)  # values this iteration
         self.name_to_count: Dict[str, int] = defaultdict(int)
         self.name_to_excluded: Dict[str, Tuple[str, ...]] = {}
+        # Protects the dicts above, ``record()`` and ``dump()`` may be called from different threads
+        self._values_lock = threading.Lock()
         self.level = INFO
         self.dir = folder
         self.output_formats = output_formats
+        self.async_dump = async_dump
+        self._write_queue: Optional["queue.Queue[Optional[Tuple[str, Any]]]"] = None
+        self._writer_errors: List[Exception] = []
+        if async_dump:
+            self._write_queue = queue.Queue(maxsize=max_queue_size)
+            writer_thread = threading.Thread(
+                target=_async_writer_loop,
+                args=(self._write_queue, self.output_formats, self._writer_errors),
+                daemon=True,
+            )
+            writer_thread.start()
+            # Flush pending outputs at interpreter exit if the logger is not closed explicitly
+            self._stop_writer = weakref.finalize(self, _stop_async_writer, self._write_queue, writer_thread)
+
+    def _check_writer_errors(self) -> None:
+        """
+        Re-raise in the main thread the first exception raised by the background writer.
+        """
+        if self._writer_errors:
+            error = self._writer_errors[0]
+            self._writer_errors.clear()
+            raise error
 
     @staticmethod
     def to_tuple(string_or_tuple: Optional[Union[str, Tuple[str, ...]]]) -> Tuple[str, ...]:
@@ -509,8 +741,9 @@ class Logger:
         :param value: save to log this value
         :param exclude: outputs to be excluded
         """
-        self.name_to_value[key] = value
-        self.name_to_excluded[key] = self.to_tuple(exclude)
+        with self._values_lock:
+            self.name_to_value[key] = value
+            self.name_to_excluded[key] = self.to_tuple(exclude)
 
     def record_mean(self, key: str, value: Optional[float], exclude: Optional[Union[str, Tuple[str, ...]]] = None) -> None:
         """
@@ -522,10 +755,11 @@ class Logger:
         """
         if value is None:
             return
-        old_val, count = self.name_to_value[key], self.name_to_count[key]
-        self.name_to_value[key] = old_val * count / (count + 1) + value / (count + 1)
-        self.name_to_count[key] = count + 1
-        self.name_to_excluded[key] = self.to_tuple(exclude)
+        with self._values_lock:
+            old_val, count = self.name_to_value[key], self.name_to_count[key]
+            self.name_to_value[key] = old_val * count / (count + 1) + value / (count + 1)
+            self.name_to_count[key] = count + 1
+            self.name_to_excluded[key] = self.to_tuple(exclude)
 
     def dump(self, step: int = 0) -> None:
         """
@@ -533,13 +767,20 @@ class Logger:
         """
         if self.level == DISABLED:
             return
-        for _format in self.output_formats:
-            if isinstance(_format, KVWriter):
-                _format.write(self.name_to_value, self.name_to_excluded, step)
-
-        self.name_to_value.clear()
-        self.name_to_count.clear()
-        self.name_to_excluded.clear()
+        # Snapshot and clear the values at once, so no value recorded by another thread is lost
+        with self._values_lock:
+            name_to_value, name_to_excluded = dict(self.name_to_value), dict(self.name_to_excluded)
+            self.name_to_value.clear()
+            self.name_to_count.clear()
+            self.name_to_excluded.clear()
+        if self._write_queue is not None:
+            self._check_writer_errors()
+            name_to_value = {key: _snapshot_value(value) for key, value in name_to_value.items()}
+            self._write_queue.put(("kv", (name_to_value, name_to_excluded, step)))
+        else:
+            for _format in self.output_formats:
+                if isinstance(_format, KVWriter):
+                    _format.write(name_to_value, name_to_excluded, step)
 
     def log(self, *args, level: int = INFO) -> None:
         """
@@ -618,8 +859,13 @@ class Logger:
         """
         closes the file
         """
+        if self._write_queue is not None:
+            # Wait for pending writes
+            self._stop_writer()
+            self._write_queue = None
         for _format in self.output_formats:
             _format.close()
+        self._check_writer_errors()
 
     # Misc
     # ----------------------------------------
@@ -629,12 +875,20 @@ class Logger:
 
         :param args: the arguments to log
         """
+        if self._write_queue is not None:
+            # Keep the ordering with the dumped key-values
+            self._write_queue.put(("seq", list(map(str, args))))
+            return
         for _format in self.output_formats:
             if isinstance(_format, SeqWriter):
                 _format.write_sequence(list(map(str, args)))
 
 
-def configure(folder: Optional[str] = None, format_strings: Optional[List[str]] = None) -> Logger:
+def configure(
+    folder: Optional[str] = None,
+    format_strings: Optional[List[str]] = None,
+    async_dump: bool = False,
+) -> Logger:
     """
     Configure the current logger.
 
@@ -642,6 +896,7 @@ def configure(folder: Optional[str] = None, format_strings: Optional[List[str]]
         (if None, $SB3_LOGDIR, if still None, tempdir/SB3-[date & time])
     :param format_strings: the output logging format
         (if None, $SB3_LOG_FORMAT, if still None, ['stdout', 'log', 'csv'])
+    :param async_dump: Write the outputs from a background thread (see ``Logger``)
     :return: The logger object.
     """
     if folder is None:
@@ -658,7 +913,7 @@ def configure(folder: Optional[str] = None, format_strings: Optional[List[str]]
     format_strings = list(filter(None, format_strings))
     output_formats = [make_output_format(f, folder, log_suffix) for f in format_strings]
 
-    logger = Logger(folder=folder, output_formats=output_formats)
+    logger = Logger(folder=folder, output_formats=output_formats, async_dump=async_dump)
     # Only print when some files will be saved
     if len(format_strings) > 0 and format_strings != ["stdout"]:
         logger.log(f"Logging to {folder}")
@@ -692,3 +947,54 @@ def read_csv(filename: str) -> pandas.DataFrame:
     :return: the data in the csv
     """
     return pandas.read_csv(filename, index_col=None, comment="#")
+
+
+def read_binary_columns(folder: str) -> Tuple[np.ndarray, Dict[str, Tuple[int, np.ndarray]]]:
+    """
+    Memory-map the columns written by ``BinaryOutputFormat``, without copying them.
+
+    :param folder: the directory written by ``BinaryOutputFormat``
+    :return: the steps of each row and, for each key,
+        the row at which the column starts and its (memory-mapped) values
+    """
+
+    def memmap(path: str, dtype: str, length: int) -> np.ndarray:
+        if length <= 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(length,))
+
+    with open(os.path.join(folder, BinaryOutputFormat.schema_file)) as file_handler:
+        schema = json.load(file_handler)
+
+    # The step file is flushed last, it gives the number of complete rows
+    step_path = os.path.join(folder, BinaryOutputFormat.step_file)
+    n_rows = os.path.getsize(step_path) // 8
+    steps = memmap(step_path, "<i8", n_rows)
+
+    columns = {}
+    for column in schema["columns"]:
+        path = os.path.join(folder, column["file"])
+        first_row = column["first_row"]
+        length = min(os.path.getsize(path) // 8, n_rows - first_row)
+        columns[column["key"]] = (first_row, memmap(path, "<f8", length))
+    return steps, columns
+
+
+def read_binary(folder: str) -> pandas.DataFrame:
+    """
+    read the directory written by ``BinaryOutputFormat`` using pandas
+
+    :param folder: the directory to read
+    :return: the data, indexed by step (missing values are NaN)
+    """
+    steps, columns = read_binary_columns(folder)
+    n_rows = len(steps)
+    data = {}
+    for key, (first_row, values) in columns.items():
+        if first_row == 0 and len(values) == n_rows:
+            data[key] = values
+        else:
+            column = np.full(n_rows, np.nan)
+            column[first_row : first_row + len(values)] = values
+            data[key] = column
+    return pandas.DataFrame(data, index=pandas.Index(np.asarray(steps), name="step"))
@@ -1,13 +1,17 @@
 __all__ = ["Monitor", "ResultsWriter", "get_monitor_files", "load_results"]
 
 import csv
+import io
 import json
 import os
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 from typing import Any, Dict, List, Optional, SupportsFloat, Tuple, Union
 
 import gymnasium as gym
+import numpy as np
 import pandas
 from gymnasium.core import ActType, ObsType
 
@@ -24,6 +28,13 @@ class Monitor(gym.Wrapper[ObsType, ActType, ObsType, ActType]):
     :param info_keywords: extra information to log, from the information return of env.step()
     :param override_existing: appends to file if ``filename`` exists, otherwise
         override existing files (default)
+    :param flush_every: Flush the log file every ``flush_every`` episodes (see ``ResultsWriter``)
+    :param flush_interval: If not None, also flush the log file when the last flush
+        is older than ``flush_interval`` seconds (see ``ResultsWriter``)
+    :param results_writer: An existing ``ResultsWriter`` to use instead of creating one from ``filename``,
+        for instance to share a single log file between several envs living in the same process.
+        It is flushed but not closed when the monitor is closed,
+        unless it was created with ``close_when_unused=True`` and this monitor is the last one using it.
     """
 
     EXT = "monitor.csv"
@@ -36,18 +47,29 @@ class Monitor(gym.Wrapper[ObsType, ActType, ObsType, ActType]):
         reset_keywords: Tuple[str, ...] = (),
         info_keywords: Tuple[str, ...] = (),
         override_existing: bool = True,
+        flush_every: int = 1,
+        flush_interval: Optional[float] = None,
+        results_writer: Optional["ResultsWriter"] = None,
     ):
         super().__init__(env=env)
         self.t_start = time.time()
-        self.results_writer = None
-        if filename is not None:
+        self.results_writer = results_writer
+        self.owns_results_writer = False
+        if filename is not None and results_writer is None:
             env_id = env.spec.id if env.spec is not None else None
             self.results_writer = ResultsWriter(
                 filename,
                 header={"t_start": self.t_start, "env_id": str(env_id)},
                 extra_keys=reset_keywords + info_keywords,
                 override_existing=override_existing,
+                flush_every=flush_every,
+                flush_interval=flush_interval,
             )
+            self.owns_results_writer = True
+        elif results_writer is not None:
+            # Use the same time origin as the shared file
+            self.t_start = results_writer.t_start
+            results_writer.attach()
 
         self.reset_keywords = reset_keywords
         self.info_keywords = info_keywords
@@ -116,7 +138,10 @@ class Monitor(gym.Wrapper[ObsType, ActType, ObsType, ActType]):
         """
         super().close()
         if self.results_writer is not None:
-            self.results_writer.close()
+            if self.owns_results_writer:
+                self.results_writer.close()
+            else:
+                self.results_writer.detach()
 
     def get_total_steps(self) -> int:
         """
@@ -151,6 +176,10 @@ class Monitor(gym.Wrapper[ObsType, ActType, ObsType, ActType]):
         return self.episode_times
 
 
+# Name of the cache file written by ``load_results(use_cache=True)``
+MONITOR_CACHE_FILE = ".monitor_cache.npz"
+
+
 class LoadMonitorResultsError(Exception):
     """
     Raised when loading the monitor log fails.
@@ -170,6 +199,15 @@ class ResultsWriter:
         ``reset_keywords`` and ``info_keywords``
     :param override_existing: appends to file if ``filename`` exists, otherwise
         override existing files (default)
+    :param flush_every: Number of rows to buffer before flushing the file.
+        The default (1) flushes after every episode.
+    :param flush_interval: If not None, also flush the file at the first row
+        written ``flush_interval`` seconds after the last flush.
+        The interval is only checked when a row is written: there is no background flush,
+        so the rows buffered while no episode ends stay pending.
+        In any case, pending rows are written on ``close()`` or at interpreter exit.
+    :param close_when_unused: For a writer shared between several ``Monitor`` wrappers,
+        close it when the last monitor using it is closed (see ``attach()`` and ``detach()``).
     """
 
     def __init__(
@@ -178,9 +216,18 @@ class ResultsWriter:
         header: Optional[Dict[str, Union[float, str]]] = None,
         extra_keys: Tuple[str, ...] = (),
         override_existing: bool = True,
+        flush_every: int = 1,
+        flush_interval: Optional[float] = None,
+        close_when_unused: bool = False,
     ):
         if header is None:
             header = {}
+        self.t_start = float(header.get("t_start", time.time()))
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.close_when_unused = close_when_unused
+        self.n_users = 0
+        self.n_pending_rows = 0
         if not filename.endswith(Monitor.EXT):
             if os.path.isdir(filename):
                 filename = os.path.join(filename, Monitor.EXT)
@@ -199,22 +246,56 @@ class ResultsWriter:
             self.logger.writeheader()
 
         self.file_handler.flush()
+        self.last_flush_time = time.time()
+        # Closing the file writes the buffered rows, make sure it happens at exit
+        self._finalizer = weakref.finalize(self, self.file_handler.close)
 
     def write_row(self, epinfo: Dict[str, float]) -> None:
         """
         Write row of monitor data to csv log file.
+        The file is flushed according to ``flush_every`` and ``flush_interval``.
 
         :param epinfo: the information on episodic return, length, and time
         """
         if self.logger:
             self.logger.writerow(epinfo)
+            self.n_pending_rows += 1
+            if self.n_pending_rows >= self.flush_every or (
+                self.flush_interval is not None and time.time() - self.last_flush_time >= self.flush_interval
+            ):
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows to disk
+        """
+        if not self.file_handler.closed:
             self.file_handler.flush()
+        self.n_pending_rows = 0
+        self.last_flush_time = time.time()
+
+    def attach(self) -> None:
+        """
+        Register a user (``Monitor``) of a shared writer.
+        """
+        self.n_users += 1
+
+    def detach(self) -> None:
+        """
+        Unregister a user of a shared writer: the file is flushed,
+        and closed if it was the last user and ``close_when_unused`` is set.
+        """
+        self.n_users = max(self.n_users - 1, 0)
+        if self.close_when_unused and self.n_users == 0:
+            self.close()
+        else:
+            self.flush()
 
     def close(self) -> None:
         """
         Close the file handler
         """
-        self.file_handler.close()
+        self._finalizer()
 
 
 def get_monitor_files(path: str) -> List[str]:
@@ -227,26 +308,208 @@ def get_monitor_files(path: str) -> List[str]:
     return glob(os.path.join(path, "*" + Monitor.EXT))
 
 
-def load_results(path: str) -> pandas.DataFrame:
+def _parse_monitor_file(file_name: str, cached_state: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse a monitor file, only reading the rows appended since ``cached_state`` when possible.
+    A trailing incomplete line (episode being written) is left for the next call.
+
+    :param file_name: the monitor file
+    :param cached_state: the file state of a previous parse of the same file
+        (``mtime``, ``size``, ``offset`` of the last parsed byte, ``header`` and ``columns``)
+    :return: None if the file did not change, otherwise the new file state, the parsed ``data_frame``
+        and whether it must be appended to the previously parsed rows (``append``)
+    """
+    stat = os.stat(file_name)
+    if cached_state is not None and cached_state["mtime"] == stat.st_mtime and cached_state["size"] == stat.st_size:
+        return None
+
+    with open(file_name, "rb") as file_handler:
+        first_line = file_handler.readline()
+        assert first_line[:1] == b"#"
+        header = json.loads(first_line[1:])
+        if cached_state is not None and cached_state["header"] == header and stat.st_size >= cached_state["offset"]:
+            # Same file with new episodes: only parse the new rows
+            file_handler.seek(cached_state["offset"])
+            content = file_handler.read()
+            end = content.rfind(b"\n") + 1
+            new_rows = None
+            if end > 0:
+                new_rows = pandas.read_csv(
+                    io.BytesIO(content[:end]), header=None, names=cached_state["columns"], index_col=None
+                )
+            return {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "offset": cached_state["offset"] + end,
+                "header": header,
+                "data_frame": new_rows,
+                "append": True,
+            }
+        content = file_handler.read()
+
+    end = content.rfind(b"\n") + 1
+    data_frame = pandas.read_csv(io.BytesIO(content[:end]), index_col=None)
+    return {
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "offset": len(first_line) + end,
+        "header": header,
+        "data_frame": data_frame,
+        "append": False,
+    }
+
+
+def _cached_state(cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    :param cached: a cache entry (see ``_read_monitor_file()``)
+    :return: the file state needed by ``_parse_monitor_file()``, without the parsed data
+    """
+    if cached is None:
+        return None
+    state = {key: cached[key] for key in ("mtime", "size", "offset", "header")}
+    state["columns"] = list(cached["data_frame"].columns)
+    return state
+
+
+def _merge_monitor_entry(cached: Optional[Dict[str, Any]], parsed: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    :param cached: the previous cache entry of the file
+    :param parsed: the result of ``_parse_monitor_file()``
+    :return: the up-to-date cache entry (``cached`` itself if the file did not change)
+    """
+    if parsed is None:
+        assert cached is not None
+        return cached
+    data_frame = parsed["data_frame"]
+    if parsed["append"]:
+        assert cached is not None
+        data_frame = cached["data_frame"]
+        if parsed["data_frame"] is not None:
+            data_frame = pandas.concat([data_frame, parsed["data_frame"]], ignore_index=True)
+    return {
+        "mtime": parsed["mtime"],
+        "size": parsed["size"],
+        "offset": parsed["offset"],
+        "header": parsed["header"],
+        "data_frame": data_frame,
+    }
+
+
+def _read_monitor_file(file_name: str, cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse a monitor file, only reading the rows appended since ``cached`` was created when possible.
+
+    :param file_name: the monitor file
+    :param cached: the result of a previous call for the same file
+    :return: the file state (``mtime``, ``size``, ``offset`` of the last parsed byte),
+        its ``header`` and the parsed ``data_frame``
+    """
+    return _merge_monitor_entry(cached, _parse_monitor_file(file_name, _cached_state(cached)))
+
+
+def _save_monitor_cache(cache_path: str, cache: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write the cache of ``load_results()`` to a ``.npz`` archive, without pickle:
+    the numeric columns are stored as arrays and the rest (file states, headers,
+    non-numeric columns) as JSON.
+
+    :param cache_path: the cache file, replaced atomically
+    :param cache: the cache entries (see ``_read_monitor_file()``), by monitor file name
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    arrays: Dict[str, np.ndarray] = {}
+    for file_idx, (name, entry) in enumerate(cache.items()):
+        columns: Dict[str, Dict[str, Any]] = {}
+        for column_idx, column in enumerate(entry["data_frame"].columns):
+            series = entry["data_frame"][column]
+            if series.dtype.kind in "biuf":
+                key = f"{file_idx}_{column_idx}"
+                arrays[key] = series.to_numpy()
+                columns[column] = {"array": key}
+            else:
+                # Strings from the info keywords
+                columns[column] = {"values": series.tolist(), "dtype": str(series.dtype)}
+        index[name] = {key: entry[key] for key in ("mtime", "size", "offset", "header")}
+        index[name]["columns"] = columns
+
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as file_handler:
+        np.savez(file_handler, index=np.array(json.dumps(index)), **arrays)
+    os.replace(tmp_path, cache_path)
+
+
+def _load_monitor_cache(cache_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a cache written by ``_save_monitor_cache()``.
+
+    :param cache_path: the cache file
+    :return: the cache entries, by monitor file name
+    """
+    cache = {}
+    with np.load(cache_path, allow_pickle=False) as archive:
+        index = json.loads(str(archive["index"]))
+        for name, state in index.items():
+            columns = state.pop("columns")
+            data = {}
+            for column, stored in columns.items():
+                if "array" in stored:
+                    data[column] = archive[stored["array"]]
+                else:
+                    data[column] = pandas.Series(stored["values"], dtype=stored["dtype"])
+            state["data_frame"] = pandas.DataFrame(data)
+            cache[name] = state
+    return cache
+
+
+def load_results(path: str, n_workers: int = 1, use_cache: bool = False) -> pandas.DataFrame:
     """
     Load all Monitor logs from a given directory path matching ``*monitor.csv``
 
     :param path: the directory path containing the log file(s)
+    :param n_workers: Number of threads used to parse the files
+    :param use_cache: Store the parsed files in ``path`` (see ``MONITOR_CACHE_FILE``),
+        keyed by file modification time and size. On the next call,
+        unchanged files are not read and only the rows appended to the others are parsed.
     :return: the logged data
     """
     monitor_files = get_monitor_files(path)
     if len(monitor_files) == 0:
         raise LoadMonitorResultsError(f"No monitor files of the form *{Monitor.EXT} found in {path}")
+
+    cache_path = os.path.join(path, MONITOR_CACHE_FILE)
+    cache: Dict[str, Dict[str, Any]] = {}
+    if use_cache and os.path.isfile(cache_path):
+        try:
+            cache = _load_monitor_cache(cache_path)
+        except Exception:
+            # Corrupted or incompatible cache
+            cache = {}
+
+    names = [os.path.basename(file_name) for file_name in monitor_files]
+    cached_entries = [cache.get(name) for name in names]
+    cached_states = [_cached_state(cached) for cached in cached_entries]
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            parsed_entries = list(executor.map(_parse_monitor_file, monitor_files, cached_states))
+    else:
+        parsed_entries = list(map(_parse_monitor_file, monitor_files, cached_states))
+    entries = [_merge_monitor_entry(cached, parsed) for cached, parsed in zip(cached_entries, parsed_entries)]
+
+    # Only rewrite the cache when a file was added, removed or modified
+    cache_changed = set(names) != set(cache.keys()) or any(parsed is not None for parsed in parsed_entries)
+    if use_cache and cache_changed:
+        try:
+            _save_monitor_cache(cache_path, dict(zip(names, entries)))
+        except OSError:
+            # Read-only results folder, the cache is only an optimization
+            pass
+
     data_frames, headers = [], []
-    for file_name in monitor_files:
-        with open(file_name) as file_handler:
-            first_line = file_handler.readline()
-            assert first_line[0] == "#"
-            header = json.loads(first_line[1:])
-            data_frame = pandas.read_csv(file_handler, index_col=None)
-            headers.append(header)
-            data_frame["t"] += header["t_start"]
-        data_frames.append(data_frame)
+    for entry in entries:
+        header = entry["header"]
+        headers.append(header)
+        # Do not modify the cached data frame
+        data_frames.append(entry["data_frame"].assign(t=entry["data_frame"]["t"] + header["t_start"]))
     data_frame = pandas.concat(data_frames)
     data_frame.sort_values("t", inplace=True)
     data_frame.reset_index(inplace=True)
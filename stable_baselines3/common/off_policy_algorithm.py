@@ -1,23 +1,35 @@
 import io
 import pathlib
 import sys
+import threading
 import time
 import warnings
+from concurrent.futures import Future
+from contextlib import nullcontext
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
 
 import numpy as np
 import torch as th
 from gymnasium import spaces
 
 from stable_baselines3.common.base_class import BaseAlgorithm
-from stable_baselines3.common.buffers import DictReplayBuffer, ReplayBuffer
+from stable_baselines3.common.buffers import DictReplayBuffer, NStepReplayBuffer, PrioritizedReplayBuffer, ReplayBuffer
 from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.noise import ActionNoise, VectorizedActionNoise
 from stable_baselines3.common.policies import BasePolicy
 from stable_baselines3.common.save_util import load_from_pkl, save_to_pkl
-from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, RolloutReturn, Schedule, TrainFreq, TrainFrequencyUnit
-from stable_baselines3.common.utils import safe_mean, should_collect_more_steps
+from stable_baselines3.common.type_aliases import (
+    GymEnv,
+    MaybeCallback,
+    PrioritizedReplayBufferSamples,
+    ReplayBufferSamples,
+    RolloutReturn,
+    Schedule,
+    TrainFreq,
+    TrainFrequencyUnit,
+)
+from stable_baselines3.common.utils import obs_as_tensor, safe_mean, sample_actions, should_collect_more_steps
 from stable_baselines3.common.vec_env import VecEnv
 from stable_baselines3.her.her_replay_buffer import HerReplayBuffer
 
@@ -76,6 +88,12 @@ class OffPolicyAlgorithm(BaseAlgorithm):
     """
 
     actor: th.nn.Module
+    # Set while decoupling the actor and the learner, see ``learn_decoupled()``
+    _replay_buffer_lock: Optional[threading.Lock] = None
+    _policy_lock: Optional[threading.Lock] = None
+    _train_lock: Optional[threading.Lock] = None
+    _collection_policy: Optional[BasePolicy] = None
+    _gradient_steps_per_env_step: Optional[float] = None
 
     def __init__(
         self,
@@ -186,6 +204,8 @@ class OffPolicyAlgorithm(BaseAlgorithm):
             if issubclass(self.replay_buffer_class, HerReplayBuffer):
                 assert self.env is not None, "You must pass an environment when using `HerReplayBuffer`"
                 replay_buffer_kwargs["env"] = self.env
+            elif issubclass(self.replay_buffer_class, NStepReplayBuffer):
+                replay_buffer_kwargs["gamma"] = self.gamma
             self.replay_buffer = self.replay_buffer_class(
                 self.buffer_size,
                 self.observation_space,
@@ -215,7 +235,8 @@ class OffPolicyAlgorithm(BaseAlgorithm):
             if path is a str or pathlib.Path, the path is automatically created if necessary.
         """
         assert self.replay_buffer is not None, "The replay buffer is not defined"
-        save_to_pkl(path, self.replay_buffer, self.verbose)
+        with self._replay_buffer_lock or nullcontext():
+            save_to_pkl(path, self.replay_buffer, self.verbose)
 
     def load_replay_buffer(
         self,
@@ -344,12 +365,287 @@ class OffPolicyAlgorithm(BaseAlgorithm):
                 gradient_steps = self.gradient_steps if self.gradient_steps >= 0 else rollout.episode_timesteps
                 # Special case when the user passes `gradient_steps=0`
                 if gradient_steps > 0:
+                    if isinstance(self.replay_buffer, PrioritizedReplayBuffer):
+                        self.replay_buffer.update_beta(self._current_progress_remaining)
                     self.train(batch_size=self.batch_size, gradient_steps=gradient_steps)
 
         callback.on_training_end()
 
         return self
 
+    def learn_decoupled(
+        self: SelfOffPolicyAlgorithm,
+        total_timesteps: int,
+        callback: MaybeCallback = None,
+        log_interval: int = 4,
+        tb_log_name: str = "run",
+        reset_num_timesteps: bool = True,
+        progress_bar: bool = False,
+        policy_sync_interval: int = 100,
+        gradient_steps_per_env_step: Optional[float] = None,
+    ) -> SelfOffPolicyAlgorithm:
+        """
+        Same as ``learn()``, except that the collection of experience runs in a background thread
+        instead of alternating with the gradient steps: the actor fills the replay buffer
+        while the learner keeps doing gradient steps, so the environment simulation
+        (``SubprocVecEnv`` workers, waiting on them releases the GIL) and the gradient computation
+        use different cores at the same time.
+
+        The actor uses a CPU copy of the policy, whose weights are updated
+        every ``policy_sync_interval`` gradient steps. The replay buffer is shared and protected by a lock.
+        Callbacks are called from the actor thread, while the learner trains:
+        ``predict()`` uses the actor copy of the policy, and ``save()`` / ``save_replay_buffer()``
+        wait for the current gradient steps to finish, so evaluation and checkpoint callbacks
+        do not interfere with the training. Callbacks must not use ``self.policy`` directly.
+        With a ``HerReplayBuffer``, a ``compute_reward`` function must be passed to the buffer,
+        the learner cannot use the ``VecEnv`` stepped by the actor.
+
+        :param total_timesteps: The total number of samples (env steps) to train on
+        :param callback: callback(s) called at every step with state of the algorithm.
+        :param log_interval: Log data every ``log_interval`` episodes
+        :param tb_log_name: the name of the run for TensorBoard logging
+        :param reset_num_timesteps: whether or not to reset the current timestep number (used in logging)
+        :param progress_bar: Display a progress bar using tqdm and rich.
+        :param policy_sync_interval: Number of gradient steps between two updates of the actor weights
+        :param gradient_steps_per_env_step: Number of gradient steps per collected transition
+            (after ``learning_starts``): the learner waits for the actor when it is ahead,
+            and the actor waits for the learner when it is more than ``policy_sync_interval`` gradient steps behind.
+            The remaining gradient steps are done once the collection is over.
+            None to let both run freely.
+        :return: the trained model
+        """
+        total_timesteps, callback = self._setup_learn(
+            total_timesteps,
+            callback,
+            reset_num_timesteps,
+            tb_log_name,
+            progress_bar,
+        )
+
+        callback.on_training_start(locals(), globals())
+
+        assert self.env is not None, "You must set the environment before calling learn_decoupled()"
+        assert isinstance(self.train_freq, TrainFreq)  # check done in _setup_learn()
+        assert not self.use_sde, "gSDE is not supported when decoupling the actor and the learner"
+        if isinstance(self.replay_buffer, HerReplayBuffer):
+            assert self.replay_buffer.compute_reward is not None, (
+                "The learner cannot call `compute_reward()` through the VecEnv stepped by the actor, "
+                "pass a `compute_reward` function in `replay_buffer_kwargs` to decouple the actor and the learner"
+            )
+
+        self._replay_buffer_lock = threading.Lock()
+        self._policy_lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._collection_policy = deepcopy(self.policy).to("cpu")
+        self._collection_policy.set_training_mode(False)
+        # Used to convert intervals in environment steps into gradient steps (e.g. the DQN target update)
+        if gradient_steps_per_env_step is not None:
+            self._gradient_steps_per_env_step = gradient_steps_per_env_step
+        elif self.gradient_steps < 0:
+            # As many gradient steps as collected transitions
+            self._gradient_steps_per_env_step = 1.0
+        else:
+            # Same ratio as ``learn()`` with ``train_freq`` in steps
+            self._gradient_steps_per_env_step = self.gradient_steps / (self.train_freq.frequency * self.n_envs)
+        num_timesteps_at_start = self.num_timesteps
+        n_updates_at_start = self._n_updates
+
+        def n_late_gradient_steps() -> int:
+            # Gradient steps to do to reach the requested ratio
+            assert gradient_steps_per_env_step is not None
+            n_steps = self.num_timesteps - max(num_timesteps_at_start, self.learning_starts)
+            return int(n_steps * gradient_steps_per_env_step) - (self._n_updates - n_updates_at_start)
+
+        def learner_is_late() -> bool:
+            return gradient_steps_per_env_step is not None and n_late_gradient_steps() > policy_sync_interval
+
+        def train(gradient_steps: int) -> None:
+            if isinstance(self.replay_buffer, PrioritizedReplayBuffer):
+                self.replay_buffer.update_beta(self._current_progress_remaining)
+            with self._train_lock:  # type: ignore[union-attr]
+                self.train(batch_size=self.batch_size, gradient_steps=gradient_steps)
+
+        stop_collection = threading.Event()
+        collection_errors: List[BaseException] = []
+        collector = threading.Thread(
+            target=self._collect_continuously,
+            args=(total_timesteps, callback, log_interval, stop_collection, collection_errors, learner_is_late),
+            daemon=True,
+        )
+        collector.start()
+        try:
+            while collector.is_alive():
+                gradient_steps = policy_sync_interval
+                if gradient_steps_per_env_step is not None:
+                    gradient_steps = min(gradient_steps, n_late_gradient_steps())
+                if self.num_timesteps <= self.learning_starts or gradient_steps <= 0:
+                    # Wait for the actor
+                    time.sleep(1e-3)
+                    continue
+                train(gradient_steps)
+                # Broadcast the new weights to the actor
+                with self._policy_lock:
+                    self._collection_policy.load_state_dict(self.policy.state_dict())
+            collector.join()
+            collection_done = len(collection_errors) == 0 and self.num_timesteps >= total_timesteps
+            if collection_done and gradient_steps_per_env_step is not None and self.num_timesteps > self.learning_starts:
+                # Gradient steps still owed for the last transitions
+                gradient_steps = n_late_gradient_steps()
+                if gradient_steps > 0:
+                    train(gradient_steps)
+        finally:
+            stop_collection.set()
+            collector.join()
+            self._replay_buffer_lock = None
+            self._policy_lock = None
+            self._train_lock = None
+            self._collection_policy = None
+            self._gradient_steps_per_env_step = None
+
+        if len(collection_errors) > 0:
+            raise collection_errors[0]
+
+        callback.on_training_end()
+
+        return self
+
+    def _collect_continuously(
+        self,
+        total_timesteps: int,
+        callback: BaseCallback,
+        log_interval: int,
+        stop_collection: threading.Event,
+        collection_errors: List[BaseException],
+        learner_is_late: Callable[[], bool],
+    ) -> None:
+        """
+        Collection loop of the actor thread, see ``learn_decoupled()``.
+
+        :param total_timesteps: The total number of samples (env steps) to collect
+        :param callback: Callback that will be called at each step
+        :param log_interval: Log data every ``log_interval`` episodes
+        :param stop_collection: Set by the learner to stop the collection
+        :param collection_errors: Where to store the error that stopped the collection, if any
+        :param learner_is_late: Whether to wait for the learner before collecting more experience
+        """
+        assert self.env is not None and self.replay_buffer is not None
+        try:
+            while self.num_timesteps < total_timesteps and not stop_collection.is_set():
+                if learner_is_late():
+                    time.sleep(1e-3)
+                    continue
+                rollout = self.collect_rollouts(
+                    self.env,
+                    train_freq=self.train_freq,  # type: ignore[arg-type]
+                    action_noise=self.action_noise,
+                    callback=callback,
+                    learning_starts=self.learning_starts,
+                    replay_buffer=self.replay_buffer,
+                    log_interval=log_interval,
+                )
+                if not rollout.continue_training:
+                    break
+        except BaseException as error:
+            collection_errors.append(error)
+
+    def _excluded_save_params(self) -> List[str]:
+        # State of ``learn_decoupled()``
+        return [
+            *super()._excluded_save_params(),
+            "_replay_buffer_lock",
+            "_policy_lock",
+            "_train_lock",
+            "_collection_policy",
+            "_gradient_steps_per_env_step",
+        ]
+
+    def predict(
+        self,
+        observation: Union[np.ndarray, Dict[str, np.ndarray]],
+        state: Optional[Tuple[np.ndarray, ...]] = None,
+        episode_start: Optional[np.ndarray] = None,
+        deterministic: bool = False,
+    ) -> Tuple[np.ndarray, Optional[Tuple[np.ndarray, ...]]]:
+        if self._collection_policy is not None:
+            # The learner is training ``self.policy``, use the actor copy (see ``learn_decoupled()``)
+            with self._policy_lock or nullcontext():
+                return self._collection_policy.predict(observation, state, episode_start, deterministic)
+        return super().predict(observation, state, episode_start, deterministic)
+
+    def save(
+        self,
+        path: Union[str, pathlib.Path, io.BufferedIOBase],
+        exclude: Optional[Iterable[str]] = None,
+        include: Optional[Iterable[str]] = None,
+        asynchronous: bool = False,
+        as_directory: bool = False,
+    ) -> Optional[Future]:
+        # Do not read the parameters in the middle of the gradient steps of ``learn_decoupled()``
+        with self._train_lock or nullcontext():
+            return super().save(path, exclude, include, asynchronous=asynchronous, as_directory=as_directory)
+
+    def _sample_replay_buffer(self, batch_size: int) -> Union[ReplayBufferSamples, PrioritizedReplayBufferSamples]:
+        """
+        Sample the replay buffer, normalizing the samples with the ``VecNormalize`` statistics if any.
+
+        :param batch_size: Number of element to sample
+        :return: The samples
+        """
+        assert self.replay_buffer is not None, "The replay buffer is not defined"
+        with self._replay_buffer_lock or nullcontext():
+            return self.replay_buffer.sample(batch_size, env=self._vec_normalize_env)  # type: ignore[return-value]
+
+    def _collection_predict(self, observation: Union[np.ndarray, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Get the actions of the exploration policy, from the actor copy of the policy
+        when decoupling the actor and the learner (see ``learn_decoupled()``).
+
+        :param observation: The observations of the envs
+        :return: The actions
+        """
+        policy = self.policy if self._collection_policy is None else self._collection_policy
+        with self._policy_lock or nullcontext():
+            return self._policy_action(policy, observation)
+
+    def _policy_action(self, policy: BasePolicy, observation: Union[np.ndarray, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Lean version of ``policy.predict(observation, deterministic=False)`` for the training loop.
+        The observations come from the training env, so they are already batched and valid:
+        the checks and reshapes of ``predict()`` are skipped.
+
+        :param policy: The policy to use
+        :param observation: The observations of the envs
+        :return: The actions
+        """
+        if policy.training:
+            policy.set_training_mode(False)
+        with th.no_grad():
+            actions = policy._predict(obs_as_tensor(observation, policy.device), deterministic=False)
+        actions = actions.cpu().numpy().reshape((-1, *self.action_space.shape))  # type: ignore[misc]
+        if isinstance(self.action_space, spaces.Box):
+            if policy.squash_output:
+                # Rescale to proper domain when using squashing
+                actions = policy.unscale_action(actions)
+            else:
+                # Actions could be on arbitrary scale, so clip the actions to avoid
+                # out of bound error (e.g. if sampling from a Gaussian distribution)
+                actions = np.clip(actions, self.action_space.low, self.action_space.high)
+        return actions
+
+    def _update_priorities(
+        self, replay_data: Union[ReplayBufferSamples, PrioritizedReplayBufferSamples], td_errors: th.Tensor
+    ) -> None:
+        """
+        Feed back the TD errors of sampled transitions to a prioritized replay buffer.
+
+        :param replay_data: The samples
+        :param td_errors: Their TD errors
+        """
+        if isinstance(replay_data, PrioritizedReplayBufferSamples):
+            assert isinstance(self.replay_buffer, PrioritizedReplayBuffer)
+            with self._replay_buffer_lock or nullcontext():
+                self.replay_buffer.update_priorities(replay_data.indices, td_errors)
+
     def train(self, gradient_steps: int, batch_size: int) -> None:
         """
         Sample the replay buffer and do the updates
@@ -381,13 +677,13 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         # Select action randomly or according to policy
         if self.num_timesteps < learning_starts and not (self.use_sde and self.use_sde_at_warmup):
             # Warmup phase
-            unscaled_action = np.array([self.action_space.sample() for _ in range(n_envs)])
+            unscaled_action = sample_actions(self.action_space, n_envs)
         else:
             # Note: when using continuous actions,
             # we assume that the policy uses tanh to scale the action
             # We use non-deterministic action in the case of SAC, for TD3, it does not matter
             assert self._last_obs is not None, "self._last_obs was not set"
-            unscaled_action, _ = self.predict(self._last_obs, deterministic=False)
+            unscaled_action = self._collection_predict(self._last_obs)
 
         # Rescale the action from [low, high] to [-1, 1]
         if isinstance(self.action_space, spaces.Box):
@@ -489,14 +785,15 @@ class OffPolicyAlgorithm(BaseAlgorithm):
                     if self._vec_normalize_env is not None:
                         next_obs[i] = self._vec_normalize_env.unnormalize_obs(next_obs[i, :])
 
-        replay_buffer.add(
-            self._last_original_obs,  # type: ignore[arg-type]
-            next_obs,  # type: ignore[arg-type]
-            buffer_action,
-            reward_,
-            dones,
-            infos,
-        )
+        with self._replay_buffer_lock or nullcontext():
+            replay_buffer.add(
+                self._last_original_obs,  # type: ignore[arg-type]
+                next_obs,  # type: ignore[arg-type]
+                buffer_action,
+                reward_,
+                dones,
+                infos,
+            )
 
         self._last_obs = new_obs
         # Save the unnormalized observation
@@ -1,5 +1,6 @@
 import sys
 import time
+import warnings
 from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
 import numpy as np
@@ -7,12 +8,12 @@ import torch as th
 from gymnasium import spaces
 
 from stable_baselines3.common.base_class import BaseAlgorithm
-from stable_baselines3.common.buffers import DictRolloutBuffer, RolloutBuffer
+from stable_baselines3.common.buffers import DictRolloutBuffer, RolloutBuffer, TorchRolloutBuffer
 from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.policies import ActorCriticPolicy
 from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, Schedule
 from stable_baselines3.common.utils import obs_as_tensor, safe_mean
-from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env import AsyncSubprocVecEnv, VecEnv, supports_partial_steps
 
 SelfOnPolicyAlgorithm = TypeVar("SelfOnPolicyAlgorithm", bound="OnPolicyAlgorithm")
 
@@ -106,6 +107,8 @@ class OnPolicyAlgorithm(BaseAlgorithm):
         self.max_grad_norm = max_grad_norm
         self.rollout_buffer_class = rollout_buffer_class
         self.rollout_buffer_kwargs = rollout_buffer_kwargs or {}
+        # Warn only once when an ``AsyncSubprocVecEnv`` cannot be stepped asynchronously
+        self._warned_sync_fallback = False
 
         if _init_setup_model:
             self._setup_model()
@@ -156,6 +159,15 @@ class OnPolicyAlgorithm(BaseAlgorithm):
             collected, False if callback terminated rollout prematurely.
         """
         assert self._last_obs is not None, "No previous observation was provided"
+        if supports_partial_steps(env):
+            return self._collect_rollouts_async(env, callback, rollout_buffer, n_rollout_steps)
+        if isinstance(env.unwrapped, AsyncSubprocVecEnv) and not self._warned_sync_fallback:
+            self._warned_sync_fallback = True
+            warnings.warn(
+                "The `AsyncSubprocVecEnv` is wrapped with a `VecEnvWrapper` that does not support partial steps "
+                "(`step_send()` / `step_recv()`), the rollouts are collected synchronously.",
+                UserWarning,
+            )
         # Switch to eval mode (this affects batch norm / dropout)
         self.policy.set_training_mode(False)
 
@@ -179,17 +191,7 @@ class OnPolicyAlgorithm(BaseAlgorithm):
             actions = actions.cpu().numpy()
 
             # Rescale and perform action
-            clipped_actions = actions
-
-            if isinstance(self.action_space, spaces.Box):
-                if self.policy.squash_output:
-                    # Unscale the actions to match env bounds
-                    # if they were previously squashed (scaled in [-1, 1])
-                    clipped_actions = self.policy.unscale_action(clipped_actions)
-                else:
-                    # Otherwise, clip the actions to avoid out of bound error
-                    # as we are sampling from an unbounded Gaussian distribution
-                    clipped_actions = np.clip(actions, self.action_space.low, self.action_space.high)
+            clipped_actions = self._clip_actions(actions)
 
             new_obs, rewards, dones, infos = env.step(clipped_actions)
 
@@ -209,16 +211,24 @@ class OnPolicyAlgorithm(BaseAlgorithm):
 
             # Handle timeout by bootstraping with value function
             # see GitHub issue #633
-            for idx, done in enumerate(dones):
+            # All truncated envs are evaluated in a single forward pass
+            truncated_indices = [
+                idx
+                for idx, done in enumerate(dones)
                 if (
                     done
                     and infos[idx].get("terminal_observation") is not None
                     and infos[idx].get("TimeLimit.truncated", False)
-                ):
-                    terminal_obs = self.policy.obs_to_tensor(infos[idx]["terminal_observation"])[0]
-                    with th.no_grad():
-                        terminal_value = self.policy.predict_values(terminal_obs)[0]  # type: ignore[arg-type]
-                    rewards[idx] += self.gamma * terminal_value
+                )
+            ]
+            if len(truncated_indices) > 0:
+                terminal_obs = self._stack_terminal_observations(
+                    [infos[idx]["terminal_observation"] for idx in truncated_indices]
+                )
+                terminal_obs_tensor = self.policy.obs_to_tensor(terminal_obs)[0]
+                with th.no_grad():
+                    terminal_values = self.policy.predict_values(terminal_obs_tensor)  # type: ignore[arg-type]
+                rewards[truncated_indices] += self.gamma * terminal_values.cpu().numpy().flatten()
 
             rollout_buffer.add(
                 self._last_obs,  # type: ignore[arg-type]
@@ -243,6 +253,170 @@ class OnPolicyAlgorithm(BaseAlgorithm):
 
         return True
 
+    def _clip_actions(self, actions: np.ndarray) -> np.ndarray:
+        """
+        Rescale or clip the actions sampled by the policy to the bounds of the action space.
+
+        :param actions: The actions sampled by the policy
+        :return: The actions to send to the env
+        """
+        if isinstance(self.action_space, spaces.Box):
+            if self.policy.squash_output:
+                # Unscale the actions to match env bounds
+                # if they were previously squashed (scaled in [-1, 1])
+                return self.policy.unscale_action(actions)
+            # Otherwise, clip the actions to avoid out of bound error
+            # as we are sampling from an unbounded Gaussian distribution
+            return np.clip(actions, self.action_space.low, self.action_space.high)
+        return actions
+
+    def _collect_rollouts_async(
+        self,
+        env: VecEnv,
+        callback: BaseCallback,
+        rollout_buffer: RolloutBuffer,
+        n_rollout_steps: int,
+    ) -> bool:
+        """
+        Collect experiences with an ``AsyncSubprocVecEnv``, possibly wrapped (see ``supports_partial_steps()``):
+        the policy is queried for the envs that are ready while the others are still stepping.
+        Each env fills its own column of the ``RolloutBuffer``, so its trajectory stays contiguous,
+        and stops once it has collected ``n_rollout_steps`` transitions.
+
+        :param env: The training environment
+        :param callback: Callback that will be called at each (partial) step
+            (and at the beginning and end of the rollout). Its ``locals`` hold full-size
+            ``new_obs``, ``rewards``, ``dones`` and ``infos``, and ``env_indices``, the envs that were stepped.
+        :param rollout_buffer: Buffer to fill with rollouts
+        :param n_rollout_steps: Number of experiences to collect per environment
+        :return: True if function returned with at least `n_rollout_steps`
+            collected, False if callback terminated rollout prematurely.
+        """
+        assert isinstance(self._last_obs, np.ndarray), "Asynchronous rollouts do not support dict observations"
+        assert not isinstance(
+            rollout_buffer, (DictRolloutBuffer, TorchRolloutBuffer)
+        ), f"Asynchronous rollouts are not supported by {rollout_buffer.__class__.__name__}"
+        assert self._last_episode_starts is not None
+        # Switch to eval mode (this affects batch norm / dropout)
+        self.policy.set_training_mode(False)
+
+        rollout_buffer.reset()
+        # Sample new weights for the state dependent exploration
+        if self.use_sde:
+            self.policy.reset_noise(env.num_envs)
+
+        callback.on_rollout_start()
+
+        # Steps collected by each env, and the outputs of the policy
+        # for the step each env is currently doing
+        env_steps = np.zeros(env.num_envs, dtype=np.int64)
+        pending_actions = np.zeros((env.num_envs, *self.action_space.shape), dtype=self.action_space.dtype)
+        pending_values = th.zeros(env.num_envs, device=self.device)
+        pending_log_probs = th.zeros(env.num_envs, device=self.device)
+        ready_indices = np.arange(env.num_envs)
+
+        while True:
+            # Send new actions to the envs that still need to collect transitions
+            ready_indices = ready_indices[env_steps[ready_indices] < n_rollout_steps]
+            if len(ready_indices) > 0:
+                if self.use_sde and self.sde_sample_freq > 0 and env_steps[ready_indices[0]] % self.sde_sample_freq == 0:
+                    # Sample a new noise matrix
+                    self.policy.reset_noise(env.num_envs)
+
+                with th.no_grad():
+                    obs_tensor = obs_as_tensor(self._last_obs[ready_indices], self.device)
+                    actions, values, log_probs = self.policy(obs_tensor)
+                pending_values[ready_indices] = values.flatten()
+                pending_log_probs[ready_indices] = log_probs.flatten()
+                actions = actions.cpu().numpy()
+                pending_actions[ready_indices] = actions.reshape(pending_actions[ready_indices].shape)
+                env.step_send(self._clip_actions(actions), ready_indices)
+
+            if env.num_pending_envs == 0:
+                break
+            env_indices, step_obs, step_rewards, step_dones, step_infos = env.step_recv()
+
+            self.num_timesteps += len(env_indices)
+
+            # Full-size arrays for the callbacks, as with a synchronous ``VecEnv``:
+            # the envs that were not stepped (not in ``env_indices``) keep their last observation,
+            # with no reward, ``done=False`` and an empty info dict
+            new_obs = self._last_obs.copy()
+            new_obs[env_indices] = step_obs
+            rewards = np.zeros(env.num_envs, dtype=np.float32)
+            rewards[env_indices] = step_rewards
+            dones = np.zeros(env.num_envs, dtype=bool)
+            dones[env_indices] = step_dones
+            infos: List[Dict[str, Any]] = [{} for _ in range(env.num_envs)]
+            for env_idx, info in zip(env_indices, step_infos):
+                infos[env_idx] = info
+
+            # Give access to local variables
+            callback.update_locals(locals())
+            if not callback.on_step():
+                return False
+
+            self._update_info_buffer(step_infos)
+
+            # Handle timeout by bootstraping with value function
+            # see GitHub issue #633
+            truncated = [
+                idx
+                for idx, done in enumerate(step_dones)
+                if (
+                    done
+                    and step_infos[idx].get("terminal_observation") is not None
+                    and step_infos[idx].get("TimeLimit.truncated", False)
+                )
+            ]
+            if len(truncated) > 0:
+                terminal_obs = self._stack_terminal_observations(
+                    [step_infos[idx]["terminal_observation"] for idx in truncated]
+                )
+                terminal_obs_tensor = self.policy.obs_to_tensor(terminal_obs)[0]
+                with th.no_grad():
+                    terminal_values = self.policy.predict_values(terminal_obs_tensor)  # type: ignore[arg-type]
+                step_rewards[truncated] += self.gamma * terminal_values.cpu().numpy().flatten()
+
+            rollout_buffer.add_envs(
+                env_indices,
+                self._last_obs[env_indices],
+                pending_actions[env_indices],
+                step_rewards,
+                self._last_episode_starts[env_indices],
+                pending_values[env_indices],
+                pending_log_probs[env_indices],
+            )
+            self._last_obs[env_indices] = step_obs
+            self._last_episode_starts[env_indices] = step_dones
+            env_steps[env_indices] += 1
+            ready_indices = env_indices
+
+        with th.no_grad():
+            # Compute value for the last timestep
+            values = self.policy.predict_values(obs_as_tensor(self._last_obs, self.device))  # type: ignore[arg-type]
+
+        rollout_buffer.compute_returns_and_advantage(last_values=values, dones=self._last_episode_starts)
+
+        callback.update_locals(locals())
+
+        callback.on_rollout_end()
+
+        return True
+
+    def _stack_terminal_observations(
+        self, terminal_observations: List[Union[np.ndarray, Dict[str, np.ndarray]]]
+    ) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Stack the terminal observations of several envs into a single batch.
+
+        :param terminal_observations: One (non-vectorized) observation per env
+        :return: The batched observation, the env index being the first axis
+        """
+        if isinstance(self.observation_space, spaces.Dict):
+            return {key: np.stack([obs[key] for obs in terminal_observations]) for key in self.observation_space.spaces.keys()}
+        return np.stack(terminal_observations)  # type: ignore[arg-type]
+
     def train(self) -> None:
         """
         Consume current rollout data and update policy parameters.
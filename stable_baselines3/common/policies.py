@@ -28,6 +28,7 @@ from stable_baselines3.common.torch_layers import (
     FlattenExtractor,
     MlpExtractor,
     NatureCNN,
+    create_ensemble_mlp,
     create_mlp,
 )
 from stable_baselines3.common.type_aliases import PyTorchObs, Schedule
@@ -383,6 +384,32 @@ class BasePolicy(BaseModel, ABC):
 
         return actions, state  # type: ignore[return-value]
 
+    def make_predictor(
+        self,
+        deterministic: bool = True,
+        max_batch_size: int = 1,
+        inference_mode: bool = True,
+        backend: Optional[str] = None,
+    ) -> "PolicyPredictor":
+        """
+        Create a lean predictor, for repeated calls to ``predict()`` (e.g. in a control loop).
+        See ``PolicyPredictor``.
+
+        :param deterministic: Whether or not to return deterministic actions.
+        :param max_batch_size: Number of observations the preallocated buffers can hold
+        :param inference_mode: Whether to run the network under ``th.inference_mode()`` instead of ``th.no_grad()``
+        :param backend: How to run the network: ``None`` (eager), ``"script"`` (TorchScript)
+            or ``"compile"`` (``th.compile()``)
+        :return: The predictor
+        """
+        return PolicyPredictor(
+            self,
+            deterministic=deterministic,
+            max_batch_size=max_batch_size,
+            inference_mode=inference_mode,
+            backend=backend,
+        )
+
     def scale_action(self, action: np.ndarray) -> np.ndarray:
         """
         Rescale the action from [low, high] to [-1, 1]
@@ -411,6 +438,131 @@ class BasePolicy(BaseModel, ABC):
         return low + (0.5 * (scaled_action + 1.0) * (high - low))
 
 
+class _PolicyActionModule(nn.Module):
+    """
+    Network of a ``PolicyPredictor``: ``policy._predict()`` followed by the post-processing
+    of ``BasePolicy.predict()`` (rescaling or clipping of the actions), so it can be scripted or compiled as a whole.
+
+    :param policy: The policy
+    :param deterministic: Whether or not to return deterministic actions.
+    """
+
+    def __init__(self, policy: BasePolicy, deterministic: bool):
+        super().__init__()
+        self.policy = policy
+        self.deterministic = deterministic
+        self.action_shape = policy.action_space.shape
+        self.is_box = isinstance(policy.action_space, spaces.Box)
+        self.squash_output = policy.squash_output
+        if self.is_box:
+            assert isinstance(policy.action_space, spaces.Box)
+            self.register_buffer("low", th.as_tensor(policy.action_space.low, device=policy.device))
+            self.register_buffer("high", th.as_tensor(policy.action_space.high, device=policy.device))
+
+    def forward(self, observation: th.Tensor) -> th.Tensor:
+        actions = self.policy._predict(observation, deterministic=self.deterministic)
+        actions = actions.reshape((-1, *self.action_shape))  # type: ignore[misc]
+        if self.is_box:
+            if self.squash_output:
+                # Rescale from [-1, 1] to [low, high], see ``BasePolicy.unscale_action()``
+                actions = self.low + 0.5 * (actions + 1.0) * (self.high - self.low)
+            else:
+                actions = th.clamp(actions, self.low, self.high)
+        return actions
+
+
+class PolicyPredictor:
+    """
+    Lean version of ``BasePolicy.predict()``, for repeated calls with the same policy (e.g. in a control loop).
+
+    Compared to ``predict()``, the checks on the observation space are done once at creation,
+    the observations are copied to a preallocated tensor and the actions to a preallocated array,
+    and the network can be run under ``th.inference_mode()``, scripted or compiled.
+    The observations must already be in the format of the policy observation space
+    (no image transposition is done) and Dict observation spaces are not supported.
+    The policy is put in evaluation mode.
+
+    .. warning::
+
+        The returned actions are a view on the output buffer of the predictor,
+        they are overwritten by the next call: copy them to keep them.
+
+    :param policy: The policy
+    :param deterministic: Whether or not to return deterministic actions.
+    :param max_batch_size: Number of observations the preallocated buffers can hold,
+        they are reallocated when a larger batch is given.
+    :param inference_mode: Whether to run the network under ``th.inference_mode()`` instead of ``th.no_grad()``
+    :param backend: How to run the network: ``None`` (eager, with the current weights of the policy),
+        ``"script"`` (TorchScript trace of the network) or ``"compile"`` (``th.compile()``).
+        Scripted and compiled networks are created (and warmed up) when creating the predictor.
+    """
+
+    def __init__(
+        self,
+        policy: BasePolicy,
+        deterministic: bool = True,
+        max_batch_size: int = 1,
+        inference_mode: bool = True,
+        backend: Optional[str] = None,
+    ):
+        assert backend in (None, "script", "compile"), f"Unknown backend {backend}, must be None, 'script' or 'compile'"
+        assert not isinstance(policy.observation_space, spaces.Dict), "Dict observation spaces are not supported"
+        policy.set_training_mode(False)
+        self.policy = policy
+        self.deterministic = deterministic
+        self.inference_mode = inference_mode
+        self.backend = backend
+        self.observation_shape: Tuple[int, ...] = policy.observation_space.shape  # type: ignore[assignment]
+        # Same dtype as ``obs_as_tensor()``
+        self._observation_dtype = th.from_numpy(np.zeros(0, dtype=policy.observation_space.dtype)).dtype
+
+        self.network: nn.Module = _PolicyActionModule(policy, deterministic)
+        example_observation = th.zeros((1, *self.observation_shape), dtype=self._observation_dtype, device=policy.device)
+        if backend == "script":
+            with th.no_grad(), warnings.catch_warnings():
+                # Python values (shapes, flags) are recorded as constants of the trace
+                warnings.simplefilter("ignore", category=th.jit.TracerWarning)
+                self.network = th.jit.trace(self.network, example_observation, check_trace=False)
+        elif backend == "compile":
+            self.network = th.compile(self.network)  # type: ignore[assignment]
+
+        # The warmup call gives the dtype of the actions
+        with self._context():
+            example_actions = self.network(example_observation)
+        self._action_dtype = example_actions.dtype
+        self._allocate(max_batch_size)
+
+    def _context(self) -> Any:
+        return th.inference_mode() if self.inference_mode else th.no_grad()
+
+    def _allocate(self, batch_size: int) -> None:
+        self.max_batch_size = batch_size
+        self._observations = th.empty(
+            (batch_size, *self.observation_shape), dtype=self._observation_dtype, device=self.policy.device
+        )
+        self._actions = th.empty((batch_size, *self.policy.action_space.shape), dtype=self._action_dtype)  # type: ignore[misc]
+        self._actions_array = self._actions.numpy()
+
+    def __call__(self, observation: np.ndarray) -> np.ndarray:
+        """
+        Get the policy action from an observation.
+
+        :param observation: the input observation, batched or not
+        :return: the actions, with a batch dimension if the observation has one
+        """
+        observation = np.asarray(observation)
+        vectorized = observation.ndim > len(self.observation_shape)
+        batch_size = len(observation) if vectorized else 1
+        if batch_size > self.max_batch_size:
+            self._allocate(batch_size)
+        observations = self._observations[:batch_size]
+        observations.copy_(th.from_numpy(observation.reshape((batch_size, *self.observation_shape))))
+        with self._context():
+            actions = self.network(observations)
+        self._actions[:batch_size].copy_(actions)
+        return self._actions_array[:batch_size] if vectorized else self._actions_array[0]
+
+
 class ActorCriticPolicy(BasePolicy):
     """
     Policy class for actor-critic algorithms (has both policy and value prediction).
@@ -932,6 +1084,11 @@ class ContinuousCritic(BaseModel):
     :param n_critics: Number of critic networks to create.
     :param share_features_extractor: Whether the features extractor is shared or not
         between the actor and the critic (this saves computation time)
+    :param batched_critics: Whether to evaluate all the critic networks at once,
+        stacking their weights and using batched matrix multiplications
+        (see ``EnsembleLinear``), instead of one network after the other.
+        This removes the per-critic overhead, which matters for large ensembles (e.g. REDQ).
+        The parameters are then stored in ``q_ensemble`` instead of ``qf0``, ``qf1``, ...
     """
 
     features_extractor: BaseFeaturesExtractor
@@ -947,6 +1104,7 @@ class ContinuousCritic(BaseModel):
         normalize_images: bool = True,
         n_critics: int = 2,
         share_features_extractor: bool = True,
+        batched_critics: bool = False,
     ):
         super().__init__(
             observation_space,
@@ -959,12 +1117,18 @@ class ContinuousCritic(BaseModel):
 
         self.share_features_extractor = share_features_extractor
         self.n_critics = n_critics
+        self.batched_critics = batched_critics
         self.q_networks: List[nn.Module] = []
-        for idx in range(n_critics):
-            q_net_list = create_mlp(features_dim + action_dim, 1, net_arch, activation_fn)
-            q_net = nn.Sequential(*q_net_list)
-            self.add_module(f"qf{idx}", q_net)
-            self.q_networks.append(q_net)
+        if batched_critics:
+            # Single network mapping the input to the (n_critics, batch_size, 1) Q-values
+            q_ensemble_list = create_ensemble_mlp(n_critics, features_dim + action_dim, 1, net_arch, activation_fn)
+            self.q_ensemble = nn.Sequential(*q_ensemble_list)
+        else:
+            for idx in range(n_critics):
+                q_net_list = create_mlp(features_dim + action_dim, 1, net_arch, activation_fn)
+                q_net = nn.Sequential(*q_net_list)
+                self.add_module(f"qf{idx}", q_net)
+                self.q_networks.append(q_net)
 
     def forward(self, obs: th.Tensor, actions: th.Tensor) -> Tuple[th.Tensor, ...]:
         # Learn the features extractor using the policy loss only
@@ -972,6 +1136,8 @@ class ContinuousCritic(BaseModel):
         with th.set_grad_enabled(not self.share_features_extractor):
             features = self.extract_features(obs, self.features_extractor)
         qvalue_input = th.cat([features, actions], dim=1)
+        if self.batched_critics:
+            return tuple(self.q_ensemble(qvalue_input).unbind(dim=0))
         return tuple(q_net(qvalue_input) for q_net in self.q_networks)
 
     def q1_forward(self, obs: th.Tensor, actions: th.Tensor) -> th.Tensor:
@@ -982,4 +1148,8 @@ class ContinuousCritic(BaseModel):
         """
         with th.no_grad():
             features = self.extract_features(obs, self.features_extractor)
-        return self.q_networks[0](th.cat([features, actions], dim=1))
+        qvalue_input = th.cat([features, actions], dim=1)
+        if self.batched_critics:
+            # All the critics are evaluated in the same matmuls, only the first estimate is kept
+            return self.q_ensemble(qvalue_input)[0]
+        return self.q_networks[0](qvalue_input)
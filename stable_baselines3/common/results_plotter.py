@@ -99,7 +99,12 @@ def plot_curves(
 
 
 def plot_results(
-    dirs: List[str], num_timesteps: Optional[int], x_axis: str, task_name: str, figsize: Tuple[int, int] = (8, 2)
+    dirs: List[str],
+    num_timesteps: Optional[int],
+    x_axis: str,
+    task_name: str,
+    figsize: Tuple[int, int] = (8, 2),
+    use_cache: bool = False,
 ) -> None:
     """
     Plot the results using csv files from ``Monitor`` wrapper.
@@ -110,11 +115,13 @@ def plot_results(
         (can be X_TIMESTEPS='timesteps', X_EPISODES='episodes' or X_WALLTIME='walltime_hrs')
     :param task_name: the title of the task to plot
     :param figsize: Size of the figure (width, height)
+    :param use_cache: Whether to cache the parsed monitor files in each results folder
+        (in a ``.monitor_cache.pkl`` file, see ``load_results()``), to speed up the next plots
     """
 
     data_frames = []
     for folder in dirs:
-        data_frame = load_results(folder)
+        data_frame = load_results(folder, use_cache=use_cache)
         if num_timesteps is not None:
             data_frame = data_frame[data_frame.l.cumsum() <= num_timesteps]
         data_frames.append(data_frame)
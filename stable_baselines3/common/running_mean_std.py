@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
 import numpy as np
 
@@ -15,6 +15,22 @@ class RunningMeanStd:
         self.mean = np.zeros(shape, np.float64)
         self.var = np.ones(shape, np.float64)
         self.count = epsilon
+        # Incremented on each update of the statistics, to invalidate values derived from them
+        self.version = 0
+        # Sums of the batches accumulated since the last update (see ``accumulate()``),
+        # centered on the mean at the time of the last update
+        self.pending_sum = np.zeros(shape, np.float64)
+        self.pending_sum_sq = np.zeros(shape, np.float64)
+        self.pending_count = 0
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Backward compatibility: accumulation buffers were added later
+        if "pending_sum" not in state:
+            state["pending_sum"] = np.zeros_like(state["mean"])
+            state["pending_sum_sq"] = np.zeros_like(state["mean"])
+            state["pending_count"] = 0
+        state.setdefault("version", 0)
+        self.__dict__.update(state)
 
     def copy(self) -> "RunningMeanStd":
         """
@@ -40,6 +56,33 @@ class RunningMeanStd:
         batch_count = arr.shape[0]
         self.update_from_moments(batch_mean, batch_var, batch_count)
 
+    def accumulate(self, arr: np.ndarray) -> None:
+        """
+        Accumulate a batch in a single pass over the data, without updating the statistics.
+        The accumulated batches are merged into the statistics by ``flush()``.
+
+        :param arr: The batch, the first axis being the batch axis
+        """
+        # Centering on the current mean avoids catastrophic cancellation
+        centered = arr - self.mean
+        self.pending_sum += centered.sum(axis=0)
+        np.square(centered, out=centered)
+        self.pending_sum_sq += centered.sum(axis=0)
+        self.pending_count += arr.shape[0]
+
+    def flush(self) -> None:
+        """
+        Update the statistics with the batches accumulated since the last call.
+        """
+        if self.pending_count == 0:
+            return
+        mean_offset = self.pending_sum / self.pending_count
+        batch_var = np.maximum(self.pending_sum_sq / self.pending_count - np.square(mean_offset), 0.0)
+        self.update_from_moments(self.mean + mean_offset, batch_var, self.pending_count)
+        self.pending_sum.fill(0.0)
+        self.pending_sum_sq.fill(0.0)
+        self.pending_count = 0
+
     def update_from_moments(self, batch_mean: np.ndarray, batch_var: np.ndarray, batch_count: float) -> None:
         delta = batch_mean - self.mean
         tot_count = self.count + batch_count
@@ -55,3 +98,4 @@ class RunningMeanStd:
         self.mean = new_mean
         self.var = new_var
         self.count = new_count
+        self.version += 1
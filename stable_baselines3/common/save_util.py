@@ -9,8 +9,10 @@ import json
 import os
 import pathlib
 import pickle
+import shutil
 import warnings
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, Optional, Tuple, Union
 
 import cloudpickle
@@ -311,13 +313,32 @@ def save_to_zip_file(
     file = open_path(save_path, "w", verbose=0, suffix="zip")
     # data/params can be None, so do not
     # try to serialize them blindly
-    if data is not None:
-        serialized_data = data_to_json(data)
+    serialized_data = data_to_json(data) if data is not None else None
+    _write_zip_file(file, serialized_data, params, pytorch_variables)
 
+    if isinstance(save_path, (str, pathlib.Path)):
+        file.close()
+
+
+def _write_zip_file(
+    file: io.BufferedIOBase,
+    serialized_data: Optional[str],
+    params: Optional[Dict[str, Any]],
+    pytorch_variables: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Write serialized model data and PyTorch variables to a zip archive.
+    The entries are stored without compression.
+
+    :param file: File to write the archive to
+    :param serialized_data: Class parameters, serialized with ``data_to_json``
+    :param params: Model parameters (dict of state_dicts)
+    :param pytorch_variables: Other PyTorch variables
+    """
     # Create a zip-archive and write our objects there.
-    with zipfile.ZipFile(file, mode="w") as archive:
+    with zipfile.ZipFile(file, mode="w", compression=zipfile.ZIP_STORED) as archive:
         # Do not try to save "None" elements
-        if data is not None:
+        if serialized_data is not None:
             archive.writestr("data", serialized_data)
         if pytorch_variables is not None:
             with archive.open("pytorch_variables.pth", mode="w", force_zip64=True) as pytorch_variables_file:
@@ -331,8 +352,142 @@ def save_to_zip_file(
         # Save system info about the current python env
         archive.writestr("system_info.txt", get_system_info(print_info=False)[1])
 
-    if isinstance(save_path, (str, pathlib.Path)):
-        file.close()
+
+def _write_directory(
+    path: pathlib.Path,
+    serialized_data: Optional[str],
+    params: Optional[Dict[str, Any]],
+    pytorch_variables: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Write serialized model data and PyTorch variables to a directory,
+    with the same entries as the zip archive (one file per entry).
+    The ``.pth`` files can then be memory-mapped when loading.
+
+    :param path: Directory to create
+    :param serialized_data: Class parameters, serialized with ``data_to_json``
+    :param params: Model parameters (dict of state_dicts)
+    :param pytorch_variables: Other PyTorch variables
+    """
+    path.mkdir(parents=True)
+    if serialized_data is not None:
+        (path / "data").write_text(serialized_data)
+    if pytorch_variables is not None:
+        th.save(pytorch_variables, path / "pytorch_variables.pth")
+    if params is not None:
+        for file_name, dict_ in params.items():
+            th.save(dict_, path / (file_name + ".pth"))
+    (path / "_stable_baselines3_version").write_text(sb3.__version__)
+    (path / "system_info.txt").write_text(get_system_info(print_info=False)[1])
+
+
+def snapshot_to_cpu(obj: Any) -> Any:
+    """
+    Copy the tensors of a (nested) state dict to CPU memory,
+    so they can be serialized while the originals keep being updated.
+
+    :param obj: A tensor, or dict/list/tuple containing tensors (other objects are kept as is)
+    :return: The copy
+    """
+    if isinstance(obj, th.Tensor):
+        return obj.detach().to("cpu", copy=True)
+    if isinstance(obj, dict):
+        # Keeps OrderedDict and the metadata of state dicts
+        copy = obj.copy()
+        for key, value in obj.items():
+            copy[key] = snapshot_to_cpu(value)
+        return copy
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(snapshot_to_cpu(value) for value in obj)
+    return obj
+
+
+# Single thread so checkpoints are written in order
+_checkpoint_executor: Optional[ThreadPoolExecutor] = None
+
+
+def save_checkpoint(
+    save_path: Union[str, pathlib.Path],
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    pytorch_variables: Optional[Dict[str, Any]] = None,
+    as_directory: bool = False,
+    asynchronous: bool = True,
+) -> Optional[Future]:
+    """
+    Save model data to an uncompressed zip archive or to a directory,
+    with an atomic rename, so an interrupted save never leaves a partial checkpoint behind.
+
+    The class parameters are serialized and the tensors are copied to CPU memory
+    on the calling thread, the files are then written by a background thread when ``asynchronous``,
+    so training can go on in the meantime.
+
+    :param save_path: Where to store the model (a ``.zip`` suffix is added to archives without suffix).
+        An existing checkpoint at this path is replaced.
+    :param data: Class parameters being stored (non-PyTorch variables)
+    :param params: Model parameters being stored expected to contain an entry for every
+                   state_dict with its name and the state_dict.
+    :param pytorch_variables: Other PyTorch variables expected to contain name and value of the variable.
+    :param as_directory: Whether to write a directory (whose tensors can be memory-mapped when loading)
+        instead of a zip archive
+    :param asynchronous: Whether to write the files in a background thread
+    :return: When ``asynchronous``, a future that completes once the checkpoint is written
+    """
+    global _checkpoint_executor
+
+    path = pathlib.Path(save_path)
+    if not as_directory and path.suffix == "":
+        path = path.with_suffix(".zip")
+    serialized_data = data_to_json(data) if data is not None else None
+    params = snapshot_to_cpu(params)
+    pytorch_variables = snapshot_to_cpu(pytorch_variables)
+
+    if not asynchronous:
+        _write_checkpoint(path, serialized_data, params, pytorch_variables, as_directory)
+        return None
+
+    if _checkpoint_executor is None:
+        _checkpoint_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sb3_checkpoint")
+    return _checkpoint_executor.submit(_write_checkpoint, path, serialized_data, params, pytorch_variables, as_directory)
+
+
+def _write_checkpoint(
+    path: pathlib.Path,
+    serialized_data: Optional[str],
+    params: Optional[Dict[str, Any]],
+    pytorch_variables: Optional[Dict[str, Any]],
+    as_directory: bool,
+) -> None:
+    """
+    Write a checkpoint to a temporary path next to ``path``, then rename it.
+    The temporary files are removed if the writing fails.
+    See ``save_checkpoint()``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    if as_directory:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        try:
+            _write_directory(tmp_path, serialized_data, params, pytorch_variables)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        if path.is_dir():
+            # A directory cannot replace a non-empty one, move the old one away first
+            old_path = path.with_name(f".{path.name}.old{os.getpid()}")
+            os.replace(path, old_path)
+            os.replace(tmp_path, path)
+            shutil.rmtree(old_path)
+        else:
+            os.replace(tmp_path, path)
+    else:
+        try:
+            with open(tmp_path, "wb") as file:
+                _write_zip_file(file, serialized_data, params, pytorch_variables)  # type: ignore[arg-type]
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, path)
 
 
 def save_to_pkl(path: Union[str, pathlib.Path, io.BufferedIOBase], obj: Any, verbose: int = 0) -> None:
@@ -379,9 +534,10 @@ def load_from_zip_file(
     device: Union[th.device, str] = "auto",
     verbose: int = 0,
     print_system_info: bool = False,
+    mmap: bool = False,
 ) -> Tuple[Optional[Dict[str, Any]], TensorDict, Optional[TensorDict]]:
     """
-    Load model data from a .zip archive
+    Load model data from a .zip archive, or from a directory written by ``save_checkpoint()``
 
     :param load_path: Where to load the model from
     :param load_data: Whether we should load and return data
@@ -396,9 +552,16 @@ def load_from_zip_file(
     :param verbose: Verbosity level: 0 for no output, 1 for info messages, 2 for debug messages
     :param print_system_info: Whether to print or not the system info
         about the saved model.
+    :param mmap: Whether to memory-map the tensors instead of reading them,
+        only possible when loading from a directory.
     :return: Class parameters, model state_dicts (aka "params", dict of state_dict)
         and dict of pytorch variables
     """
+    if isinstance(load_path, (str, pathlib.Path)) and os.path.isdir(load_path):
+        return _load_from_directory(pathlib.Path(load_path), load_data, custom_objects, device, print_system_info, mmap)
+    if mmap:
+        warnings.warn("Tensors can only be memory-mapped when loading from a directory, they will be read instead.")
+
     file = open_path(load_path, "r", verbose=verbose, suffix="zip")
 
     # set device to cpu if cuda is not available
@@ -446,7 +609,8 @@ def load_from_zip_file(
                     file_content.seek(0)
                     # Load the parameters with the right ``map_location``.
                     # Remove ".pth" ending with splitext
-                    th_object = th.load(file_content, map_location=device)
+                    # The archive only holds tensors and state dicts, no need to unpickle arbitrary objects
+                    th_object = th.load(file_content, map_location=device, weights_only=True)
                     # "tensors.pth" was renamed "pytorch_variables.pth" in v0.9.0, see PR #138
                     if file_path == "pytorch_variables.pth" or file_path == "tensors.pth":
                         # PyTorch variables (not state_dicts)
@@ -462,3 +626,39 @@ def load_from_zip_file(
         if isinstance(load_path, (str, pathlib.Path)):
             file.close()
     return data, params, pytorch_variables
+
+
+def _load_from_directory(
+    path: pathlib.Path,
+    load_data: bool = True,
+    custom_objects: Optional[Dict[str, Any]] = None,
+    device: Union[th.device, str] = "auto",
+    print_system_info: bool = False,
+    mmap: bool = False,
+) -> Tuple[Optional[Dict[str, Any]], TensorDict, Optional[TensorDict]]:
+    """
+    Load model data from a directory written by ``save_checkpoint()``.
+    See ``load_from_zip_file()`` for the parameters.
+    """
+    device = get_device(device=device)
+    data = None
+    pytorch_variables = None
+    params = {}
+
+    if print_system_info:
+        print("== SAVED MODEL SYSTEM INFO ==")
+        print((path / "system_info.txt").read_text())
+
+    if (path / "data").is_file() and load_data:
+        data = json_to_data((path / "data").read_text(), custom_objects=custom_objects)
+
+    # Only pass mmap when needed, for older PyTorch versions
+    load_kwargs = {"mmap": True} if mmap else {}
+    for file_path in sorted(path.glob("*.pth")):
+        # As for archives, the files only hold tensors and state dicts
+        th_object = th.load(file_path, map_location=device, weights_only=True, **load_kwargs)
+        if file_path.name == "pytorch_variables.pth":
+            pytorch_variables = th_object
+        else:
+            params[file_path.stem] = th_object
+    return data, params, pytorch_variables
@@ -0,0 +1,83 @@
+from typing import Union
+
+import numpy as np
+
+
+class SegmentTree:
+    """
+    Array-based segment tree, used to store the priorities of a ``PrioritizedReplayBuffer``.
+    Values are read and written in batches, each batch update costs ``O(batch_size * log(capacity))``.
+
+    The leaves are stored at ``[n_leaves, 2 * n_leaves)`` and the root at index 1,
+    the children of node ``i`` being ``2 * i`` and ``2 * i + 1``.
+
+    :param capacity: Number of elements
+    :param operation: Binary operation used to combine two nodes (``np.add``, ``np.minimum``, ...)
+    :param neutral_element: Neutral element of the operation, initial value of the elements
+    """
+
+    def __init__(self, capacity: int, operation: np.ufunc, neutral_element: float):
+        assert capacity > 0, "The capacity of a segment tree must be positive"
+        self.capacity = capacity
+        # Use a power of two so all the leaves are at the same depth
+        self.n_leaves = 1 << (capacity - 1).bit_length()
+        self.operation = operation
+        self.values = np.full(2 * self.n_leaves, neutral_element, dtype=np.float64)
+
+    def __setitem__(self, indices: Union[int, np.ndarray], values: Union[float, np.ndarray]) -> None:
+        nodes = np.atleast_1d(np.asarray(indices, dtype=np.int64)) + self.n_leaves
+        self.values[nodes] = values
+        # Update the ancestors level by level
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.values[nodes] = self.operation(self.values[2 * nodes], self.values[2 * nodes + 1])
+            nodes = np.unique(nodes // 2)
+
+    def __getitem__(self, indices: Union[int, np.ndarray]) -> np.ndarray:
+        return self.values[np.asarray(indices, dtype=np.int64) + self.n_leaves]
+
+    def reduce(self) -> float:
+        """
+        :return: The result of the operation over all the elements
+        """
+        return float(self.values[1])
+
+
+class SumSegmentTree(SegmentTree):
+    """
+    Segment tree storing sums, to sample indices proportionally to their value.
+
+    :param capacity: Number of elements
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity, np.add, 0.0)
+
+    def find_prefixsum_idx(self, prefixsums: np.ndarray) -> np.ndarray:
+        """
+        Find, for each prefix sum, the highest index ``i`` such that
+        ``sum(values[:i]) <= prefixsum``, in ``O(batch_size * log(capacity))``.
+
+        :param prefixsums: Prefix sums, between 0 and the total sum
+        :return: The indices
+        """
+        prefixsums = np.array(prefixsums, dtype=np.float64)
+        nodes = np.ones(len(prefixsums), dtype=np.int64)
+        while nodes[0] < self.n_leaves:
+            left_children = 2 * nodes
+            left_values = self.values[left_children]
+            go_right = prefixsums >= left_values
+            prefixsums -= left_values * go_right
+            nodes = left_children + go_right
+        return nodes - self.n_leaves
+
+
+class MinSegmentTree(SegmentTree):
+    """
+    Segment tree storing minimums.
+
+    :param capacity: Number of elements
+    """
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity, np.minimum, float("inf"))
@@ -0,0 +1,277 @@
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional, SupportsFloat, Tuple
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+
+from stable_baselines3.common.running_mean_std import RunningMeanStd
+
+
+class _MomentsBlock:
+    """
+    NumPy views on a shared memory block holding the merged statistics
+    (mean, var, count and a version number) followed by one slot per worker
+    with the (mean, var, count) moments of the batches the worker pushed since the last reduction.
+
+    :param shape: The shape of the data stream's output
+    :param n_workers: Number of worker slots
+    :param name: Name of the block to attach to, if None a new block is allocated
+    """
+
+    def __init__(self, shape: Tuple[int, ...], n_workers: int, name: Optional[str] = None):
+        size = int(np.prod(shape))
+        # mean, var, count, (version)
+        slot_size = 2 * size + 1
+        n_items = slot_size + 1 + n_workers * slot_size
+        if name is None:
+            self.block = SharedMemory(create=True, size=n_items * np.dtype(np.float64).itemsize)
+        else:
+            self.block = SharedMemory(name=name)
+        data = np.ndarray((n_items,), dtype=np.float64, buffer=self.block.buf)
+        self.mean = data[:size].reshape(shape)
+        self.var = data[size : 2 * size].reshape(shape)
+        self.count = data[2 * size : 2 * size + 1]
+        self.version = data[2 * size + 1 : 2 * size + 2]
+        slots = data[slot_size + 1 :].reshape(n_workers, slot_size)
+        self.slot_means = slots[:, :size].reshape(n_workers, *shape)
+        self.slot_vars = slots[:, size : 2 * size].reshape(n_workers, *shape)
+        self.slot_counts = slots[:, 2 * size]
+
+    def close(self, unlink: bool = False) -> None:
+        # The views must be deleted before closing the block
+        del self.mean, self.var, self.count, self.version, self.slot_means, self.slot_vars, self.slot_counts
+        self.block.close()
+        if unlink:
+            self.block.unlink()
+
+
+class SharedRunningMeanStd:
+    """
+    Running mean and std shared by several processes, for instance to normalize
+    observations in the ``SubprocVecEnv`` workers, next to the environments.
+
+    Each worker accumulates the moments of its batches locally (see ``RunningMeanStdClient``)
+    and periodically pushes them to its slot in shared memory.
+    The main process merges the slots into the shared statistics with ``reduce()``,
+    using the parallel algorithm of ``RunningMeanStd.update_from_moments()``,
+    and the workers pull the merged statistics back.
+    ``reduce()`` must be called periodically during training,
+    for instance with a ``ReduceSharedStatisticsCallback`` passed to ``learn()``.
+
+    :param shape: The shape of the data stream's output
+    :param n_workers: Maximum number of workers (clients)
+    :param epsilon: helps with arithmetic issues
+    :param start_method: multiprocessing start method of the workers, used to create the lock
+        (defaults to the one of ``SubprocVecEnv``)
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...] = (),
+        n_workers: int = 1,
+        epsilon: float = 1e-4,
+        start_method: Optional[str] = None,
+    ):
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        self.shape = shape
+        self.n_workers = n_workers
+        self.lock = mp.get_context(start_method).Lock()
+        self._block = _MomentsBlock(shape, n_workers)
+        # Statistics of the main process, published after each reduction
+        self.rms = RunningMeanStd(epsilon=epsilon, shape=shape)
+        self._publish()
+
+    def _publish(self) -> None:
+        self._block.mean[...] = self.rms.mean
+        self._block.var[...] = self.rms.var
+        self._block.count[0] = self.rms.count
+        self._block.version[0] += 1
+
+    def client(self, worker_idx: int, sync_interval: int = 100) -> "RunningMeanStdClient":
+        """
+        Create the client of a worker. It can be pickled and sent to the worker process.
+
+        :param worker_idx: Index of the worker slot, each worker must use its own slot
+        :param sync_interval: Number of updates between two synchronizations
+            (push of the local moments and pull of the merged statistics)
+        :return: The client
+        """
+        assert 0 <= worker_idx < self.n_workers, f"Invalid worker index {worker_idx}"
+        return RunningMeanStdClient(self._block.block.name, self.shape, self.n_workers, worker_idx, self.lock, sync_interval)
+
+    def reduce(self) -> int:
+        """
+        Merge the moments pushed by the workers into the shared statistics.
+
+        :return: Number of samples that were merged
+        """
+        with self.lock:
+            block = self._block
+            n_samples = 0
+            for worker_idx in np.flatnonzero(block.slot_counts > 0):
+                count = float(block.slot_counts[worker_idx])
+                self.rms.update_from_moments(block.slot_means[worker_idx].copy(), block.slot_vars[worker_idx].copy(), count)
+                block.slot_counts[worker_idx] = 0.0
+                n_samples += int(count)
+            if n_samples > 0:
+                self._publish()
+        return n_samples
+
+    def close(self) -> None:
+        """
+        Free the shared memory, the workers must not use their client afterward.
+        """
+        self._block.close(unlink=True)
+
+
+class RunningMeanStdClient:
+    """
+    Worker side of a ``SharedRunningMeanStd``: the batches are accumulated locally,
+    and every ``sync_interval`` updates the local moments are pushed to the worker slot
+    and ``rms`` is replaced by the latest merged statistics.
+    Use ``SharedRunningMeanStd.client()`` to create one.
+
+    :param block_name: Name of the shared memory block
+    :param shape: The shape of the data stream's output
+    :param n_workers: Number of worker slots
+    :param worker_idx: Index of the worker slot
+    :param lock: Lock protecting the shared memory block
+    :param sync_interval: Number of updates between two synchronizations
+    """
+
+    def __init__(
+        self,
+        block_name: str,
+        shape: Tuple[int, ...],
+        n_workers: int,
+        worker_idx: int,
+        lock: Any,
+        sync_interval: int = 100,
+    ):
+        self.block_name = block_name
+        self.shape = shape
+        self.n_workers = n_workers
+        self.worker_idx = worker_idx
+        self.lock = lock
+        self.sync_interval = sync_interval
+        self._setup()
+
+    def _setup(self) -> None:
+        self._block = _MomentsBlock(self.shape, self.n_workers, name=self.block_name)
+        # Moments of the batches since the last push
+        self.pending = RunningMeanStd(epsilon=0.0, shape=self.shape)
+        self.rms = RunningMeanStd(shape=self.shape)
+        self.n_updates = 0
+        self.version = -1.0
+        self.pull()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the description of the block is sent, the worker attaches to it
+        return {key: self.__dict__[key] for key in ("block_name", "shape", "n_workers", "worker_idx", "lock", "sync_interval")}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._setup()
+
+    def update(self, arr: np.ndarray) -> None:
+        """
+        Accumulate a batch, and synchronize with the other processes if needed.
+
+        :param arr: The batch, the first axis being the batch axis
+        """
+        self.pending.update(arr)
+        self.n_updates += 1
+        if self.n_updates % self.sync_interval == 0:
+            self.push()
+            self.pull()
+
+    def push(self) -> None:
+        """
+        Merge the local moments into the worker slot.
+        """
+        if self.pending.count == 0:
+            return
+        block = self._block
+        with self.lock:
+            slot = RunningMeanStd(epsilon=0.0, shape=self.shape)
+            slot_count = float(block.slot_counts[self.worker_idx])
+            if slot_count > 0:
+                # The previous push was not reduced yet
+                slot.update_from_moments(block.slot_means[self.worker_idx], block.slot_vars[self.worker_idx], slot_count)
+            slot.update_from_moments(self.pending.mean, self.pending.var, self.pending.count)
+            block.slot_means[self.worker_idx] = slot.mean
+            block.slot_vars[self.worker_idx] = slot.var
+            block.slot_counts[self.worker_idx] = slot.count
+        self.pending = RunningMeanStd(epsilon=0.0, shape=self.shape)
+
+    def pull(self) -> None:
+        """
+        Retrieve the latest merged statistics.
+        """
+        block = self._block
+        if block.version[0] == self.version:
+            return
+        with self.lock:
+            self.rms.mean = block.mean.copy()
+            self.rms.var = block.var.copy()
+            self.rms.count = float(block.count[0])
+            self.version = float(block.version[0])
+
+    def close(self) -> None:
+        self._block.close()
+
+
+class SharedNormalizeObservation(gym.Wrapper):
+    """
+    Normalize the observations of an environment with statistics shared by all the workers,
+    so the normalization happens next to the environment (for instance in a ``SubprocVecEnv`` worker)
+    instead of in the main process with a ``VecNormalize``.
+
+    :param env: Environment to wrap
+    :param client: Client of the ``SharedRunningMeanStd`` holding the observation statistics
+    :param training: Whether to update the statistics
+    :param clip_obs: Max absolute value for observation
+    :param epsilon: To avoid division by zero
+    """
+
+    def __init__(
+        self,
+        env: gym.Env,
+        client: RunningMeanStdClient,
+        training: bool = True,
+        clip_obs: float = 10.0,
+        epsilon: float = 1e-8,
+    ):
+        assert isinstance(env.observation_space, spaces.Box), "Only Box observation spaces can be normalized"
+        super().__init__(env)
+        self.client = client
+        self.training = training
+        self.clip_obs = clip_obs
+        self.epsilon = epsilon
+
+    def normalize_obs(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Normalize an observation with the latest merged statistics.
+        """
+        rms = self.client.rms
+        return np.clip((obs - rms.mean) / np.sqrt(rms.var + self.epsilon), -self.clip_obs, self.clip_obs).astype(np.float32)
+
+    def reset(self, **kwargs) -> Tuple[np.ndarray, Dict[str, Any]]:
+        obs, info = self.env.reset(**kwargs)
+        if self.training:
+            self.client.update(obs[np.newaxis])
+        return self.normalize_obs(obs), info
+
+    def step(self, action: Any) -> Tuple[np.ndarray, SupportsFloat, bool, bool, Dict[str, Any]]:
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        if self.training:
+            self.client.update(obs[np.newaxis])
+        return self.normalize_obs(obs), reward, terminated, truncated, info
+
+    def close(self) -> None:
+        self.client.close()
+        super().close()
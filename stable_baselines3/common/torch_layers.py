@@ -1,3 +1,4 @@
+import math
 from typing import Dict, List, Tuple, Type, Union
 
 import gymnasium as gym
@@ -148,6 +149,97 @@ def create_mlp(
     return modules
 
 
+class EnsembleLinear(nn.Module):
+    """
+    A batch of ``n_members`` independent fully-connected layers, evaluated with a single batched matmul.
+    The weights are stacked in a ``(n_members, in_features, out_features)`` tensor
+    and each member is initialized like a ``nn.Linear``.
+
+    :param n_members: Number of layers in the ensemble
+    :param in_features: Size of each input sample
+    :param out_features: Size of each output sample
+    :param bias: If set to False, the layers will not learn an additive bias
+    """
+
+    def __init__(self, n_members: int, in_features: int, out_features: int, bias: bool = True):
+        super().__init__()
+        self.n_members = n_members
+        self.in_features = in_features
+        self.out_features = out_features
+        self.weight = nn.Parameter(th.empty(n_members, in_features, out_features))
+        if bias:
+            self.bias = nn.Parameter(th.empty(n_members, 1, out_features))
+        else:
+            self.register_parameter("bias", None)
+        self.reset_parameters()
+
+    def reset_parameters(self) -> None:
+        # Same distribution as the default initialization of nn.Linear
+        bound = 1 / math.sqrt(self.in_features) if self.in_features > 0 else 0.0
+        nn.init.uniform_(self.weight, -bound, bound)
+        if self.bias is not None:
+            nn.init.uniform_(self.bias, -bound, bound)
+
+    def forward(self, input: th.Tensor) -> th.Tensor:
+        """
+        :param input: Either a ``(n_members, batch_size, in_features)`` tensor,
+            or a ``(batch_size, in_features)`` tensor shared by all the members
+        :return: A ``(n_members, batch_size, out_features)`` tensor
+        """
+        if input.dim() == 2:
+            # Shared input: a single (batch_size, in_features) x (in_features, n_members * out_features) matmul
+            weight = self.weight.transpose(0, 1).reshape(self.in_features, self.n_members * self.out_features)
+            output = th.mm(input, weight).view(-1, self.n_members, self.out_features).transpose(0, 1)
+            return output if self.bias is None else output + self.bias
+        if self.bias is None:
+            return th.bmm(input, self.weight)
+        return th.baddbmm(self.bias, input, self.weight)
+
+    def extra_repr(self) -> str:
+        return f"n_members={self.n_members}, in_features={self.in_features}, out_features={self.out_features}"
+
+
+def create_ensemble_mlp(
+    n_members: int,
+    input_dim: int,
+    output_dim: int,
+    net_arch: List[int],
+    activation_fn: Type[nn.Module] = nn.ReLU,
+    squash_output: bool = False,
+    with_bias: bool = True,
+) -> List[nn.Module]:
+    """
+    Create ``n_members`` MLPs with the same architecture (see ``create_mlp()``),
+    evaluated together with ``EnsembleLinear`` layers.
+    The resulting network maps a ``(batch_size, input_dim)`` input
+    to a ``(n_members, batch_size, output_dim)`` output.
+
+    :param n_members: Number of MLPs
+    :param input_dim: Dimension of the input vector
+    :param output_dim:
+    :param net_arch: Architecture of the neural nets
+        It represents the number of units per layer.
+        The length of this list is the number of layers.
+    :param activation_fn: The activation function
+        to use after each layer.
+    :param squash_output: Whether to squash the output using a Tanh
+        activation function
+    :param with_bias: If set to False, the layers will not learn an additive bias
+    :return:
+    """
+    layer_dims = [input_dim, *net_arch]
+    modules: List[nn.Module] = []
+    for in_dim, out_dim in zip(layer_dims[:-1], layer_dims[1:]):
+        modules.append(EnsembleLinear(n_members, in_dim, out_dim, bias=with_bias))
+        modules.append(activation_fn())
+
+    if output_dim > 0:
+        modules.append(EnsembleLinear(n_members, layer_dims[-1], output_dim, bias=with_bias))
+    if squash_output:
+        modules.append(nn.Tanh())
+    return modules
+
+
 class MlpExtractor(nn.Module):
     """
     Constructs an MLP that receives the output from a previous features extractor (i.e. a CNN) or directly
@@ -51,6 +51,21 @@ class ReplayBufferSamples(NamedTuple):
     next_observations: th.Tensor
     dones: th.Tensor
     rewards: th.Tensor
+    # Discount factors to apply to the bootstrapped value (n-step returns), None means gamma
+    discounts: Optional[th.Tensor] = None
+
+
+class PrioritizedReplayBufferSamples(NamedTuple):
+    observations: th.Tensor
+    actions: th.Tensor
+    next_observations: th.Tensor
+    dones: th.Tensor
+    rewards: th.Tensor
+    # Importance sampling weights
+    weights: th.Tensor
+    # Indices of the transitions, to update their priorities
+    indices: np.ndarray
+    discounts: Optional[th.Tensor] = None
 
 
 class DictReplayBufferSamples(NamedTuple):
@@ -59,6 +74,7 @@ class DictReplayBufferSamples(NamedTuple):
     next_observations: TensorDict
     dones: th.Tensor
     rewards: th.Tensor
+    discounts: Optional[th.Tensor] = None
 
 
 class RolloutReturn(NamedTuple):
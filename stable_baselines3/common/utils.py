@@ -46,7 +46,7 @@ def set_random_seed(seed: int, using_cuda: bool = False) -> None:
 
 
 # From stable baselines
-def explained_variance(y_pred: np.ndarray, y_true: np.ndarray) -> np.ndarray:
+def explained_variance(y_pred: Union[np.ndarray, th.Tensor], y_true: Union[np.ndarray, th.Tensor]) -> np.ndarray:
     """
     Computes fraction of variance that ypred explains about y.
     Returns 1 - Var[y-ypred] / Var[y]
@@ -60,6 +60,11 @@ def explained_variance(y_pred: np.ndarray, y_true: np.ndarray) -> np.ndarray:
     :param y_true: the expected value
     :return: explained variance of ypred and y
     """
+    # Buffers storing their data on the device (see ``TorchRolloutBuffer``)
+    if isinstance(y_pred, th.Tensor):
+        y_pred = y_pred.cpu().numpy()
+    if isinstance(y_true, th.Tensor):
+        y_true = y_true.cpu().numpy()
     assert y_true.ndim == 1 and y_pred.ndim == 1
     var_y = np.var(y_true)
     return np.nan if var_y == 0 else 1 - np.var(y_true - y_pred) / var_y
@@ -402,6 +407,43 @@ def is_vectorized_observation(observation: Union[int, np.ndarray], observation_s
         raise ValueError(f"Error: Cannot determine if the observation is vectorized with the space type {observation_space}.")
 
 
+def sample_actions(action_space: spaces.Space, n_samples: int) -> np.ndarray:
+    """
+    Vectorized version of ``np.array([action_space.sample() for _ in range(n_samples)])``:
+    the samples are drawn at once from the (seeded) random generator of the action space,
+    following the same distributions as ``action_space.sample()``.
+    Other spaces than Box, Discrete, MultiDiscrete and MultiBinary fall back to the loop.
+
+    :param action_space: the action space
+    :param n_samples: number of actions to sample
+    :return: the actions, of shape ``(n_samples, *action_space.shape)``
+    """
+    rng = action_space.np_random
+    if isinstance(action_space, spaces.Box):
+        high = action_space.high if action_space.dtype.kind == "f" else action_space.high.astype(np.int64) + 1
+        unbounded = ~action_space.bounded_below & ~action_space.bounded_above
+        upp_bounded = ~action_space.bounded_below & action_space.bounded_above
+        low_bounded = action_space.bounded_below & ~action_space.bounded_above
+        bounded = action_space.bounded_below & action_space.bounded_above
+
+        sample = np.empty((n_samples, *action_space.shape))
+        sample[:, unbounded] = rng.normal(size=(n_samples, unbounded.sum()))
+        sample[:, low_bounded] = rng.exponential(size=(n_samples, low_bounded.sum())) + action_space.low[low_bounded]
+        sample[:, upp_bounded] = -rng.exponential(size=(n_samples, upp_bounded.sum())) + high[upp_bounded]
+        sample[:, bounded] = rng.uniform(low=action_space.low[bounded], high=high[bounded], size=(n_samples, bounded.sum()))
+        if action_space.dtype.kind in ["i", "u", "b"]:
+            sample = np.floor(sample)
+        return sample.astype(action_space.dtype)
+    if isinstance(action_space, spaces.Discrete):
+        return action_space.start + rng.integers(action_space.n, size=n_samples)
+    if isinstance(action_space, spaces.MultiDiscrete):
+        nvec = action_space.nvec
+        return (rng.random((n_samples, *nvec.shape)) * nvec).astype(action_space.dtype) + action_space.start
+    if isinstance(action_space, spaces.MultiBinary):
+        return rng.integers(low=0, high=2, size=(n_samples, *action_space.shape), dtype=action_space.dtype)
+    return np.array([action_space.sample() for _ in range(n_samples)])
+
+
 def safe_mean(arr: Union[np.ndarray, list, deque]) -> float:
     """
     Compute the mean of an array if there is at least one element.
@@ -460,15 +502,22 @@ def polyak_update(
     params (in place).
     See https://github.com/DLR-RM/stable-baselines3/issues/93
 
+    The update of all the parameters is fused in a few multi-tensor kernels (``torch._foreach_*``),
+    instead of two kernels per parameter.
+
     :param params: parameters to use to update the target params
     :param target_params: parameters to update
     :param tau: the soft update coefficient ("Polyak update", between 0 and 1)
     """
     with th.no_grad():
         # zip does not raise an exception if length of parameters does not match.
-        for param, target_param in zip_strict(params, target_params):
-            target_param.data.mul_(1 - tau)
-            th.add(target_param.data, param.data, alpha=tau, out=target_param.data)
+        pairs = list(zip_strict(params, target_params))
+        if len(pairs) == 0:
+            return
+        params_data = [param.data for param, _ in pairs]
+        target_params_data = [target_param.data for _, target_param in pairs]
+        th._foreach_mul_(target_params_data, 1 - tau)
+        th._foreach_add_(target_params_data, params_data, alpha=tau)
 
 
 def obs_as_tensor(obs: Union[np.ndarray, Dict[str, np.ndarray]], device: th.device) -> Union[th.Tensor, TensorDict]:
@@ -1,6 +1,7 @@
 from copy import deepcopy
 from typing import Optional, Type, TypeVar
 
+from stable_baselines3.common.vec_env.async_subproc_vec_env import AsyncSubprocVecEnv
 from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper, VecEnv, VecEnvWrapper
 from stable_baselines3.common.vec_env.dummy_vec_env import DummyVecEnv
 from stable_baselines3.common.vec_env.stacked_observations import StackedObservations
@@ -53,6 +54,24 @@ def is_vecenv_wrapped(env: VecEnv, vec_wrapper_class: Type[VecEnvWrapper]) -> bo
     return unwrap_vec_wrapper(env, vec_wrapper_class) is not None
 
 
+def supports_partial_steps(env: VecEnv) -> bool:
+    """
+    Check if asynchronous partial steps (``step_send()`` / ``step_recv()``) can be done with an environment:
+    the underlying ``VecEnv`` must be an ``AsyncSubprocVecEnv``, and all the wrappers
+    around it must implement the partial steps (e.g. ``VecMonitor`` and ``VecNormalize``).
+
+    :param env: The ``VecEnv`` to check
+    :return: True if the environment supports partial steps
+    """
+    env_tmp = env
+    while isinstance(env_tmp, VecEnvWrapper):
+        # Look at the class: the attributes of the instance are forwarded to the wrapped env
+        if not hasattr(type(env_tmp), "step_recv"):
+            return False
+        env_tmp = env_tmp.venv
+    return isinstance(env_tmp, AsyncSubprocVecEnv)
+
+
 def sync_envs_normalization(env: VecEnv, eval_env: VecEnv) -> None:
     """
     Synchronize the normalization statistics of an eval environment and train environment
@@ -91,6 +110,7 @@ __all__ = [
     "DummyVecEnv",
     "StackedObservations",
     "SubprocVecEnv",
+    "AsyncSubprocVecEnv",
     "VecCheckNan",
     "VecExtractDictObs",
     "VecFrameStack",
@@ -101,5 +121,6 @@ __all__ = [
     "unwrap_vec_wrapper",
     "unwrap_vec_normalize",
     "is_vecenv_wrapped",
+    "supports_partial_steps",
     "sync_envs_normalization",
 ]
@@ -0,0 +1,173 @@
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import gymnasium as gym
+import numpy as np
+
+from stable_baselines3.common.vec_env.base_vec_env import VecEnvObs, VecEnvStepReturn
+from stable_baselines3.common.vec_env.subproc_vec_env import SubprocVecEnv, _flatten_obs
+
+
+class AsyncSubprocVecEnv(SubprocVecEnv):
+    """
+    A ``SubprocVecEnv`` where a subset of the environments can be stepped,
+    and whose results are returned as soon as some of the workers are done,
+    instead of waiting for the slowest one (for instance an environment being reset).
+
+    The environments hosted by a same worker (see ``num_workers``) are always stepped together.
+    Use ``step_send()`` and ``step_recv()`` to step asynchronously,
+    the usual ``step()`` is still available when no step is pending.
+    On-policy algorithms detect this class and collect their rollouts asynchronously,
+    each env filling its own part of the rollout buffer.
+    Callbacks are called after each partial step, with full-size ``dones`` / ``infos`` in their ``locals``
+    (the envs that were not stepped are not done and have empty infos).
+
+    :param env_fns: Environments to run in subprocesses
+    :param start_method: method used to start the subprocesses (see ``SubprocVecEnv``)
+    :param shared_memory: Whether to exchange observations, actions, rewards and dones
+        through shared memory (see ``SubprocVecEnv``)
+    :param send_infos: When using shared memory, whether to send the info dicts of every step
+        (see ``SubprocVecEnv``)
+    :param num_workers: Number of subprocesses (see ``SubprocVecEnv``)
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        start_method: Optional[str] = None,
+        shared_memory: bool = False,
+        send_infos: bool = True,
+        num_workers: Optional[int] = None,
+    ):
+        super().__init__(
+            env_fns,
+            start_method=start_method,
+            shared_memory=shared_memory,
+            send_infos=send_infos,
+            num_workers=num_workers,
+        )
+        # Workers that were sent a step command and did not answer yet
+        self.pending_workers: List[int] = []
+        self.reset_infos = list(self.reset_infos)
+
+    @property
+    def num_pending_envs(self) -> int:
+        """Number of environments currently being stepped."""
+        return sum(len(self.worker_env_indices[worker_idx]) for worker_idx in self.pending_workers)
+
+    def step_send(self, actions: np.ndarray, env_indices: np.ndarray) -> None:
+        """
+        Start stepping a subset of the environments.
+
+        :param actions: The actions to take, one for each env in ``env_indices``
+        :param env_indices: Indices of the envs to step, in increasing order.
+            They must cover all the envs of the workers involved.
+        """
+        env_indices = np.asarray(env_indices)
+        worker_indices = sorted({self.env_worker_indices[env_idx] for env_idx in env_indices})
+        expected_indices = [env_idx for worker_idx in worker_indices for env_idx in self.worker_env_indices[worker_idx]]
+        if not np.array_equal(env_indices, expected_indices):
+            raise ValueError(
+                f"The envs {env_indices} must be sorted and include all the envs hosted by their workers: {expected_indices}"
+            )
+        busy_workers = set(worker_indices).intersection(self.pending_workers)
+        assert not busy_workers, f"The workers {busy_workers} are still stepping"
+
+        start = 0
+        for worker_idx in worker_indices:
+            env_range = self.worker_env_indices[worker_idx]
+            worker_actions = actions[start : start + len(env_range)]
+            start += len(env_range)
+            if self.shared_arrays is not None:
+                self.shared_arrays.arrays["actions"][env_range.start : env_range.stop] = worker_actions
+                self.remotes[worker_idx].send(("step_shared", None))
+            else:
+                self.remotes[worker_idx].send(("step", worker_actions))
+            self.pending_workers.append(worker_idx)
+
+    def step_recv(
+        self, min_envs: int = 1, timeout: Optional[float] = None
+    ) -> Tuple[np.ndarray, VecEnvObs, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Wait for some of the pending environments and return their step results.
+
+        :param min_envs: Wait until at least this number of envs are ready
+            (or until all the pending envs are ready if there are fewer)
+        :param timeout: Maximum time to wait for the first results, in seconds (None: no limit)
+        :return: indices of the envs that were stepped (in increasing order),
+            and their observation, reward, done and information
+        """
+        assert len(self.pending_workers) > 0, "No step is pending, call `step_send()` first"
+        min_envs = min(min_envs, self.num_pending_envs)
+        ready_workers: List[int] = []
+        n_ready = 0
+        while n_ready < min_envs:
+            pending_remotes = {self.remotes[worker_idx]: worker_idx for worker_idx in self.pending_workers}
+            ready_remotes = wait(list(pending_remotes.keys()), timeout=timeout)
+            if len(ready_remotes) == 0:
+                break
+            for remote in ready_remotes:
+                worker_idx = pending_remotes[remote]  # type: ignore[index]
+                self.pending_workers.remove(worker_idx)
+                ready_workers.append(worker_idx)
+                n_ready += len(self.worker_env_indices[worker_idx])
+        ready_workers.sort()
+
+        env_indices: List[int] = []
+        all_results: List[Tuple[Any, Any, Any, Dict[str, Any]]] = []
+        for worker_idx in ready_workers:
+            env_range = self.worker_env_indices[worker_idx]
+            worker_results = self.remotes[worker_idx].recv()
+            env_indices.extend(env_range)
+            if self.shared_arrays is not None:
+                infos = self._shared_infos(env_range, worker_results)
+                arrays = self.shared_arrays.arrays
+                for env_idx, info in zip(env_range, infos):
+                    # Copy, the shared arrays are overwritten at the next step
+                    all_results.append(
+                        (arrays["observations"][env_idx].copy(), arrays["rewards"][env_idx], arrays["dones"][env_idx], info)
+                    )
+            else:
+                for env_idx, (obs, reward, done, info, reset_info) in zip(env_range, worker_results):
+                    self.reset_infos[env_idx] = reset_info
+                    all_results.append((obs, reward, done, info))
+
+        if len(all_results) == 0:
+            empty_indices = np.zeros(0, dtype=np.int64)
+            return empty_indices, np.zeros((0, *self.observation_space.shape)), np.zeros(0), np.zeros(0, dtype=bool), []
+        obs, rewards, dones, infos = zip(*all_results)
+        return (
+            np.array(env_indices),
+            _flatten_obs(obs, self.observation_space),
+            np.stack(rewards),
+            np.stack(dones),
+            list(infos),
+        )
+
+    def _wait_pending(self) -> None:
+        """
+        Discard the results of the pending steps.
+        """
+        for worker_idx in self.pending_workers:
+            self.remotes[worker_idx].recv()
+        self.pending_workers = []
+
+    def step_async(self, actions: np.ndarray) -> None:
+        assert len(self.pending_workers) == 0, "Some envs are still stepping, call `step_recv()` first"
+        super().step_async(actions)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        obs, rewards, dones, infos = super().step_wait()
+        self.reset_infos = list(self.reset_infos)
+        return obs, rewards, dones, infos
+
+    def reset(self) -> VecEnvObs:
+        self._wait_pending()
+        obs = super().reset()
+        self.reset_infos = list(self.reset_infos)
+        return obs
+
+    def close(self) -> None:
+        if not self.closed:
+            self._wait_pending()
+        super().close()
@@ -1,6 +1,7 @@
 import multiprocessing as mp
 import warnings
 from collections import OrderedDict
+from multiprocessing.shared_memory import SharedMemory
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import gymnasium as gym
@@ -17,6 +18,76 @@ from stable_baselines3.common.vec_env.base_vec_env import (
 from stable_baselines3.common.vec_env.patch_gym import _patch_env
 
 
+class _SharedArrays:
+    """
+    NumPy arrays backed by shared memory blocks, used by ``SubprocVecEnv``
+    to exchange observations, actions, rewards and dones with its workers
+    without pickling them.
+
+    :param layout: shape and dtype of each array, indexed by name
+    :param names: names of the shared memory blocks to attach to,
+        if None, new blocks are allocated
+    """
+
+    def __init__(
+        self,
+        layout: Dict[str, Tuple[Tuple[int, ...], np.dtype]],
+        names: Optional[Dict[str, str]] = None,
+    ):
+        self.layout = layout
+        self.blocks: Dict[str, SharedMemory] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        for key, (shape, dtype) in layout.items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            if names is None:
+                block = SharedMemory(create=True, size=size)
+            else:
+                block = SharedMemory(name=names[key])
+            self.blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def names(self) -> Dict[str, str]:
+        return {key: block.name for key, block in self.blocks.items()}
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Release the shared memory blocks.
+
+        :param unlink: Whether to also free the underlying memory,
+            must only be done by the process that allocated them.
+        """
+        # The views must be deleted before closing the blocks
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+        self.blocks = {}
+
+
+def _step_env(env: gym.Env, action: Any) -> Tuple[Any, float, bool, Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Step an environment following the SB3 VecEnv API:
+    the environment is reset at the end of an episode.
+
+    :param env: The environment
+    :param action: The action to take
+    :return: observation, reward, done, information
+        and the reset information (None if the environment was not reset)
+    """
+    observation, reward, terminated, truncated, info = env.step(action)
+    # convert to SB3 VecEnv api
+    done = terminated or truncated
+    info["TimeLimit.truncated"] = truncated and not terminated
+    reset_info = None
+    if done:
+        # save final observation where user can get it, then reset
+        info["terminal_observation"] = observation
+        observation, reset_info = env.reset()
+    return observation, reward, done, info, reset_info
+
+
 def _worker(
     remote: mp.connection.Connection,
     parent_remote: mp.connection.Connection,
@@ -26,42 +97,88 @@ def _worker(
     from stable_baselines3.common.env_util import is_wrapped
 
     parent_remote.close()
-    env = _patch_env(env_fn_wrapper.var())
-    reset_info: Optional[Dict[str, Any]] = {}
+    # Each worker hosts a chunk of consecutive environments,
+    # the results are sent as a list with one entry per environment
+    envs = [_patch_env(env_fn()) for env_fn in env_fn_wrapper.var]
+    reset_infos: List[Dict[str, Any]] = [{} for _ in envs]
+    shared_arrays: Optional[_SharedArrays] = None
     while True:
         try:
             cmd, data = remote.recv()
-            if cmd == "step":
-                observation, reward, terminated, truncated, info = env.step(data)
-                # convert to SB3 VecEnv api
-                done = terminated or truncated
-                info["TimeLimit.truncated"] = truncated and not terminated
-                if done:
-                    # save final observation where user can get it, then reset
-                    info["terminal_observation"] = observation
-                    observation, reset_info = env.reset()
-                remote.send((observation, reward, done, info, reset_info))
+            if cmd == "step_shared":
+                # Only the (non-empty) infos go through the pipe,
+                # None is sent when there is no info at all
+                assert shared_arrays is not None
+                results: List[Any] = []
+                has_infos = False
+                for env_idx, env in enumerate(envs, start=first_env_idx):
+                    observation, reward, done, info, reset_info = _step_env(env, actions[env_idx].copy())
+                    observations[env_idx] = observation
+                    rewards[env_idx] = reward
+                    dones[env_idx] = done
+                    if done or (send_infos and len(info) > 1):
+                        results.append((info, reset_info))
+                        has_infos = True
+                    else:
+                        results.append(None)
+                remote.send(results if has_infos else None)
+            elif cmd == "step":
+                results = []
+                for local_idx, (env, action) in enumerate(zip(envs, data)):
+                    observation, reward, done, info, reset_info = _step_env(env, action)
+                    if reset_info is not None:
+                        reset_infos[local_idx] = reset_info
+                    results.append((observation, reward, done, info, reset_infos[local_idx]))
+                remote.send(results)
             elif cmd == "reset":
-                maybe_options = {"options": data[1]} if data[1] else {}
-                observation, reset_info = env.reset(seed=data[0], **maybe_options)
-                remote.send((observation, reset_info))
+                results = []
+                for local_idx, (env, (seed, options)) in enumerate(zip(envs, data)):
+                    maybe_options = {"options": options} if options else {}
+                    observation, reset_infos[local_idx] = env.reset(seed=seed, **maybe_options)
+                    if shared_arrays is not None:
+                        observations[first_env_idx + local_idx] = observation
+                    else:
+                        results.append(observation)
+                if shared_arrays is not None:
+                    remote.send(reset_infos)
+                else:
+                    remote.send(list(zip(results, reset_infos)))
             elif cmd == "render":
-                remote.send(env.render())
+                remote.send([env.render() for env in envs])
             elif cmd == "close":
-                env.close()
+                for env in envs:
+                    env.close()
+                if shared_arrays is not None:
+                    del observations, actions, rewards, dones
+                    shared_arrays.close()
                 remote.close()
                 break
+            elif cmd == "attach_shared_arrays":
+                layout, names, first_env_idx, send_infos = data
+                shared_arrays = _SharedArrays(layout, names)
+                observations = shared_arrays.arrays["observations"]
+                actions = shared_arrays.arrays["actions"]
+                rewards = shared_arrays.arrays["rewards"]
+                dones = shared_arrays.arrays["dones"]
+                remote.send(None)
             elif cmd == "get_spaces":
-                remote.send((env.observation_space, env.action_space))
+                remote.send((envs[0].observation_space, envs[0].action_space))
+            # The following commands only target some of the environments,
+            # ``data`` is a tuple (indices of the environments in the chunk, arguments)
             elif cmd == "env_method":
-                method = getattr(env, data[0])
-                remote.send(method(*data[1], **data[2]))
+                local_indices, (method_name, method_args, method_kwargs) = data
+                remote.send([getattr(envs[i], method_name)(*method_args, **method_kwargs) for i in local_indices])
             elif cmd == "get_attr":
-                remote.send(getattr(env, data))
+                local_indices, attr_name = data
+                remote.send([getattr(envs[i], attr_name) for i in local_indices])
             elif cmd == "set_attr":
-                remote.send(setattr(env, data[0], data[1]))  # type: ignore[func-returns-value]
+                local_indices, (attr_name, value) = data
+                for i in local_indices:
+                    setattr(envs[i], attr_name, value)
+                remote.send([None for _ in local_indices])
             elif cmd == "is_wrapped":
-                remote.send(is_wrapped(env, data))
+                local_indices, wrapper_class = data
+                remote.send([is_wrapped(envs[i], wrapper_class) for i in local_indices])
             else:
                 raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
         except EOFError:
@@ -74,7 +191,8 @@ class SubprocVecEnv(VecEnv):
     process, allowing significant speed up when the environment is computationally complex.
 
     For performance reasons, if your environment is not IO bound, the number of environments should not exceed the
-    number of logical cores on your CPU.
+    number of logical cores on your CPU. When stepping an environment is cheap, several environments
+    can be hosted by each process (see ``num_workers``) to amortize the inter-process communication.
 
     .. warning::
 
@@ -90,12 +208,33 @@ class SubprocVecEnv(VecEnv):
     :param start_method: method used to start the subprocesses.
            Must be one of the methods returned by multiprocessing.get_all_start_methods().
            Defaults to 'forkserver' on available platforms, and 'spawn' otherwise.
+    :param shared_memory: If True, observations, actions, rewards and dones are exchanged
+        through preallocated shared memory arrays, the pipes only carry the commands
+        and the info dicts. Only observation spaces that are not ``Dict`` or ``Tuple`` are supported,
+        observations are cast to the dtype of the observation space.
+    :param send_infos: When using shared memory, whether to send the info dicts of every step.
+        If False, only the infos of the last step of an episode are sent
+        (they contain the terminal observation), the others are replaced by
+        ``{"TimeLimit.truncated": False}``.
+    :param num_workers: Number of subprocesses, the environments are split in chunks
+        of consecutive environments, each one being stepped sequentially by one process.
+        Defaults to one process per environment.
     """
 
-    def __init__(self, env_fns: List[Callable[[], gym.Env]], start_method: Optional[str] = None):
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        start_method: Optional[str] = None,
+        shared_memory: bool = False,
+        send_infos: bool = True,
+        num_workers: Optional[int] = None,
+    ):
         self.waiting = False
         self.closed = False
         n_envs = len(env_fns)
+        if num_workers is None:
+            num_workers = n_envs
+        assert 0 < num_workers <= n_envs, f"`num_workers` must be between 1 and the number of envs ({n_envs})"
 
         if start_method is None:
             # Fork is not a thread safe method (see issue #217)
@@ -105,10 +244,18 @@ class SubprocVecEnv(VecEnv):
             start_method = "forkserver" if forkserver_available else "spawn"
         ctx = mp.get_context(start_method)
 
-        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_envs)])
+        # Consecutive envs hosted by each worker, and the worker of each env
+        self.worker_env_indices = [
+            range(int(chunk[0]), int(chunk[-1]) + 1) for chunk in np.array_split(np.arange(n_envs), num_workers)
+        ]
+        self.env_worker_indices = [
+            worker_idx for worker_idx, env_indices in enumerate(self.worker_env_indices) for _ in env_indices
+        ]
+
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(num_workers)])
         self.processes = []
-        for work_remote, remote, env_fn in zip(self.work_remotes, self.remotes, env_fns):
-            args = (work_remote, remote, CloudpickleWrapper(env_fn))
+        for work_remote, remote, env_indices in zip(self.work_remotes, self.remotes, self.worker_env_indices):
+            args = (work_remote, remote, CloudpickleWrapper([env_fns[i] for i in env_indices]))
             # daemon=True: if the main process crashes, we should not cause things to hang
             process = ctx.Process(target=_worker, args=args, daemon=True)  # type: ignore[attr-defined]
             process.start()
@@ -120,25 +267,92 @@ class SubprocVecEnv(VecEnv):
 
         super().__init__(len(env_fns), observation_space, action_space)
 
+        self.shared_arrays: Optional[_SharedArrays] = None
+        if shared_memory:
+            if isinstance(observation_space, (spaces.Dict, spaces.Tuple)):
+                raise ValueError(f"Shared memory is not supported for {observation_space} observation spaces.")
+            layout = {
+                "observations": ((n_envs, *observation_space.shape), observation_space.dtype),
+                "actions": ((n_envs, *action_space.shape), action_space.dtype),
+                "rewards": ((n_envs,), np.dtype(np.float64)),
+                "dones": ((n_envs,), np.dtype(bool)),
+            }
+            self.shared_arrays = _SharedArrays(layout)
+            for remote, env_indices in zip(self.remotes, self.worker_env_indices):
+                remote.send(("attach_shared_arrays", (layout, self.shared_arrays.names, env_indices.start, send_infos)))
+            for remote in self.remotes:
+                remote.recv()
+
     def step_async(self, actions: np.ndarray) -> None:
-        for remote, action in zip(self.remotes, actions):
-            remote.send(("step", action))
+        if self.shared_arrays is not None:
+            self.shared_arrays.arrays["actions"][:] = actions
+            for remote in self.remotes:
+                remote.send(("step_shared", None))
+        else:
+            for remote, env_indices in zip(self.remotes, self.worker_env_indices):
+                remote.send(("step", actions[env_indices.start : env_indices.stop]))
         self.waiting = True
 
     def step_wait(self) -> VecEnvStepReturn:
-        results = [remote.recv() for remote in self.remotes]
+        if self.shared_arrays is not None:
+            return self._shared_step_wait([remote.recv() for remote in self.remotes])
+        results = [result for remote in self.remotes for result in remote.recv()]
         self.waiting = False
         obs, rews, dones, infos, self.reset_infos = zip(*results)  # type: ignore[assignment]
         return _flatten_obs(obs, self.observation_space), np.stack(rews), np.stack(dones), infos  # type: ignore[return-value]
 
+    def _shared_step_wait(self, results: List[Any]) -> VecEnvStepReturn:
+        """
+        Gather the step results written in shared memory by the workers,
+        together with the infos that were sent through the pipes.
+
+        :param results: What each worker sent (see ``_shared_infos()``)
+        :return: observation, reward, done, information
+        """
+        assert self.shared_arrays is not None
+        self.waiting = False
+        infos: List[Dict[str, Any]] = []
+        for worker_results, env_indices in zip(results, self.worker_env_indices):
+            infos.extend(self._shared_infos(env_indices, worker_results))
+        arrays = self.shared_arrays.arrays
+        # Copy, the shared arrays are overwritten at the next step
+        return arrays["observations"].copy(), arrays["rewards"].copy(), arrays["dones"].copy(), infos
+
+    def _shared_infos(self, env_indices: range, worker_results: Optional[List[Any]]) -> List[Dict[str, Any]]:
+        """
+        Rebuild the infos of the envs hosted by a worker when using shared memory,
+        and update their reset infos.
+
+        :param env_indices: The envs hosted by the worker
+        :param worker_results: What the worker sent: None if there is no info to report,
+            otherwise a list with, for each env, None or the info dict
+            and the reset info (None if the env was not reset)
+        :return: The info dict of each env
+        """
+        if worker_results is None:
+            return [{"TimeLimit.truncated": False} for _ in env_indices]
+        infos = []
+        for env_idx, result in zip(env_indices, worker_results):
+            if result is None:
+                infos.append({"TimeLimit.truncated": False})
+                continue
+            info, reset_info = result
+            if reset_info is not None:
+                self.reset_infos[env_idx] = reset_info
+            infos.append(info)
+        return infos
+
     def reset(self) -> VecEnvObs:
-        for env_idx, remote in enumerate(self.remotes):
-            remote.send(("reset", (self._seeds[env_idx], self._options[env_idx])))
-        results = [remote.recv() for remote in self.remotes]
-        obs, self.reset_infos = zip(*results)  # type: ignore[assignment]
+        for remote, env_indices in zip(self.remotes, self.worker_env_indices):
+            remote.send(("reset", [(self._seeds[env_idx], self._options[env_idx]) for env_idx in env_indices]))
+        results = [result for remote in self.remotes for result in remote.recv()]
         # Seeds and options are only used once
         self._reset_seeds()
         self._reset_options()
+        if self.shared_arrays is not None:
+            self.reset_infos = results
+            return self.shared_arrays.arrays["observations"].copy()
+        obs, self.reset_infos = zip(*results)  # type: ignore[assignment]
         return _flatten_obs(obs, self.observation_space)
 
     def close(self) -> None:
@@ -151,6 +365,8 @@ class SubprocVecEnv(VecEnv):
             remote.send(("close", None))
         for process in self.processes:
             process.join()
+        if self.shared_arrays is not None:
+            self.shared_arrays.close(unlink=True)
         self.closed = True
 
     def get_images(self) -> Sequence[Optional[np.ndarray]]:
@@ -158,52 +374,51 @@ class SubprocVecEnv(VecEnv):
             warnings.warn(
                 f"The render mode is {self.render_mode}, but this method assumes it is `rgb_array` to obtain images."
             )
-            return [None for _ in self.remotes]
+            return [None for _ in range(self.num_envs)]
         for pipe in self.remotes:
             # gather render return from subprocesses
             pipe.send(("render", None))
-        outputs = [pipe.recv() for pipe in self.remotes]
+        outputs = [image for pipe in self.remotes for image in pipe.recv()]
         return outputs
 
     def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
         """Return attribute from vectorized environment (see base class)."""
-        target_remotes = self._get_target_remotes(indices)
-        for remote in target_remotes:
-            remote.send(("get_attr", attr_name))
-        return [remote.recv() for remote in target_remotes]
+        return self._call_workers("get_attr", attr_name, indices)
 
     def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
         """Set attribute inside vectorized environments (see base class)."""
-        target_remotes = self._get_target_remotes(indices)
-        for remote in target_remotes:
-            remote.send(("set_attr", (attr_name, value)))
-        for remote in target_remotes:
-            remote.recv()
+        self._call_workers("set_attr", (attr_name, value), indices)
 
     def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
         """Call instance methods of vectorized environments."""
-        target_remotes = self._get_target_remotes(indices)
-        for remote in target_remotes:
-            remote.send(("env_method", (method_name, method_args, method_kwargs)))
-        return [remote.recv() for remote in target_remotes]
+        return self._call_workers("env_method", (method_name, method_args, method_kwargs), indices)
 
     def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> List[bool]:
         """Check if worker environments are wrapped with a given wrapper"""
-        target_remotes = self._get_target_remotes(indices)
-        for remote in target_remotes:
-            remote.send(("is_wrapped", wrapper_class))
-        return [remote.recv() for remote in target_remotes]
+        return self._call_workers("is_wrapped", wrapper_class, indices)
 
-    def _get_target_remotes(self, indices: VecEnvIndices) -> List[Any]:
+    def _call_workers(self, cmd: str, data: Any, indices: VecEnvIndices) -> List[Any]:
         """
-        Get the connection object needed to communicate with the wanted
-        envs that are in subprocesses.
+        Send a command to the workers hosting the wanted envs,
+        each worker receives the indices of the targeted envs within its chunk.
 
+        :param cmd: The command to send
+        :param data: The arguments of the command
         :param indices: refers to indices of envs.
-        :return: Connection object to communicate between processes.
+        :return: The result of the command, for each env in ``indices``.
         """
-        indices = self._get_indices(indices)
-        return [self.remotes[i] for i in indices]
+        # Negative indices are allowed, as when indexing a list
+        indices = [env_idx % self.num_envs for env_idx in self._get_indices(indices)]
+        target_envs: Dict[int, List[int]] = {}
+        for env_idx in indices:
+            target_envs.setdefault(self.env_worker_indices[env_idx], []).append(env_idx)
+        for worker_idx, env_indices in target_envs.items():
+            first_env_idx = self.worker_env_indices[worker_idx].start
+            self.remotes[worker_idx].send((cmd, ([env_idx - first_env_idx for env_idx in env_indices], data)))
+        results: Dict[int, Any] = {}
+        for worker_idx, env_indices in target_envs.items():
+            results.update(zip(env_indices, self.remotes[worker_idx].recv()))
+        return [results[env_idx] for env_idx in indices]
 
 
 def _flatten_obs(obs: Union[List[VecEnvObs], Tuple[VecEnvObs]], space: spaces.Space) -> VecEnvObs:
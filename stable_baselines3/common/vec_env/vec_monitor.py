@@ -1,6 +1,6 @@
 import time
 import warnings
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -18,9 +18,22 @@ class VecMonitor(VecEnvWrapper):
     wrapper. So this class simply does the job of the ``Monitor`` wrapper on
     a vectorized level.
 
+    It supports the partial steps of an ``AsyncSubprocVecEnv`` (``step_send()`` / ``step_recv()``),
+    so asynchronous rollouts can be collected through it.
+
+    Episode returns and lengths are accumulated for all the sub-environments at once
+    in NumPy arrays, and only the info dicts of the environments that are done
+    at a given step are copied, which makes it cheaper per step than wrapping
+    every sub-environment with a ``Monitor``.
+
     :param venv: The vectorized environment
     :param filename: the location to save a log file, can be None for no log
-    :param info_keywords: extra information to log, from the information return of env.step()
+    :param info_keywords: extra information to log, from the information return of env.step().
+        They are only read from the info dict of the last step of each episode,
+        so envs may report them at the end of the episodes only.
+    :param flush_every: flush the log file after this many episodes (see ``ResultsWriter``)
+    :param flush_interval: flush the log file when at least this many seconds
+        have elapsed since the last flush (see ``ResultsWriter``)
     """
 
     def __init__(
@@ -28,6 +41,8 @@ class VecMonitor(VecEnvWrapper):
         venv: VecEnv,
         filename: Optional[str] = None,
         info_keywords: Tuple[str, ...] = (),
+        flush_every: int = 1,
+        flush_interval: Optional[float] = None,
     ):
         # Avoid circular import
         from stable_baselines3.common.monitor import Monitor, ResultsWriter
@@ -59,7 +74,11 @@ class VecMonitor(VecEnvWrapper):
         self.results_writer: Optional[ResultsWriter] = None
         if filename:
             self.results_writer = ResultsWriter(
-                filename, header={"t_start": self.t_start, "env_id": str(env_id)}, extra_keys=info_keywords
+                filename,
+                header={"t_start": self.t_start, "env_id": str(env_id)},
+                extra_keys=info_keywords,
+                flush_every=flush_every,
+                flush_interval=flush_interval,
             )
 
         self.info_keywords = info_keywords
@@ -68,31 +87,75 @@ class VecMonitor(VecEnvWrapper):
 
     def reset(self) -> VecEnvObs:
         obs = self.venv.reset()
+        self.reset_infos = self.venv.reset_infos
         self.episode_returns = np.zeros(self.num_envs, dtype=np.float32)
         self.episode_lengths = np.zeros(self.num_envs, dtype=np.int32)
         return obs
 
     def step_wait(self) -> VecEnvStepReturn:
         obs, rewards, dones, infos = self.venv.step_wait()
-        self.episode_returns += rewards
-        self.episode_lengths += 1
-        new_infos = list(infos[:])
-        for i in range(len(dones)):
-            if dones[i]:
-                info = infos[i].copy()
-                episode_return = self.episode_returns[i]
-                episode_length = self.episode_lengths[i]
-                episode_info = {"r": episode_return, "l": episode_length, "t": round(time.time() - self.t_start, 6)}
-                for key in self.info_keywords:
-                    episode_info[key] = info[key]
-                info["episode"] = episode_info
-                self.episode_count += 1
-                self.episode_returns[i] = 0
-                self.episode_lengths[i] = 0
-                if self.results_writer:
-                    self.results_writer.write_row(episode_info)
-                new_infos[i] = info
-        return obs, rewards, dones, new_infos
+        # Forward the reset infos of the wrapped env, they are used by callbacks
+        self.reset_infos = self.venv.reset_infos
+        return obs, rewards, dones, self._record_step(np.arange(self.num_envs), rewards, dones, infos)
+
+    def step_send(self, actions: np.ndarray, env_indices: np.ndarray) -> None:
+        """
+        Start stepping a subset of the environments (see ``AsyncSubprocVecEnv.step_send()``).
+
+        :param actions: The actions to take, one for each env in ``env_indices``
+        :param env_indices: Indices of the envs to step
+        """
+        self.venv.step_send(actions, env_indices)
+
+    def step_recv(
+        self, min_envs: int = 1, timeout: Optional[float] = None
+    ) -> Tuple[np.ndarray, VecEnvObs, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Wait for some of the pending environments (see ``AsyncSubprocVecEnv.step_recv()``)
+        and record the episodes they finished.
+
+        :param min_envs: Wait until at least this number of envs are ready
+        :param timeout: Maximum time to wait for the first results, in seconds (None: no limit)
+        :return: indices of the envs that were stepped, and their observation, reward, done and information
+        """
+        env_indices, obs, rewards, dones, infos = self.venv.step_recv(min_envs, timeout)
+        self.reset_infos = self.venv.reset_infos
+        return env_indices, obs, rewards, dones, self._record_step(env_indices, rewards, dones, infos)
+
+    def _record_step(
+        self, env_indices: np.ndarray, rewards: np.ndarray, dones: np.ndarray, infos: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Accumulate the rewards of the stepped envs and record the episodes that are finished.
+
+        :param env_indices: Indices of the envs that were stepped
+        :param rewards: Their rewards
+        :param dones: Their done flags
+        :param infos: Their information
+        :return: The infos, with the ``episode`` entry added for the finished episodes
+        """
+        self.episode_returns[env_indices] += rewards
+        self.episode_lengths[env_indices] += 1
+        done_indices = np.flatnonzero(dones)
+        if len(done_indices) == 0:
+            return infos
+
+        new_infos = list(infos)
+        episode_time = round(time.time() - self.t_start, 6)
+        for i in done_indices:
+            env_idx = env_indices[i]
+            info = infos[i].copy()
+            episode_info = {"r": self.episode_returns[env_idx], "l": self.episode_lengths[env_idx], "t": episode_time}
+            for key in self.info_keywords:
+                episode_info[key] = info[key]
+            info["episode"] = episode_info
+            if self.results_writer:
+                self.results_writer.write_row(episode_info)
+            new_infos[i] = info
+        self.episode_count += len(done_indices)
+        self.episode_returns[env_indices[done_indices]] = 0
+        self.episode_lengths[env_indices[done_indices]] = 0
+        return new_infos
 
     def close(self) -> None:
         if self.results_writer:
@@ -1,7 +1,7 @@
 import inspect
 import pickle
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from gymnasium import spaces
@@ -9,7 +9,7 @@ from gymnasium import spaces
 from stable_baselines3.common import utils
 from stable_baselines3.common.preprocessing import is_image_space
 from stable_baselines3.common.running_mean_std import RunningMeanStd
-from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvStepReturn, VecEnvWrapper
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvObs, VecEnvStepReturn, VecEnvWrapper
 
 
 class VecNormalize(VecEnvWrapper):
@@ -27,6 +27,14 @@ class VecNormalize(VecEnvWrapper):
     :param epsilon: To avoid division by zero
     :param norm_obs_keys: Which keys from observation dict to normalize.
         If not specified, all keys will be normalized.
+    :param inplace: If True, the observations returned by ``step()`` and ``reset()``
+        are normalized into preallocated buffers instead of new arrays.
+        Two buffers are used alternately, so the returned observations are only valid
+        until the second next call: copy them if they must be kept longer.
+    :param stats_update_interval: When not 1 or when using ``inplace``, the batches are accumulated
+        with a single pass over the data at every step, and the running statistics are only
+        updated every ``stats_update_interval`` steps (``reset()`` counting as a step).
+        The observations and rewards of a step are normalized after this update.
     """
 
     obs_spaces: Dict[str, spaces.Space]
@@ -43,8 +51,11 @@ class VecNormalize(VecEnvWrapper):
         gamma: float = 0.99,
         epsilon: float = 1e-8,
         norm_obs_keys: Optional[List[str]] = None,
+        inplace: bool = False,
+        stats_update_interval: int = 1,
     ):
         VecEnvWrapper.__init__(self, venv)
+        assert stats_update_interval > 0, "`stats_update_interval` must be positive"
 
         self.norm_obs = norm_obs
         self.norm_obs_keys = norm_obs_keys
@@ -96,6 +107,20 @@ class VecNormalize(VecEnvWrapper):
         self.norm_obs = norm_obs
         self.norm_reward = norm_reward
         self.old_reward = np.array([])
+        self.inplace = inplace
+        self.stats_update_interval = stats_update_interval
+        self._reset_inplace_state()
+
+    def _reset_inplace_state(self) -> None:
+        """
+        Reset the attributes derived from the statistics and from the number of envs.
+        """
+        # Steps since the last update of the statistics
+        self._n_pending_updates = 0
+        # Alternate output buffers and cached (mean, var, version, scale), for each normalized key
+        self._obs_buffers: Dict[Optional[str], List[np.ndarray]] = {}
+        self._buffer_idx = 0
+        self._obs_scales: Dict[Optional[str], Tuple[np.ndarray, np.ndarray, int, np.ndarray]] = {}
 
     def _sanity_checks(self) -> None:
         """
@@ -136,6 +161,8 @@ class VecNormalize(VecEnvWrapper):
         del state["class_attributes"]
         # these attributes depend on the above and so we would prefer not to pickle
         del state["returns"]
+        del state["_obs_buffers"]
+        del state["_obs_scales"]
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
@@ -148,7 +175,10 @@ class VecNormalize(VecEnvWrapper):
         # Backward compatibility
         if "norm_obs_keys" not in state and isinstance(state["observation_space"], spaces.Dict):
             state["norm_obs_keys"] = list(state["observation_space"].spaces.keys())
+        state.setdefault("inplace", False)
+        state.setdefault("stats_update_interval", 1)
         self.__dict__.update(state)
+        self._reset_inplace_state()
         assert "venv" not in state
         self.venv = None  # type: ignore[assignment]
 
@@ -184,32 +214,170 @@ class VecNormalize(VecEnvWrapper):
         self.old_reward = rewards
 
         if self.training and self.norm_obs:
-            if isinstance(obs, dict) and isinstance(self.obs_rms, dict):
-                for key in self.obs_rms.keys():
-                    self.obs_rms[key].update(obs[key])
-            else:
-                self.obs_rms.update(obs)
-
-        obs = self.normalize_obs(obs)
-
+            self._update_obs_stats(obs)
         if self.training:
             self._update_reward(rewards)
+            self._count_stats_update()
+
+        if self.inplace:
+            obs = self._normalize_obs_inplace(obs)
+        else:
+            obs = self.normalize_obs(obs)
         rewards = self.normalize_reward(rewards)
 
         # Normalize the terminal observations
-        for idx, done in enumerate(dones):
-            if not done:
-                continue
+        for idx in np.flatnonzero(dones):
             if "terminal_observation" in infos[idx]:
                 infos[idx]["terminal_observation"] = self.normalize_obs(infos[idx]["terminal_observation"])
 
         self.returns[dones] = 0
         return obs, rewards, dones, infos
 
+    def step_send(self, actions: np.ndarray, env_indices: np.ndarray) -> None:
+        """
+        Start stepping a subset of the environments (see ``AsyncSubprocVecEnv.step_send()``).
+
+        :param actions: The actions to take, one for each env in ``env_indices``
+        :param env_indices: Indices of the envs to step
+        """
+        self.venv.step_send(actions, env_indices)
+
+    def step_recv(
+        self, min_envs: int = 1, timeout: Optional[float] = None
+    ) -> Tuple[np.ndarray, VecEnvObs, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Wait for some of the pending environments (see ``AsyncSubprocVecEnv.step_recv()``)
+        and normalize their results. The statistics are updated with the envs that were stepped only,
+        and ``get_original_obs()`` / ``get_original_reward()`` return the results of these envs.
+        Each call counts as one step for ``stats_update_interval``.
+
+        :param min_envs: Wait until at least this number of envs are ready
+        :param timeout: Maximum time to wait for the first results, in seconds (None: no limit)
+        :return: indices of the envs that were stepped, and their normalized observation and reward, done and information
+        """
+        env_indices, obs, rewards, dones, infos = self.venv.step_recv(min_envs, timeout)
+        if len(env_indices) == 0:
+            return env_indices, obs, rewards, dones, infos
+        assert isinstance(obs, (np.ndarray, dict))  # for mypy
+        self.old_obs = obs
+        self.old_reward = rewards
+
+        if self.training and self.norm_obs:
+            self._update_obs_stats(obs)
+        if self.training:
+            self.returns[env_indices] = self.returns[env_indices] * self.gamma + rewards
+            if self._uses_accumulation:
+                self.ret_rms.accumulate(self.returns[env_indices])
+            else:
+                self.ret_rms.update(self.returns[env_indices])
+            self._count_stats_update()
+
+        # The preallocated buffers of the in-place normalization hold all the envs
+        obs = self.normalize_obs(obs)
+        rewards = self.normalize_reward(rewards)
+
+        # Normalize the terminal observations
+        for idx in np.flatnonzero(dones):
+            if "terminal_observation" in infos[idx]:
+                infos[idx]["terminal_observation"] = self.normalize_obs(infos[idx]["terminal_observation"])
+
+        self.returns[env_indices[dones]] = 0
+        return env_indices, obs, rewards, dones, infos
+
+    @property
+    def _uses_accumulation(self) -> bool:
+        """Whether the statistics are updated from accumulated batches (see ``RunningMeanStd.accumulate()``)."""
+        return self.inplace or self.stats_update_interval > 1
+
+    def _update_obs_stats(self, obs: Union[np.ndarray, Dict[str, np.ndarray]]) -> None:
+        """Update (or accumulate) observation normalization statistics."""
+        if isinstance(obs, dict) and isinstance(self.obs_rms, dict):
+            for key in self.obs_rms.keys():
+                if self._uses_accumulation:
+                    self.obs_rms[key].accumulate(obs[key])
+                else:
+                    self.obs_rms[key].update(obs[key])
+        else:
+            assert isinstance(self.obs_rms, RunningMeanStd)
+            if self._uses_accumulation:
+                self.obs_rms.accumulate(obs)
+            else:
+                self.obs_rms.update(obs)
+
+    def _flush_stats(self) -> None:
+        """Update the statistics with the accumulated batches."""
+        if self.norm_obs:
+            obs_rms_list = list(self.obs_rms.values()) if isinstance(self.obs_rms, dict) else [self.obs_rms]
+            for obs_rms in obs_rms_list:
+                obs_rms.flush()
+        self.ret_rms.flush()
+        self._n_pending_updates = 0
+
+    def _count_stats_update(self) -> None:
+        """
+        Count one step for ``stats_update_interval``, and flush the accumulated batches when it is reached,
+        so the statistics used to normalize the current step include it (as with the default path).
+        """
+        if not self._uses_accumulation:
+            return
+        self._n_pending_updates += 1
+        if self._n_pending_updates >= self.stats_update_interval:
+            self._flush_stats()
+
     def _update_reward(self, reward: np.ndarray) -> None:
         """Update reward normalization statistics."""
         self.returns = self.returns * self.gamma + reward
-        self.ret_rms.update(self.returns)
+        if self._uses_accumulation:
+            self.ret_rms.accumulate(self.returns)
+        else:
+            self.ret_rms.update(self.returns)
+
+    def _normalize_obs_inplace(
+        self, obs: Union[np.ndarray, Dict[str, np.ndarray]]
+    ) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Normalize the observations of all the envs into preallocated buffers (see ``inplace``).
+        """
+        if not self.norm_obs:
+            return obs
+        self._buffer_idx = 1 - self._buffer_idx
+        if isinstance(obs, dict) and isinstance(self.obs_rms, dict):
+            assert self.norm_obs_keys is not None
+            obs_ = obs.copy()
+            for key in self.norm_obs_keys:
+                obs_[key] = self._normalize_obs_into(obs[key], self.obs_rms[key], key)
+            return obs_
+        assert isinstance(self.obs_rms, RunningMeanStd)
+        return self._normalize_obs_into(obs, self.obs_rms, None)
+
+    def _normalize_obs_into(self, obs: np.ndarray, obs_rms: RunningMeanStd, key: Optional[str]) -> np.ndarray:
+        """
+        Helper to normalize observation into the current output buffer.
+        The scale is only recomputed when the statistics changed, either through the ``RunningMeanStd``
+        methods or by assigning new ``mean``/``var`` arrays.
+
+        :param obs:
+        :param obs_rms: associated statistics
+        :param key: key of the observation (None if not a dict observation)
+        :return: normalized observation (view of the output buffer)
+        """
+        buffers = self._obs_buffers.get(key)
+        if buffers is None or buffers[0].shape != obs.shape:
+            buffers = self._obs_buffers[key] = [np.empty(obs.shape, dtype=np.float32) for _ in range(2)]
+        cached = self._obs_scales.get(key)
+        if (
+            cached is None
+            or cached[0] is not obs_rms.mean
+            or cached[1] is not obs_rms.var
+            or cached[2] != obs_rms.version
+        ):
+            scale = 1.0 / np.sqrt(obs_rms.var + self.epsilon)
+            cached = self._obs_scales[key] = (obs_rms.mean, obs_rms.var, obs_rms.version, scale)
+        out = buffers[self._buffer_idx]
+        np.subtract(obs, obs_rms.mean, out=out, casting="unsafe")
+        np.multiply(out, cached[3], out=out, casting="unsafe")
+        np.clip(out, -self.clip_obs, self.clip_obs, out=out)
+        return out
 
     def _normalize_obs(self, obs: np.ndarray, obs_rms: RunningMeanStd) -> np.ndarray:
         """
@@ -234,17 +402,18 @@ class VecNormalize(VecEnvWrapper):
         Normalize observations using this VecNormalize's observations statistics.
         Calling this method does not update statistics.
         """
+        if self.norm_obs and not isinstance(obs, dict):
+            assert isinstance(self.obs_rms, RunningMeanStd)
+            # A new array is created, no need to copy the original object
+            return self._normalize_obs(obs, self.obs_rms).astype(np.float32)
         # Avoid modifying by reference the original object
         obs_ = deepcopy(obs)
         if self.norm_obs:
-            if isinstance(obs, dict) and isinstance(self.obs_rms, dict):
-                assert self.norm_obs_keys is not None
-                # Only normalize the specified keys
-                for key in self.norm_obs_keys:
-                    obs_[key] = self._normalize_obs(obs[key], self.obs_rms[key]).astype(np.float32)
-            else:
-                assert isinstance(self.obs_rms, RunningMeanStd)
-                obs_ = self._normalize_obs(obs, self.obs_rms).astype(np.float32)
+            assert isinstance(obs, dict) and isinstance(self.obs_rms, dict)
+            assert self.norm_obs_keys is not None
+            # Only normalize the specified keys
+            for key in self.norm_obs_keys:
+                obs_[key] = self._normalize_obs(obs[key], self.obs_rms[key]).astype(np.float32)
         return obs_
 
     def normalize_reward(self, reward: np.ndarray) -> np.ndarray:
@@ -297,12 +466,11 @@ class VecNormalize(VecEnvWrapper):
         self.old_obs = obs
         self.returns = np.zeros(self.num_envs)
         if self.training and self.norm_obs:
-            if isinstance(obs, dict) and isinstance(self.obs_rms, dict):
-                for key in self.obs_rms.keys():
-                    self.obs_rms[key].update(obs[key])
-            else:
-                assert isinstance(self.obs_rms, RunningMeanStd)
-                self.obs_rms.update(obs)
+            self._update_obs_stats(obs)
+        if self.training:
+            self._count_stats_update()
+        if self.inplace:
+            return self._normalize_obs_inplace(obs)
         return self.normalize_obs(obs)
 
     @staticmethod
@@ -9,8 +9,8 @@ from torch.nn import functional as F
 from stable_baselines3.common.buffers import ReplayBuffer
 from stable_baselines3.common.off_policy_algorithm import OffPolicyAlgorithm
 from stable_baselines3.common.policies import BasePolicy
-from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, Schedule
-from stable_baselines3.common.utils import get_linear_fn, get_parameters_by_name, polyak_update
+from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, PrioritizedReplayBufferSamples, Schedule
+from stable_baselines3.common.utils import get_linear_fn, get_parameters_by_name, polyak_update, sample_actions
 from stable_baselines3.dqn.policies import CnnPolicy, DQNPolicy, MlpPolicy, MultiInputPolicy, QNetwork
 
 SelfDQN = TypeVar("SelfDQN", bound="DQN")
@@ -45,7 +45,8 @@ class DQN(OffPolicyAlgorithm):
         at a cost of more complexity.
         See https://github.com/DLR-RM/stable-baselines3/issues/37#issuecomment-637501195
     :param target_update_interval: update the target network every ``target_update_interval``
-        environment steps.
+        environment steps. With ``learn_decoupled()``, the learner updates it every
+        ``target_update_interval`` environment steps converted into gradient steps.
     :param exploration_fraction: fraction of entire training period over which the exploration rate is reduced
     :param exploration_initial_eps: initial value of random action probability
     :param exploration_final_eps: final value of random action probability
@@ -173,24 +174,34 @@ class DQN(OffPolicyAlgorithm):
         self._n_calls += 1
         # Account for multiple environments
         # each call to step() corresponds to n_envs transitions
-        if self._n_calls % max(self.target_update_interval // self.n_envs, 1) == 0:
-            polyak_update(self.q_net.parameters(), self.q_net_target.parameters(), self.tau)
-            # Copy running stats, see GH issue #996
-            polyak_update(self.batch_norm_stats, self.batch_norm_stats_target, 1.0)
+        # When decoupling the actor and the learner, the target network is updated in ``train()``
+        decoupled = self._gradient_steps_per_env_step is not None
+        if not decoupled and self._n_calls % max(self.target_update_interval // self.n_envs, 1) == 0:
+            self._update_target()
 
         self.exploration_rate = self.exploration_schedule(self._current_progress_remaining)
         self.logger.record("rollout/exploration_rate", self.exploration_rate)
 
+    def _update_target(self) -> None:
+        polyak_update(self.q_net.parameters(), self.q_net_target.parameters(), self.tau)
+        # Copy running stats, see GH issue #996
+        polyak_update(self.batch_norm_stats, self.batch_norm_stats_target, 1.0)
+
     def train(self, gradient_steps: int, batch_size: int = 100) -> None:
         # Switch to train mode (this affects batch norm / dropout)
         self.policy.set_training_mode(True)
         # Update learning rate according to schedule
         self._update_learning_rate(self.policy.optimizer)
 
+        target_update_interval = None
+        if self._gradient_steps_per_env_step is not None:
+            # Decoupled actor and learner: count the target update interval in gradient steps
+            target_update_interval = max(int(self.target_update_interval * self._gradient_steps_per_env_step), 1)
+
         losses = []
-        for _ in range(gradient_steps):
+        for gradient_step in range(gradient_steps):
             # Sample replay buffer
-            replay_data = self.replay_buffer.sample(batch_size, env=self._vec_normalize_env)  # type: ignore[union-attr]
+            replay_data = self._sample_replay_buffer(batch_size)
 
             with th.no_grad():
                 # Compute the next Q-values using the target network
@@ -199,8 +210,9 @@ class DQN(OffPolicyAlgorithm):
                 next_q_values, _ = next_q_values.max(dim=1)
                 # Avoid potential broadcast issue
                 next_q_values = next_q_values.reshape(-1, 1)
-                # 1-step TD target
-                target_q_values = replay_data.rewards + (1 - replay_data.dones) * self.gamma * next_q_values
+                # TD target (1-step, or n-step with a discount per sample)
+                discounts = replay_data.discounts if replay_data.discounts is not None else self.gamma
+                target_q_values = replay_data.rewards + (1 - replay_data.dones) * discounts * next_q_values
 
             # Get current Q-values estimates
             current_q_values = self.q_net(replay_data.observations)
@@ -209,7 +221,12 @@ class DQN(OffPolicyAlgorithm):
             current_q_values = th.gather(current_q_values, dim=1, index=replay_data.actions.long())
 
             # Compute Huber loss (less sensitive to outliers)
-            loss = F.smooth_l1_loss(current_q_values, target_q_values)
+            if isinstance(replay_data, PrioritizedReplayBufferSamples):
+                # Correct the bias of prioritized sampling with importance sampling weights
+                loss = (replay_data.weights * F.smooth_l1_loss(current_q_values, target_q_values, reduction="none")).mean()
+                self._update_priorities(replay_data, current_q_values.detach() - target_q_values)
+            else:
+                loss = F.smooth_l1_loss(current_q_values, target_q_values)
             losses.append(loss.item())
 
             # Optimize the policy
@@ -219,6 +236,9 @@ class DQN(OffPolicyAlgorithm):
             th.nn.utils.clip_grad_norm_(self.policy.parameters(), self.max_grad_norm)
             self.policy.optimizer.step()
 
+            if target_update_interval is not None and (self._n_updates + gradient_step + 1) % target_update_interval == 0:
+                self._update_target()
+
         # Increase update counter
         self._n_updates += gradient_steps
 
@@ -248,13 +268,19 @@ class DQN(OffPolicyAlgorithm):
                     n_batch = observation[next(iter(observation.keys()))].shape[0]
                 else:
                     n_batch = observation.shape[0]
-                action = np.array([self.action_space.sample() for _ in range(n_batch)])
+                action = sample_actions(self.action_space, n_batch)
             else:
                 action = np.array(self.action_space.sample())
         else:
-            action, state = self.policy.predict(observation, state, episode_start, deterministic)
+            action, state = super().predict(observation, state, episode_start, deterministic)
         return action, state
 
+    def _collection_predict(self, observation: Union[np.ndarray, Dict[str, np.ndarray]]) -> np.ndarray:
+        # Epsilon-greedy exploration, see ``predict()``
+        if np.random.rand() < self.exploration_rate:
+            return sample_actions(self.action_space, self.n_envs)
+        return super()._collection_predict(observation)
+
     def learn(
         self: SelfDQN,
         total_timesteps: int,
@@ -1,6 +1,6 @@
 import copy
 import warnings
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import numpy as np
 import torch as th
@@ -43,6 +43,11 @@ class HerReplayBuffer(DictReplayBuffer):
         ``compute_reward()`` method.
         Please note that the copy may cause a slowdown.
         False by default.
+    :param compute_reward: Vectorized reward function ``compute_reward(achieved_goals, desired_goals, infos)``
+        called in the current process to compute the rewards of the virtual transitions,
+        instead of calling the ``compute_reward()`` method of the first env through the VecEnv
+        (an inter-process round trip with ``SubprocVecEnv``).
+        It must be picklable (e.g. a module-level function) to save the replay buffer.
     """
 
     env: Optional[VecEnv]
@@ -60,6 +65,7 @@ class HerReplayBuffer(DictReplayBuffer):
         n_sampled_goal: int = 4,
         goal_selection_strategy: Union[GoalSelectionStrategy, str] = "future",
         copy_info_dict: bool = False,
+        compute_reward: Optional[Callable[[np.ndarray, np.ndarray, Any], np.ndarray]] = None,
     ):
         super().__init__(
             buffer_size,
@@ -72,6 +78,7 @@ class HerReplayBuffer(DictReplayBuffer):
         )
         self.env = env
         self.copy_info_dict = copy_info_dict
+        self.compute_reward = compute_reward
 
         # convert goal_selection_strategy into GoalSelectionStrategy if string
         if isinstance(goal_selection_strategy, str):
@@ -97,6 +104,59 @@ class HerReplayBuffer(DictReplayBuffer):
         self.ep_start = np.zeros((self.buffer_size, self.n_envs), dtype=np.int64)
         self.ep_length = np.zeros((self.buffer_size, self.n_envs), dtype=np.int64)
         self._current_ep_start = np.zeros(self.n_envs, dtype=np.int64)
+        self._reset_valid_indices()
+
+    def _reset_valid_indices(self) -> None:
+        """
+        Build the set of the transitions that can be sampled (those of complete episodes, ``ep_length > 0``).
+        It is stored as a dense array of flat indices (``batch_idx * n_envs + env_idx``),
+        with the position of each transition in it, so it is updated incrementally
+        when episodes end or are overwritten, and sampled without scanning the whole buffer.
+        """
+        capacity = self.buffer_size * self.n_envs
+        valid_indices = np.flatnonzero(self.ep_length > 0)
+        self._n_valid = len(valid_indices)
+        self._valid_indices = np.zeros(capacity, dtype=np.int64)
+        self._valid_indices[: self._n_valid] = valid_indices
+        # Position in ``_valid_indices``, -1 for transitions that cannot be sampled
+        self._valid_positions = np.full(capacity, -1, dtype=np.int64)
+        self._valid_positions[valid_indices] = np.arange(self._n_valid)
+
+    def _add_valid(self, flat_indices: np.ndarray) -> None:
+        """
+        Allow transitions to be sampled.
+
+        :param flat_indices: Flat indices of the transitions
+        """
+        flat_indices = np.unique(flat_indices)
+        flat_indices = flat_indices[self._valid_positions[flat_indices] < 0]
+        positions = self._n_valid + np.arange(len(flat_indices))
+        self._valid_indices[positions] = flat_indices
+        self._valid_positions[flat_indices] = positions
+        self._n_valid += len(flat_indices)
+
+    def _remove_valid(self, flat_indices: np.ndarray) -> None:
+        """
+        Prevent transitions from being sampled.
+        The last valid transitions are moved to the freed positions to keep the array dense.
+
+        :param flat_indices: Flat indices of the transitions
+        """
+        flat_indices = np.unique(flat_indices)
+        removed_positions = self._valid_positions[flat_indices]
+        removed_positions = removed_positions[removed_positions >= 0]
+        new_n_valid = self._n_valid - len(removed_positions)
+        # Holes left before the new end, filled with the valid transitions after it
+        holes = removed_positions[removed_positions < new_n_valid]
+        tail = np.arange(new_n_valid, self._n_valid)
+        is_removed = np.zeros(len(tail), dtype=bool)
+        is_removed[removed_positions[removed_positions >= new_n_valid] - new_n_valid] = True
+        movers = self._valid_indices[tail[~is_removed]]
+
+        self._valid_positions[self._valid_indices[removed_positions]] = -1
+        self._valid_indices[holes] = movers
+        self._valid_positions[movers] = holes
+        self._n_valid = new_n_valid
 
     def __getstate__(self) -> Dict[str, Any]:
         """
@@ -120,6 +180,11 @@ class HerReplayBuffer(DictReplayBuffer):
         self.__dict__.update(state)
         assert "env" not in state
         self.env = None
+        # Buffers saved before the valid indices were tracked incrementally
+        if "_valid_indices" not in state:
+            self._reset_valid_indices()
+        if "compute_reward" not in state:
+            self.compute_reward = None
 
     def set_env(self, env: VecEnv) -> None:
         """
@@ -152,6 +217,7 @@ class HerReplayBuffer(DictReplayBuffer):
                 episode_end = episode_start + episode_length
                 episode_indices = np.arange(self.pos, episode_end) % self.buffer_size
                 self.ep_length[episode_indices, env_idx] = 0
+                self._remove_valid(episode_indices * self.n_envs + env_idx)
 
         # Update episode start
         self.ep_start[self.pos] = self._current_ep_start.copy()
@@ -180,6 +246,7 @@ class HerReplayBuffer(DictReplayBuffer):
             episode_end += self.buffer_size
         episode_indices = np.arange(episode_start, episode_end) % self.buffer_size
         self.ep_length[episode_indices, env_idx] = episode_end - episode_start
+        self._add_valid(episode_indices * self.n_envs + env_idx)
         # Update the current episode start
         self._current_ep_start[env_idx] = self.pos
 
@@ -192,27 +259,19 @@ class HerReplayBuffer(DictReplayBuffer):
         :return: Samples
         """
         # When the buffer is full, we rewrite on old episodes. We don't want to
-        # sample incomplete episode transitions, so we have to eliminate some indexes.
-        is_valid = self.ep_length > 0
-        if not np.any(is_valid):
+        # sample incomplete episode transitions, so only the transitions of complete episodes
+        # are kept in the valid indices (updated in ``add()``).
+        if self._n_valid == 0:
             raise RuntimeError(
                 "Unable to sample before the end of the first episode. We recommend choosing a value "
                 "for learning_starts that is greater than the maximum number of timesteps in the environment."
             )
-        # Get the indices of valid transitions
-        # Example:
-        # if is_valid = [[True, False, False], [True, False, True]],
-        # is_valid has shape (buffer_size=2, n_envs=3)
-        # then valid_indices = [0, 3, 5]
-        # they correspond to is_valid[0, 0], is_valid[1, 0] and is_valid[1, 2]
-        # or in numpy format ([rows], [columns]): (array([0, 1, 1]), array([0, 0, 2]))
-        # Those indices are obtained back using np.unravel_index(valid_indices, is_valid.shape)
-        valid_indices = np.flatnonzero(is_valid)
         # Sample valid transitions that will constitute the minibatch of size batch_size
-        sampled_indices = np.random.choice(valid_indices, size=batch_size, replace=True)
+        # The valid indices are flat indices of arrays of shape (buffer_size, n_envs)
+        sampled_indices = self._valid_indices[np.random.randint(0, self._n_valid, size=batch_size)]
         # Unravel the indexes, i.e. recover the batch and env indices.
-        # Example: if sampled_indices = [0, 3, 5], then batch_indices = [0, 1, 1] and env_indices = [0, 0, 2]
-        batch_indices, env_indices = np.unravel_index(sampled_indices, is_valid.shape)
+        # Example: with n_envs=3, if sampled_indices = [0, 3, 5], then batch_indices = [0, 1, 1] and env_indices = [0, 0, 2]
+        batch_indices, env_indices = np.divmod(sampled_indices, self.n_envs)
 
         # Split the indexes between real and virtual transitions.
         nb_virtual = int(self.her_ratio * batch_size)
@@ -313,26 +372,29 @@ class HerReplayBuffer(DictReplayBuffer):
         # The desired goal for the next observation must be the same as the previous one
         next_obs["desired_goal"] = new_goals
 
-        assert (
-            self.env is not None
-        ), "You must initialize HerReplayBuffer with a VecEnv so it can compute rewards for virtual transitions"
         # Compute new reward
-        rewards = self.env.env_method(
-            "compute_reward",
-            # the new state depends on the previous state and action
-            # s_{t+1} = f(s_t, a_t)
-            # so the next achieved_goal depends also on the previous state and action
-            # because we are in a GoalEnv:
-            # r_t = reward(s_t, a_t) = reward(next_achieved_goal, desired_goal)
-            # therefore we have to use next_obs["achieved_goal"] and not obs["achieved_goal"]
-            next_obs["achieved_goal"],
-            # here we use the new desired goal
-            obs["desired_goal"],
-            infos,
-            # we use the method of the first environment assuming that all environments are identical.
-            indices=[0],
-        )
-        rewards = rewards[0].astype(np.float32)  # env_method returns a list containing one element
+        # the new state depends on the previous state and action
+        # s_{t+1} = f(s_t, a_t)
+        # so the next achieved_goal depends also on the previous state and action
+        # because we are in a GoalEnv:
+        # r_t = reward(s_t, a_t) = reward(next_achieved_goal, desired_goal)
+        # therefore we have to use next_obs["achieved_goal"] and not obs["achieved_goal"]
+        # (and here we use the new desired goal)
+        if self.compute_reward is not None:
+            rewards = np.asarray(self.compute_reward(next_obs["achieved_goal"], obs["desired_goal"], infos), dtype=np.float32)
+        else:
+            assert (
+                self.env is not None
+            ), "You must initialize HerReplayBuffer with a VecEnv so it can compute rewards for virtual transitions"
+            rewards = self.env.env_method(
+                "compute_reward",
+                next_obs["achieved_goal"],
+                obs["desired_goal"],
+                infos,
+                # we use the method of the first environment assuming that all environments are identical.
+                indices=[0],
+            )
+            rewards = rewards[0].astype(np.float32)  # env_method returns a list containing one element
         obs = self._normalize_obs(obs, env)  # type: ignore[assignment]
         next_obs = self._normalize_obs(next_obs, env)  # type: ignore[assignment]
 
@@ -6,7 +6,7 @@ import torch as th
 from gymnasium import spaces
 from torch.nn import functional as F
 
-from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.buffers import PackedRolloutBuffer, RolloutBuffer
 from stable_baselines3.common.on_policy_algorithm import OnPolicyAlgorithm
 from stable_baselines3.common.policies import ActorCriticCnnPolicy, ActorCriticPolicy, BasePolicy, MultiInputActorCriticPolicy
 from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, Schedule
@@ -59,6 +59,10 @@ class PPO(OnPolicyAlgorithm):
         because the clipping is not enough to prevent large update
         see issue #213 (cf https://github.com/hill-a/stable-baselines/issues/213)
         By default, there is no limit on the kl div.
+    :param target_kl_check_freq: Check the KL divergence against ``target_kl`` every ``target_kl_check_freq``
+        minibatches only. Each check forces a device synchronization, so a value greater than one
+        trades a slightly later early stopping for a faster training loop.
+        The max of the KL divergences of the minibatches since the last check is compared, so no spike is missed.
     :param stats_window_size: Window size for the rollout logging, specifying the number of episodes to average
         the reported success rate, mean episode length, and mean reward over
     :param tensorboard_log: the log location for tensorboard (if None, no logging)
@@ -98,6 +102,7 @@ class PPO(OnPolicyAlgorithm):
         rollout_buffer_class: Optional[Type[RolloutBuffer]] = None,
         rollout_buffer_kwargs: Optional[Dict[str, Any]] = None,
         target_kl: Optional[float] = None,
+        target_kl_check_freq: int = 1,
         stats_window_size: int = 100,
         tensorboard_log: Optional[str] = None,
         policy_kwargs: Optional[Dict[str, Any]] = None,
@@ -166,11 +171,17 @@ class PPO(OnPolicyAlgorithm):
         self.clip_range_vf = clip_range_vf
         self.normalize_advantage = normalize_advantage
         self.target_kl = target_kl
+        assert target_kl_check_freq > 0, "`target_kl_check_freq` must be positive"
+        self.target_kl_check_freq = target_kl_check_freq
 
         if _init_setup_model:
             self._setup_model()
 
     def _setup_model(self) -> None:
+        if self.rollout_buffer_class is not None and issubclass(self.rollout_buffer_class, PackedRolloutBuffer):
+            # The buffer precomputes the shuffled indices of all the epochs
+            # (copy, the kwargs may be shared with other models)
+            self.rollout_buffer_kwargs = {**self.rollout_buffer_kwargs, "n_epochs": self.n_epochs}
         super()._setup_model()
 
         # Initialize schedules for policy/value clipping
@@ -202,9 +213,13 @@ class PPO(OnPolicyAlgorithm):
         continue_training = True
         # train for n_epochs epochs
         for epoch in range(self.n_epochs):
-            approx_kl_divs = []
+            # Statistics are kept on the device and transferred once per epoch,
+            # to avoid a synchronization at every gradient step
+            epoch_stats = []
+            # Max of the KL divergences since the last check, kept on the device
+            max_kl_div = None
             # Do a complete pass on the rollout buffer
-            for rollout_data in self.rollout_buffer.get(self.batch_size):
+            for minibatch_idx, rollout_data in enumerate(self.rollout_buffer.get(self.batch_size)):
                 actions = rollout_data.actions
                 if isinstance(self.action_space, spaces.Discrete):
                     # Convert discrete action from float to long
@@ -231,9 +246,7 @@ class PPO(OnPolicyAlgorithm):
                 policy_loss = -th.min(policy_loss_1, policy_loss_2).mean()
 
                 # Logging
-                pg_losses.append(policy_loss.item())
-                clip_fraction = th.mean((th.abs(ratio - 1) > clip_range).float()).item()
-                clip_fractions.append(clip_fraction)
+                clip_fraction = th.mean((th.abs(ratio - 1) > clip_range).float())
 
                 if self.clip_range_vf is None:
                     # No clipping
@@ -246,7 +259,6 @@ class PPO(OnPolicyAlgorithm):
                     )
                 # Value loss using the TD(gae_lambda) target
                 value_loss = F.mse_loss(rollout_data.returns, values_pred)
-                value_losses.append(value_loss.item())
 
                 # Entropy loss favor exploration
                 if entropy is None:
@@ -255,8 +267,6 @@ class PPO(OnPolicyAlgorithm):
                 else:
                     entropy_loss = -th.mean(entropy)
 
-                entropy_losses.append(entropy_loss.item())
-
                 loss = policy_loss + self.ent_coef * entropy_loss + self.vf_coef * value_loss
 
                 # Calculate approximate form of reverse KL Divergence for early stopping
@@ -265,14 +275,24 @@ class PPO(OnPolicyAlgorithm):
                 # and Schulman blog: http://joschu.net/blog/kl-approx.html
                 with th.no_grad():
                     log_ratio = log_prob - rollout_data.old_log_prob
-                    approx_kl_div = th.mean((th.exp(log_ratio) - 1) - log_ratio).cpu().numpy()
-                    approx_kl_divs.append(approx_kl_div)
+                    approx_kl_div = th.mean((th.exp(log_ratio) - 1) - log_ratio)
+                    epoch_stats.append(
+                        th.stack([policy_loss, clip_fraction, value_loss, entropy_loss, approx_kl_div]).detach()
+                    )
 
-                if self.target_kl is not None and approx_kl_div > 1.5 * self.target_kl:
-                    continue_training = False
-                    if self.verbose >= 1:
-                        print(f"Early stopping at step {epoch} due to reaching max kl: {approx_kl_div:.2f}")
-                    break
+                if self.target_kl is not None:
+                    max_kl_div = approx_kl_div if max_kl_div is None else th.maximum(max_kl_div, approx_kl_div)
+
+                if self.target_kl is not None and (minibatch_idx + 1) % self.target_kl_check_freq == 0:
+                    assert max_kl_div is not None
+                    # Only place where we need to wait for the device inside the epoch
+                    current_kl_div = max_kl_div.item()
+                    max_kl_div = None
+                    if current_kl_div > 1.5 * self.target_kl:
+                        continue_training = False
+                        if self.verbose >= 1:
+                            print(f"Early stopping at step {epoch} due to reaching max kl: {current_kl_div:.2f}")
+                        break
 
                 # Optimization step
                 self.policy.optimizer.zero_grad()
@@ -281,6 +301,14 @@ class PPO(OnPolicyAlgorithm):
                 th.nn.utils.clip_grad_norm_(self.policy.parameters(), self.max_grad_norm)
                 self.policy.optimizer.step()
 
+            # Single transfer for the whole epoch
+            stats = th.stack(epoch_stats).cpu().numpy()
+            pg_losses.extend(stats[:, 0])
+            clip_fractions.extend(stats[:, 1])
+            value_losses.extend(stats[:, 2])
+            entropy_losses.extend(stats[:, 3])
+            approx_kl_divs = stats[:, 4]
+
             self._n_updates += 1
             if not continue_training:
                 break
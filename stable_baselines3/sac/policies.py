@@ -205,6 +205,8 @@ class SACPolicy(BasePolicy):
     :param n_critics: Number of critic networks to create.
     :param share_features_extractor: Whether to share or not the features extractor
         between the actor and the critic (this saves computation time)
+    :param batched_critics: Whether to evaluate all the critic networks at once
+        with batched matrix multiplications (see ``ContinuousCritic``)
     """
 
     actor: Actor
@@ -229,6 +231,7 @@ class SACPolicy(BasePolicy):
         optimizer_kwargs: Optional[Dict[str, Any]] = None,
         n_critics: int = 2,
         share_features_extractor: bool = False,
+        batched_critics: bool = False,
     ):
         super().__init__(
             observation_space,
@@ -270,6 +273,7 @@ class SACPolicy(BasePolicy):
                 "n_critics": n_critics,
                 "net_arch": critic_arch,
                 "share_features_extractor": share_features_extractor,
+                "batched_critics": batched_critics,
             }
         )
 
@@ -321,6 +325,7 @@ class SACPolicy(BasePolicy):
                 use_expln=self.actor_kwargs["use_expln"],
                 clip_mean=self.actor_kwargs["clip_mean"],
                 n_critics=self.critic_kwargs["n_critics"],
+                batched_critics=self.critic_kwargs["batched_critics"],
                 lr_schedule=self._dummy_schedule,  # dummy lr schedule, not needed for loading policy alone
                 optimizer_class=self.optimizer_class,
                 optimizer_kwargs=self.optimizer_kwargs,
@@ -393,6 +398,8 @@ class CnnPolicy(SACPolicy):
     :param n_critics: Number of critic networks to create.
     :param share_features_extractor: Whether to share or not the features extractor
         between the actor and the critic (this saves computation time)
+    :param batched_critics: Whether to evaluate all the critic networks at once
+        with batched matrix multiplications (see ``ContinuousCritic``)
     """
 
     def __init__(
@@ -413,6 +420,7 @@ class CnnPolicy(SACPolicy):
         optimizer_kwargs: Optional[Dict[str, Any]] = None,
         n_critics: int = 2,
         share_features_extractor: bool = False,
+        batched_critics: bool = False,
     ):
         super().__init__(
             observation_space,
@@ -431,6 +439,7 @@ class CnnPolicy(SACPolicy):
             optimizer_kwargs,
             n_critics,
             share_features_extractor,
+            batched_critics,
         )
 
 
@@ -459,6 +468,8 @@ class MultiInputPolicy(SACPolicy):
     :param n_critics: Number of critic networks to create.
     :param share_features_extractor: Whether to share or not the features extractor
         between the actor and the critic (this saves computation time)
+    :param batched_critics: Whether to evaluate all the critic networks at once
+        with batched matrix multiplications (see ``ContinuousCritic``)
     """
 
     def __init__(
@@ -479,6 +490,7 @@ class MultiInputPolicy(SACPolicy):
         optimizer_kwargs: Optional[Dict[str, Any]] = None,
         n_critics: int = 2,
         share_features_extractor: bool = False,
+        batched_critics: bool = False,
     ):
         super().__init__(
             observation_space,
@@ -497,4 +509,5 @@ class MultiInputPolicy(SACPolicy):
             optimizer_kwargs,
             n_critics,
             share_features_extractor,
+            batched_critics,
         )
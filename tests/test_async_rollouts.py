@@ -0,0 +1,92 @@
+import functools
+import unittest
+from unittest import mock
+
+import gymnasium as gym
+import numpy as np
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import (
+    AsyncSubprocVecEnv,
+    DummyVecEnv,
+    VecFrameStack,
+    VecMonitor,
+    VecNormalize,
+    supports_partial_steps,
+)
+
+N_ENVS = 3
+# Longer than an episode of Pendulum (200 steps), so truncated episodes are bootstrapped
+N_STEPS = 210
+
+
+class LocalsCallback(BaseCallback):
+    def __init__(self):
+        super().__init__()
+        self.sizes = set()
+        self.n_done = 0
+
+    def _on_step(self) -> bool:
+        self.sizes.add((len(self.locals["dones"]), len(self.locals["infos"]), len(self.locals["new_obs"])))
+        self.n_done += int(np.sum(self.locals["dones"]))
+        return True
+
+
+def collect_rollout(vec_env_cls, callback):
+    env = make_vec_env("Pendulum-v1", n_envs=N_ENVS, seed=0, vec_env_cls=vec_env_cls)
+    model = PPO("MlpPolicy", env, n_steps=N_STEPS, seed=0)
+    # Deterministic actions, so both collections follow the same trajectories
+    with mock.patch.object(model.policy, "forward", functools.partial(model.policy.forward, deterministic=True)):
+        _, callback = model._setup_learn(N_STEPS * N_ENVS, callback)
+        assert model.collect_rollouts(model.env, callback, model.rollout_buffer, n_rollout_steps=N_STEPS)
+    env.close()
+    return model.rollout_buffer
+
+
+class TestAsyncRollouts(unittest.TestCase):
+    def test_rollout_buffer_matches_synchronous_collection(self):
+        sync_callback, async_callback = LocalsCallback(), LocalsCallback()
+        expected = collect_rollout(DummyVecEnv, sync_callback)
+        rollout_buffer = collect_rollout(AsyncSubprocVecEnv, async_callback)
+
+        self.assertTrue(rollout_buffer.full)
+        np.testing.assert_array_equal(rollout_buffer.env_pos, N_STEPS)
+        for name in ("observations", "actions", "rewards", "episode_starts", "values", "log_probs", "returns", "advantages"):
+            np.testing.assert_allclose(getattr(rollout_buffer, name), getattr(expected, name), rtol=1e-4, atol=1e-4)
+
+        # The callbacks see full-size arrays, and the same episodes
+        self.assertEqual(async_callback.sizes, {(N_ENVS, N_ENVS, N_ENVS)})
+        self.assertEqual(async_callback.n_done, sync_callback.n_done)
+        self.assertEqual(async_callback.n_done, N_ENVS)
+
+    def test_supports_partial_steps(self):
+        env = make_vec_env("Pendulum-v1", n_envs=2, vec_env_cls=AsyncSubprocVecEnv)
+        self.assertTrue(supports_partial_steps(env))
+        self.assertTrue(supports_partial_steps(VecNormalize(VecMonitor(env))))
+        self.assertFalse(supports_partial_steps(VecFrameStack(env, 2)))
+        env.close()
+        self.assertFalse(supports_partial_steps(DummyVecEnv([lambda: gym.make("Pendulum-v1")])))
+
+    def test_wrapped_env_is_collected_asynchronously(self):
+        env = VecNormalize(make_vec_env("Pendulum-v1", n_envs=2, vec_env_cls=AsyncSubprocVecEnv))
+        model = PPO("MlpPolicy", env, n_steps=250, batch_size=100, n_epochs=1)
+        with mock.patch.object(model, "_collect_rollouts_async", wraps=model._collect_rollouts_async) as collect_async:
+            model.learn(500)
+        self.assertEqual(collect_async.call_count, 1)
+        # The episode statistics are recorded by the Monitor wrappers, and VecNormalize is updated
+        self.assertEqual(len(model.ep_info_buffer), 2)
+        self.assertAlmostEqual(env.obs_rms.count, 500 + 2, delta=1)
+        env.close()
+
+    def test_warns_on_synchronous_fallback(self):
+        env = VecFrameStack(make_vec_env("Pendulum-v1", n_envs=2, vec_env_cls=AsyncSubprocVecEnv), 2)
+        model = PPO("MlpPolicy", env, n_steps=16, batch_size=32, n_epochs=1)
+        with self.assertWarns(UserWarning):
+            model.learn(64)
+        env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+import torch as th
+from gymnasium import spaces
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.buffers import (
+    MemmapReplayBuffer,
+    NStepReplayBuffer,
+    PackedRolloutBuffer,
+    PrioritizedReplayBuffer,
+    RolloutBuffer,
+    TorchRolloutBuffer,
+)
+from stable_baselines3.common.envs import BitFlippingEnv
+from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.her.her_replay_buffer import HerReplayBuffer
+
+OBSERVATION_SPACE = spaces.Box(-1.0, 1.0, shape=(3,), dtype=np.float32)
+ACTION_SPACE = spaces.Box(-1.0, 1.0, shape=(2,), dtype=np.float32)
+
+
+def fill_rollout_buffer(buffer, rng, buffer_size, n_envs):
+    for _ in range(buffer_size):
+        buffer.add(
+            rng.normal(size=(n_envs, 3)).astype(np.float32),
+            rng.normal(size=(n_envs, 2)).astype(np.float32),
+            rng.normal(size=n_envs).astype(np.float32),
+            rng.random(n_envs) < 0.2,
+            th.as_tensor(rng.normal(size=n_envs), dtype=th.float32),
+            th.as_tensor(rng.normal(size=n_envs), dtype=th.float32),
+        )
+
+
+def add_transitions(buffer, rewards, dones, timeouts=None):
+    n_envs = buffer.n_envs
+    for step, (reward, done) in enumerate(zip(rewards, dones)):
+        infos = [{"TimeLimit.truncated": bool(timeouts is not None and timeouts[step])} for _ in range(n_envs)]
+        buffer.add(
+            np.full((n_envs, 3), step, dtype=np.float32),
+            np.full((n_envs, 3), step + 1, dtype=np.float32),
+            np.zeros((n_envs, 2), dtype=np.float32),
+            np.full(n_envs, reward, dtype=np.float32),
+            np.full(n_envs, done),
+            infos,
+        )
+
+
+class TestTorchRolloutBuffer(unittest.TestCase):
+    def test_returns_and_advantages_match_rollout_buffer(self):
+        buffer_size, n_envs = 32, 4
+        buffers = [
+            buffer_class(buffer_size, OBSERVATION_SPACE, ACTION_SPACE, "cpu", gae_lambda=0.95, gamma=0.9, n_envs=n_envs)
+            for buffer_class in (RolloutBuffer, TorchRolloutBuffer)
+        ]
+        for buffer in buffers:
+            fill_rollout_buffer(buffer, np.random.default_rng(0), buffer_size, n_envs)
+            buffer.compute_returns_and_advantage(th.linspace(-1.0, 1.0, n_envs), np.array([False, True, False, True]))
+
+        reference, torch_buffer = buffers
+        np.testing.assert_allclose(torch_buffer.advantages.cpu().numpy(), reference.advantages, rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(torch_buffer.returns.cpu().numpy(), reference.returns, rtol=1e-5, atol=1e-5)
+
+
+class TestPackedRolloutBuffer(unittest.TestCase):
+    def test_each_epoch_covers_the_buffer_once(self):
+        buffer_size, n_envs, n_epochs, batch_size = 16, 2, 3, 5
+        buffer = PackedRolloutBuffer(buffer_size, OBSERVATION_SPACE, ACTION_SPACE, "cpu", n_envs=n_envs, n_epochs=n_epochs)
+        fill_rollout_buffer(buffer, np.random.default_rng(0), buffer_size, n_envs)
+        buffer.compute_returns_and_advantage(th.zeros(n_envs), np.zeros(n_envs, dtype=bool))
+        reference = RolloutBuffer(buffer_size, OBSERVATION_SPACE, ACTION_SPACE, "cpu", n_envs=n_envs)
+        fill_rollout_buffer(reference, np.random.default_rng(0), buffer_size, n_envs)
+        reference.compute_returns_and_advantage(th.zeros(n_envs), np.zeros(n_envs, dtype=bool))
+        expected_returns = np.sort(reference.returns.flatten())
+
+        for _ in range(n_epochs + 1):
+            batches = list(buffer.get(batch_size))
+            self.assertEqual([len(batch.returns) for batch in batches], [5, 5, 5, 5, 5, 5, 2])
+            returns = th.cat([batch.returns for batch in batches]).numpy()
+            np.testing.assert_allclose(np.sort(returns), expected_returns, rtol=1e-6)
+            observations = th.cat([batch.observations for batch in batches])
+            self.assertEqual(observations.shape, (buffer_size * n_envs, 3))
+
+    def test_ppo_does_not_modify_the_buffer_kwargs(self):
+        # Shared by both models
+        rollout_buffer_kwargs = {}
+        models = [
+            PPO(
+                "MlpPolicy",
+                "Pendulum-v1",
+                n_steps=64,
+                batch_size=32,
+                n_epochs=n_epochs,
+                rollout_buffer_class=PackedRolloutBuffer,
+                rollout_buffer_kwargs=rollout_buffer_kwargs,
+            )
+            for n_epochs in (2, 3)
+        ]
+        self.assertEqual(rollout_buffer_kwargs, {})
+        self.assertEqual([model.rollout_buffer.n_epochs for model in models], [2, 3])
+
+
+class TestMemmapReplayBuffer(unittest.TestCase):
+    def test_pickle_is_a_snapshot(self):
+        with tempfile.TemporaryDirectory() as folder:
+            storage_dir = os.path.join(folder, "storage")
+            buffer = MemmapReplayBuffer(10, OBSERVATION_SPACE, ACTION_SPACE, "cpu", storage_dir=storage_dir)
+            add_transitions(buffer, np.arange(6), np.zeros(6, dtype=bool))
+            saved = pickle.dumps(buffer)
+            # Wrap around after the save
+            add_transitions(buffer, np.arange(6, 14), np.zeros(8, dtype=bool))
+
+            for _ in range(2):
+                loaded = pickle.loads(saved)
+                self.assertEqual((loaded.pos, loaded.full), (6, False))
+                np.testing.assert_array_equal(loaded.rewards[:, 0], [0, 1, 2, 3, 4, 5, 0, 0, 0, 0])
+                # Writing to the loaded buffer does not change the snapshot
+                add_transitions(loaded, np.full(10, -1.0), np.zeros(10, dtype=bool))
+                loaded_dir = loaded.storage_dir
+                loaded.close()
+                self.assertFalse(os.path.exists(loaded_dir))
+
+            np.testing.assert_array_equal(buffer.rewards[:, 0], [10, 11, 12, 13, 4, 5, 6, 7, 8, 9])
+            buffer.close()
+            # The storage directory given by the user is kept
+            self.assertTrue(os.path.exists(storage_dir))
+
+    def test_temporary_storage_is_removed(self):
+        buffer = MemmapReplayBuffer(10, OBSERVATION_SPACE, ACTION_SPACE, "cpu")
+        storage_dir = buffer.storage_dir
+        add_transitions(buffer, np.arange(3), np.zeros(3, dtype=bool))
+        self.assertTrue(os.path.exists(storage_dir))
+        del buffer
+        self.assertFalse(os.path.exists(storage_dir))
+
+
+class TestPrioritizedReplayBuffer(unittest.TestCase):
+    def test_sampling_is_proportional_to_priorities(self):
+        np.random.seed(0)
+        buffer = PrioritizedReplayBuffer(8, OBSERVATION_SPACE, ACTION_SPACE, "cpu", alpha=1.0, beta=1.0, epsilon=0.0)
+        add_transitions(buffer, np.zeros(4), np.zeros(4, dtype=bool))
+        priorities = np.array([1.0, 2.0, 3.0, 4.0])
+        buffer.update_priorities(np.arange(4), priorities)
+        self.assertEqual(buffer.max_priority, 4.0)
+
+        counts = np.zeros(4)
+        for _ in range(500):
+            samples = buffer.sample(20)
+            counts += np.bincount(samples.indices, minlength=4)
+        np.testing.assert_allclose(counts / counts.sum(), priorities / priorities.sum(), atol=0.02)
+
+        # The importance sampling weights are normalized by the max weight (lowest priority)
+        samples = buffer.sample(20)
+        expected_weights = priorities.min() / priorities[samples.indices]
+        np.testing.assert_allclose(samples.weights.numpy().flatten(), expected_weights, rtol=1e-5)
+
+    def test_new_transitions_get_the_max_priority(self):
+        buffer = PrioritizedReplayBuffer(8, OBSERVATION_SPACE, ACTION_SPACE, "cpu", alpha=1.0, epsilon=0.0)
+        add_transitions(buffer, np.zeros(2), np.zeros(2, dtype=bool))
+        buffer.update_priorities(np.array([0, 1]), th.tensor([[-5.0], [0.5]]))
+        add_transitions(buffer, np.zeros(1), np.zeros(1, dtype=bool))
+        np.testing.assert_allclose(buffer.sum_tree[np.arange(3)], [5.0, 0.5, 5.0])
+        self.assertAlmostEqual(buffer.sum_tree.reduce(), 10.5)
+        self.assertAlmostEqual(buffer.min_tree.reduce(), 0.5)
+
+
+class TestNStepReplayBuffer(unittest.TestCase):
+    def test_returns_stop_at_episode_boundaries(self):
+        gamma = 0.5
+        buffer = NStepReplayBuffer(10, OBSERVATION_SPACE, ACTION_SPACE, "cpu", n_steps=3, gamma=gamma)
+        # Episode of 4 steps (terminated), then an episode truncated after 2 steps, then 1 unfinished step
+        add_transitions(
+            buffer,
+            rewards=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+            dones=[False, False, False, True, False, True, False],
+            timeouts=[False, False, False, False, False, True, False],
+        )
+        samples = buffer._get_samples(np.arange(7), env_indices=np.zeros(7, dtype=np.int64))
+        expected_rewards = [
+            1 + gamma * 2 + gamma**2 * 3,
+            2 + gamma * 3 + gamma**2 * 4,
+            3 + gamma * 4,
+            4,
+            5 + gamma * 6,
+            6,
+            7,
+        ]
+        np.testing.assert_allclose(samples.rewards.numpy().flatten(), expected_rewards)
+        np.testing.assert_allclose(samples.discounts.numpy().flatten(), gamma ** np.array([3, 3, 2, 1, 2, 1, 1]))
+        # Terminations are kept, timeouts are bootstrapped
+        np.testing.assert_array_equal(samples.dones.numpy().flatten(), [0, 1, 1, 1, 0, 0, 0])
+        # The next observation is the one at the end of the n steps
+        np.testing.assert_array_equal(samples.next_observations.numpy()[:, 0], [3, 4, 4, 4, 6, 6, 7])
+
+
+class TestHerReplayBuffer(unittest.TestCase):
+    def test_valid_indices_track_complete_episodes(self):
+        n_bits, n_envs, buffer_size = 4, 2, 10
+        env = DummyVecEnv([lambda: BitFlippingEnv(n_bits=n_bits, continuous=True)] * n_envs)
+        buffer = HerReplayBuffer(buffer_size, env.observation_space, env.action_space, env, device="cpu", n_envs=n_envs)
+        rng = np.random.default_rng(0)
+        obs = env.reset()
+        for _ in range(60):
+            obs_dict = {key: value.copy() for key, value in obs.items()}
+            next_obs = {key: value + 1 for key, value in obs.items()}
+            dones = rng.random(n_envs) < 0.3
+            buffer.add(obs_dict, next_obs, rng.normal(size=(n_envs, n_bits)), np.zeros(n_envs), dones, [{}] * n_envs)
+
+            # Same set as a full scan of the episode lengths, each index at its recorded position
+            valid_indices = buffer._valid_indices[: buffer._n_valid]
+            np.testing.assert_array_equal(np.sort(valid_indices), np.flatnonzero(buffer.ep_length > 0))
+            np.testing.assert_array_equal(buffer._valid_positions[valid_indices], np.arange(buffer._n_valid))
+            self.assertEqual(np.sum(buffer._valid_positions >= 0), buffer._n_valid)
+        env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
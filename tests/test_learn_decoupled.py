@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import gymnasium as gym
+
+from stable_baselines3 import DQN, SAC, HerReplayBuffer
+from stable_baselines3.common.callbacks import BaseCallback, CallbackList, CheckpointCallback, EvalCallback
+from stable_baselines3.common.envs import BitFlippingEnv
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+
+class PredictCallback(BaseCallback):
+    """
+    Check that ``predict()`` uses the actor copy of the policy while decoupled.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.n_checks = 0
+
+    def _on_step(self) -> bool:
+        policy = self.model._collection_policy
+        with mock.patch.object(policy, "predict", wraps=policy.predict) as predict:
+            self.model.predict(self.locals["new_obs"], deterministic=True)
+        predict.assert_called_once()
+        self.n_checks += 1
+        return True
+
+
+class TestLearnDecoupled(unittest.TestCase):
+    def check_learn_decoupled(self, model, env_id, total_timesteps, gradient_steps_per_env_step):
+        with tempfile.TemporaryDirectory() as folder:
+            predict_callback = PredictCallback()
+            callback = CallbackList(
+                [
+                    CheckpointCallback(save_freq=100, save_path=folder, save_replay_buffer=True),
+                    EvalCallback(DummyVecEnv([lambda: gym.make(env_id)]), eval_freq=150, n_eval_episodes=2),
+                    predict_callback,
+                ]
+            )
+            model.learn_decoupled(
+                total_timesteps,
+                callback=callback,
+                policy_sync_interval=10,
+                gradient_steps_per_env_step=gradient_steps_per_env_step,
+            )
+            self.assertEqual(predict_callback.n_checks, total_timesteps)
+            # All the gradient steps owed are done once the collection is over
+            self.assertEqual(model._n_updates, int((total_timesteps - model.learning_starts) * gradient_steps_per_env_step))
+            # The state of the decoupled mode is cleared
+            self.assertIsNone(model._collection_policy)
+
+            checkpoints = sorted(name for name in os.listdir(folder) if name.endswith("_steps.zip"))
+            self.assertEqual(len(checkpoints), total_timesteps // 100)
+            loaded = model.__class__.load(os.path.join(folder, checkpoints[-1]))
+            self.assertIsNone(loaded._collection_policy)
+            replay_buffer_name = checkpoints[-1].replace("model_", "model_replay_buffer_").replace(".zip", ".pkl")
+            loaded.load_replay_buffer(os.path.join(folder, replay_buffer_name))
+            self.assertGreater(loaded.replay_buffer.size(), 0)
+
+    def test_sac(self):
+        model = SAC("MlpPolicy", "Pendulum-v1", learning_starts=100, batch_size=32, policy_kwargs=dict(net_arch=[32]))
+        self.check_learn_decoupled(model, "Pendulum-v1", 400, gradient_steps_per_env_step=0.5)
+
+    def test_dqn(self):
+        model = DQN("MlpPolicy", "CartPole-v1", learning_starts=100, target_update_interval=80, batch_size=32)
+        with mock.patch.object(DQN, "_update_target", autospec=True, side_effect=DQN._update_target) as update_target:
+            self.check_learn_decoupled(model, "CartPole-v1", 400, gradient_steps_per_env_step=0.25)
+        # The learner updates the target network every 80 * 0.25 gradient steps
+        self.assertEqual(update_target.call_count, model._n_updates // 20)
+
+    def test_her_requires_local_reward(self):
+        env = BitFlippingEnv(n_bits=4, continuous=True)
+        model = SAC("MultiInputPolicy", env, replay_buffer_class=HerReplayBuffer, learning_starts=50)
+        with self.assertRaises(AssertionError):
+            model.learn_decoupled(100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import tempfile
+import threading
+import unittest
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import torch as th
+
+from stable_baselines3.common.logger import BinaryOutputFormat, Figure, KVWriter, Logger, SeqWriter, read_binary
+
+
+class RecordingWriter(KVWriter, SeqWriter):
+    """
+    Output format recording what it writes, optionally waiting for ``release`` before each write.
+    """
+
+    def __init__(self, fail_on_step=None):
+        self.events = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail_on_step = fail_on_step
+
+    def write(self, key_values, key_excluded, step=0):
+        self.release.wait()
+        if step == self.fail_on_step:
+            raise ValueError(f"Cannot write step {step}")
+        self.events.append(("kv", step, key_values))
+
+    def write_sequence(self, sequence):
+        self.release.wait()
+        self.events.append(("seq", "".join(sequence)))
+
+    def close(self):
+        pass
+
+
+class TestBinaryOutputFormat(unittest.TestCase):
+    def test_round_trip_through_read_binary(self):
+        with tempfile.TemporaryDirectory() as folder:
+            writer = BinaryOutputFormat(folder, flush_every=2)
+            writer.write({"a": 1.0, "b": np.float32(2.5)}, {"a": ("",), "b": ("",)}, step=10)
+            writer.write({"a": 3, "c": -1.0}, {"a": ("",), "c": ("",)}, step=20)
+            # Excluded keys are not written
+            writer.write({"a": 4.0, "d": 7.0}, {"a": ("",), "d": ("binary",)}, step=30)
+            writer.close()
+
+            data = read_binary(folder)
+
+        self.assertEqual(list(data.index), [10, 20, 30])
+        self.assertEqual(sorted(data.columns), ["a", "b", "c"])
+        np.testing.assert_array_equal(data["a"], [1.0, 3.0, 4.0])
+        np.testing.assert_array_equal(data["b"], [2.5, np.nan, np.nan])
+        np.testing.assert_array_equal(data["c"], [np.nan, -1.0, np.nan])
+
+
+class TestAsyncLogger(unittest.TestCase):
+    def test_outputs_are_written_in_order(self):
+        writer = RecordingWriter()
+        logger = Logger(None, [writer], async_dump=True)
+        for step in range(3):
+            logger.record("value", step)
+            logger.log(f"step {step}")
+            logger.dump(step)
+        logger.close()
+        expected = []
+        for step in range(3):
+            expected += [("seq", f"step {step}"), ("kv", step, {"value": step})]
+        self.assertEqual(writer.events, expected)
+
+    def test_mutable_values_are_snapshot(self):
+        writer = RecordingWriter()
+        writer.release.clear()
+        logger = Logger(None, [writer], async_dump=True)
+        array, tensor = np.zeros(3), th.zeros(3)
+        figure = plt.figure()
+        plt.plot([0, 1], [0, 1])
+        logger.record("array", array)
+        logger.record("tensor", tensor)
+        logger.record("figure", Figure(figure, close=True))
+        logger.dump(0)
+        # Modified (and closed) before the writer thread runs
+        array += 1
+        tensor += 1
+        plt.close()
+        figure.clear()
+        writer.release.set()
+        logger.close()
+
+        (_, _, key_values), = writer.events
+        np.testing.assert_array_equal(key_values["array"], np.zeros(3))
+        th.testing.assert_close(key_values["tensor"], th.zeros(3))
+        image = key_values["figure"].image
+        self.assertEqual(image.shape, (3, *figure.canvas.get_width_height()[::-1]))
+        # The plotted line is in the rendered image, not only the white background
+        self.assertLess(image.min(), 255)
+        self.assertFalse(plt.fignum_exists(figure.number))
+
+    def test_writer_errors_are_raised(self):
+        writer = RecordingWriter(fail_on_step=1)
+        logger = Logger(None, [writer], async_dump=True)
+        for step in range(3):
+            logger.record("value", step)
+            logger.dump(step)
+        # Raised by the next dump once the write failed (the values of this dump are not written)
+        logger._write_queue.join()
+        with self.assertRaisesRegex(ValueError, "Cannot write step 1"):
+            logger.record("value", 3)
+            logger.dump(3)
+        logger.close()
+        self.assertEqual([step for _, step, _ in writer.events], [0, 2])
+
+        # Or on close
+        logger = Logger(None, [RecordingWriter(fail_on_step=0)], async_dump=True)
+        logger.record("value", 0)
+        logger.dump(0)
+        with self.assertRaisesRegex(ValueError, "Cannot write step 0"):
+            logger.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas
+
+from stable_baselines3.common import monitor
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.monitor import MONITOR_CACHE_FILE, ResultsWriter, load_results
+from stable_baselines3.common.vec_env import SubprocVecEnv
+
+
+def count_written_rows(writer):
+    """Number of episode rows on disk (without the two header lines)."""
+    with open(writer.file_handler.name) as file_handler:
+        return len(file_handler.readlines()) - 2
+
+
+class TestLoadResults(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.writers = [
+            ResultsWriter(os.path.join(self.folder.name, str(idx)), header={"t_start": 100.0 + idx}, extra_keys=("outcome",))
+            for idx in range(2)
+        ]
+        for writer in self.writers:
+            self.addCleanup(writer.close)
+        for step in range(5):
+            for idx, writer in enumerate(self.writers):
+                self.write_row(writer, step, idx)
+
+    @staticmethod
+    def write_row(writer, step, idx):
+        writer.write_row({"r": step * 0.1 + idx, "l": step + 1, "t": step + 0.5 * idx, "outcome": f"outcome_{step % 2}"})
+
+    def assert_same_as_fresh_load(self, data_frame):
+        pandas.testing.assert_frame_equal(data_frame, load_results(self.folder.name))
+
+    def test_cached_load(self):
+        data_frame = load_results(self.folder.name, use_cache=True)
+        self.assertEqual(len(data_frame), 10)
+        self.assertEqual(sorted(data_frame["outcome"].unique()), ["outcome_0", "outcome_1"])
+        self.assert_same_as_fresh_load(data_frame)
+        # The cache does not need pickle
+        cache_path = os.path.join(self.folder.name, MONITOR_CACHE_FILE)
+        with np.load(cache_path, allow_pickle=False) as archive:
+            self.assertIn("index", archive)
+
+        # Unchanged files are not read again, nor is the cache rewritten
+        mtime = os.stat(cache_path).st_mtime_ns
+        with mock.patch.object(monitor.pandas, "read_csv", wraps=pandas.read_csv) as read_csv:
+            data_frame = load_results(self.folder.name, use_cache=True)
+        read_csv.assert_not_called()
+        self.assert_same_as_fresh_load(data_frame)
+        self.assertEqual(os.stat(cache_path).st_mtime_ns, mtime)
+
+    def test_incremental_load(self):
+        load_results(self.folder.name, use_cache=True)
+        writer = self.writers[1]
+        for step in range(5, 8):
+            self.write_row(writer, step, 1)
+        # Episode being written
+        writer.file_handler.write("0.5,9")
+        writer.flush()
+        with mock.patch.object(monitor.pandas, "read_csv", wraps=pandas.read_csv) as read_csv:
+            data_frame = load_results(self.folder.name, use_cache=True)
+        # Only the new rows of the modified file are parsed
+        read_csv.assert_called_once()
+        self.assertEqual(len(read_csv.call_args[0][0].getvalue().splitlines()), 3)
+        self.assertEqual(len(data_frame), 13)
+        self.assert_same_as_fresh_load(data_frame)
+
+        # The incomplete row is parsed once it is written
+        writer.file_handler.write(",8.5,outcome_1\n")
+        writer.flush()
+        data_frame = load_results(self.folder.name, use_cache=True)
+        self.assertEqual(len(data_frame), 14)
+        self.assertEqual(data_frame["l"].iloc[-1], 9)
+        self.assert_same_as_fresh_load(data_frame)
+
+    def test_rewritten_file_is_parsed_again(self):
+        load_results(self.folder.name, use_cache=True)
+        self.writers[0].close()
+        writer = ResultsWriter(os.path.join(self.folder.name, "0"), header={"t_start": 100.0}, extra_keys=("outcome",))
+        self.addCleanup(writer.close)
+        self.write_row(writer, 0, 0)
+        data_frame = load_results(self.folder.name, use_cache=True)
+        self.assertEqual(len(data_frame), 6)
+        self.assert_same_as_fresh_load(data_frame)
+
+    def test_corrupted_cache_is_ignored(self):
+        with open(os.path.join(self.folder.name, MONITOR_CACHE_FILE), "wb") as file_handler:
+            file_handler.write(b"not a cache")
+        self.assert_same_as_fresh_load(load_results(self.folder.name, use_cache=True))
+        self.assert_same_as_fresh_load(load_results(self.folder.name, use_cache=True))
+
+    def test_parallel_load(self):
+        self.assert_same_as_fresh_load(load_results(self.folder.name, n_workers=2))
+        self.assert_same_as_fresh_load(load_results(self.folder.name, n_workers=2, use_cache=True))
+
+
+class TestResultsWriter(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def make_writer(self, **kwargs):
+        writer = ResultsWriter(os.path.join(self.folder.name, "test"), **kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_flush_every(self):
+        writer = self.make_writer(flush_every=3)
+        for idx in range(7):
+            writer.write_row({"r": 1.0, "l": 1, "t": float(idx)})
+            self.assertEqual(count_written_rows(writer), (idx + 1) // 3 * 3)
+        writer.close()
+        self.assertEqual(count_written_rows(writer), 7)
+
+    def test_flush_interval(self):
+        with mock.patch.object(monitor.time, "time", return_value=0.0) as time:
+            writer = self.make_writer(flush_every=100, flush_interval=10.0)
+            time.return_value = 5.0
+            writer.write_row({"r": 1.0, "l": 1, "t": 5.0})
+            self.assertEqual(count_written_rows(writer), 0)
+            # Only checked when a row is written
+            time.return_value = 11.0
+            self.assertEqual(count_written_rows(writer), 0)
+            writer.write_row({"r": 1.0, "l": 1, "t": 11.0})
+            self.assertEqual(count_written_rows(writer), 2)
+            # The interval restarts at the last flush
+            time.return_value = 20.0
+            writer.write_row({"r": 1.0, "l": 1, "t": 20.0})
+            self.assertEqual(count_written_rows(writer), 2)
+
+    def test_attach_and_detach(self):
+        for close_when_unused in (False, True):
+            writer = self.make_writer(flush_every=100, close_when_unused=close_when_unused)
+            writer.attach()
+            writer.attach()
+            writer.write_row({"r": 1.0, "l": 1, "t": 0.0})
+            # Detaching flushes the file, which is closed once unused
+            writer.detach()
+            self.assertEqual(count_written_rows(writer), 1)
+            self.assertFalse(writer.file_handler.closed)
+            writer.detach()
+            self.assertEqual(writer.file_handler.closed, close_when_unused)
+            writer.detach()
+            self.assertEqual(writer.n_users, 0)
+
+    def test_shared_monitor_file(self):
+        env = make_vec_env("CartPole-v1", n_envs=2, monitor_dir=self.folder.name, shared_monitor_file=True)
+        writer = env.envs[0].results_writer
+        self.assertIs(env.envs[1].results_writer, writer)
+        self.assertEqual(writer.n_users, 2)
+        env.reset()
+        n_episodes = 0
+        while n_episodes < 4:
+            _, _, dones, _ = env.step(np.array([env.action_space.sample() for _ in range(2)]))
+            n_episodes += int(np.sum(dones))
+        env.close()
+        self.assertTrue(writer.file_handler.closed)
+        self.assertEqual(os.listdir(self.folder.name), ["shared.monitor.csv"])
+        self.assertEqual(len(load_results(self.folder.name)), n_episodes)
+
+    def test_invalid_shared_monitor_file(self):
+        for kwargs in (
+            dict(monitor_dir=None),
+            dict(monitor_dir=self.folder.name, vec_monitor=True),
+            dict(monitor_dir=self.folder.name, vec_env_cls=SubprocVecEnv),
+        ):
+            with self.assertRaises(ValueError):
+                make_vec_env("CartPole-v1", n_envs=2, shared_monitor_file=True, **kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main()
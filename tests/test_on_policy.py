@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+
+import gymnasium as gym
+import numpy as np
+import torch as th
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.env_util import make_vec_env
+
+N_ENVS = 3
+# Longer than an episode of Pendulum (200 steps), so truncated episodes are bootstrapped
+N_STEPS = 210
+
+
+class DictObservation(gym.ObservationWrapper):
+    def __init__(self, env):
+        super().__init__(env)
+        self.observation_space = gym.spaces.Dict({"obs": env.observation_space, "scaled": env.observation_space})
+
+    def observation(self, observation):
+        return {"obs": observation, "scaled": observation * 2}
+
+
+class TerminalObservationCallback(BaseCallback):
+    """
+    Record the rewards of the envs (before bootstrapping) and the observations of the truncated episodes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rewards = []
+        self.truncated = []
+
+    def _on_step(self) -> bool:
+        self.rewards.append(self.locals["rewards"].copy())
+        for env_idx, (done, info) in enumerate(zip(self.locals["dones"], self.locals["infos"])):
+            if done and info.get("TimeLimit.truncated", False):
+                self.truncated.append((len(self.rewards) - 1, env_idx, info["terminal_observation"]))
+        return True
+
+
+class TestTargetKL(unittest.TestCase):
+    def count_gradient_steps(self, log_prob_offsets, **kwargs):
+        """
+        Train PPO for one rollout (4 minibatches per epoch, 2 epochs) without changing the policy,
+        with ``log_prob_offsets[i]`` added to the log probabilities of the i-th minibatch,
+        so its approximate KL divergence is ``exp(offset) - 1 - offset``.
+
+        :return: Number of gradient steps done
+        """
+        model = PPO("MlpPolicy", "Pendulum-v1", n_steps=64, batch_size=16, n_epochs=2, learning_rate=0.0, **kwargs)
+        evaluate_actions = model.policy.evaluate_actions
+        offsets = iter(log_prob_offsets)
+
+        def offset_evaluate_actions(*args, **kwargs):
+            values, log_prob, entropy = evaluate_actions(*args, **kwargs)
+            return values, log_prob + next(offsets, 0.0), entropy
+
+        with mock.patch.object(model.policy, "evaluate_actions", side_effect=offset_evaluate_actions):
+            with mock.patch.object(model.policy.optimizer, "step", wraps=model.policy.optimizer.step) as step:
+                model.learn(64)
+        return step.call_count
+
+    def test_stops_on_the_max_kl_between_checks(self):
+        # KL of 0.15 in the first minibatch only, target_kl of 0.05
+        offsets = [0.5]
+        self.assertEqual(self.count_gradient_steps(offsets), 8)
+        self.assertEqual(self.count_gradient_steps(offsets, target_kl=0.05), 0)
+        # Only checked after the 4th minibatch, which is skipped, but the max since the last check is used
+        self.assertEqual(self.count_gradient_steps(offsets, target_kl=0.05, target_kl_check_freq=4), 3)
+        self.assertEqual(self.count_gradient_steps([0.0, 0.0, 0.0, 0.0, 0.5], target_kl=0.05, target_kl_check_freq=4), 7)
+        # Below the threshold
+        self.assertEqual(self.count_gradient_steps([0.3], target_kl=0.05, target_kl_check_freq=4), 8)
+
+
+class TestTimeoutBootstrap(unittest.TestCase):
+    def check_bootstrap(self, policy, wrapper_class=None):
+        env = make_vec_env("Pendulum-v1", n_envs=N_ENVS, seed=0, wrapper_class=wrapper_class)
+        model = PPO(policy, env, n_steps=N_STEPS, seed=0)
+        callback = TerminalObservationCallback()
+        _, callback = model._setup_learn(N_STEPS * N_ENVS, callback)
+        with mock.patch.object(model.policy, "predict_values", wraps=model.policy.predict_values) as predict_values:
+            model.collect_rollouts(model.env, callback, model.rollout_buffer, n_rollout_steps=N_STEPS)
+        # The truncated envs are evaluated in a single forward pass (then come the values of the last observations)
+        self.assertEqual(len(callback.truncated), N_ENVS)
+        batch_sizes = []
+        for call in predict_values.call_args_list:
+            obs_tensor = call.args[0]
+            batch_sizes.append(len(obs_tensor["obs"] if isinstance(obs_tensor, dict) else obs_tensor))
+        self.assertEqual(batch_sizes, [N_ENVS, N_ENVS])
+
+        expected_rewards = np.array(callback.rewards)
+        # Bootstrap each env on its own
+        for step, env_idx, terminal_obs in callback.truncated:
+            obs_tensor = model.policy.obs_to_tensor(terminal_obs)[0]
+            with th.no_grad():
+                expected_rewards[step, env_idx] += model.gamma * model.policy.predict_values(obs_tensor)[0].item()
+        np.testing.assert_allclose(model.rollout_buffer.rewards, expected_rewards, rtol=1e-5, atol=1e-5)
+        self.assertTrue(np.any(model.rollout_buffer.rewards != np.array(callback.rewards)))
+        env.close()
+
+    def test_batched_bootstrap_matches_per_env_bootstrap(self):
+        self.check_bootstrap("MlpPolicy")
+
+    def test_batched_bootstrap_with_dict_observations(self):
+        self.check_bootstrap("MultiInputPolicy", wrapper_class=DictObservation)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+
+import numpy as np
+import torch as th
+from gymnasium import spaces
+from torch import nn
+
+from stable_baselines3 import PPO, SAC
+from stable_baselines3.common.policies import ContinuousCritic
+from stable_baselines3.common.torch_layers import EnsembleLinear, FlattenExtractor, create_ensemble_mlp, create_mlp
+
+N_MEMBERS = 3
+
+
+def copy_to_ensemble(linears, ensemble_linear):
+    """
+    Copy the weights of ``nn.Linear`` layers (one per member) into an ``EnsembleLinear``.
+    """
+    with th.no_grad():
+        for idx, linear in enumerate(linears):
+            ensemble_linear.weight[idx] = linear.weight.T
+            ensemble_linear.bias[idx, 0] = linear.bias
+
+
+def copy_networks_to_ensemble(networks, ensemble):
+    """
+    Copy the weights of MLPs (one per member) into the equivalent ensemble MLP.
+    """
+    network_linears = [[module for module in network if isinstance(module, nn.Linear)] for network in networks]
+    ensemble_linears = [module for module in ensemble if isinstance(module, EnsembleLinear)]
+    for layer_idx, ensemble_linear in enumerate(ensemble_linears):
+        copy_to_ensemble([linears[layer_idx] for linears in network_linears], ensemble_linear)
+
+
+class TestPolicyPredictor(unittest.TestCase):
+    def assert_same_actions(self, policy, **predictor_kwargs):
+        rng = np.random.default_rng(0)
+        predictor = policy.make_predictor(max_batch_size=8, **predictor_kwargs)
+        for observation in (rng.normal(size=3), rng.normal(size=(1, 3)), rng.normal(size=(8, 3))):
+            observation = observation.astype(np.float32)
+            expected, _ = policy.predict(observation, deterministic=True)
+            # Copy, the predictor returns a view on its output buffer
+            actions = predictor(observation).copy()
+            self.assertEqual(actions.shape, expected.shape)
+            np.testing.assert_allclose(actions, expected, rtol=1e-5, atol=1e-6)
+
+    def test_predictor_matches_predict(self):
+        model = PPO("MlpPolicy", "Pendulum-v1")
+        self.assert_same_actions(model.policy)
+        self.assert_same_actions(model.policy, inference_mode=False)
+
+    def test_squashed_predictor_matches_predict(self):
+        model = SAC("MlpPolicy", "Pendulum-v1")
+        self.assert_same_actions(model.policy)
+
+    def test_traced_predictor_matches_predict(self):
+        model = PPO("MlpPolicy", "Pendulum-v1")
+        self.assert_same_actions(model.policy, backend="script")
+
+
+class TestEnsembleCritic(unittest.TestCase):
+    def setUp(self):
+        th.manual_seed(0)
+
+    def assert_same_gradients(self, networks, ensemble):
+        ensemble_linears = [module for module in ensemble.modules() if isinstance(module, EnsembleLinear)]
+        for layer_idx, ensemble_linear in enumerate(ensemble_linears):
+            for member_idx, network in enumerate(networks):
+                linear = [module for module in network.modules() if isinstance(module, nn.Linear)][layer_idx]
+                th.testing.assert_close(ensemble_linear.weight.grad[member_idx], linear.weight.grad.T, rtol=1e-5, atol=1e-6)
+                th.testing.assert_close(ensemble_linear.bias.grad[member_idx, 0], linear.bias.grad, rtol=1e-5, atol=1e-6)
+
+    def check_ensemble(self, networks, ensemble, inputs):
+        """
+        Compare the outputs and gradients of ``ensemble`` with the ones of ``networks`` evaluated one after the other.
+
+        :param inputs: A ``(batch_size, in_features)`` input shared by all the members,
+            or a ``(n_members, batch_size, in_features)`` input
+        """
+        inputs = inputs.clone().requires_grad_(True)
+        ensemble_inputs = inputs.clone().detach().requires_grad_(True)
+        member_inputs = [inputs] * len(networks) if inputs.dim() == 2 else inputs.unbind(0)
+        outputs = th.stack([network(member_input) for network, member_input in zip(networks, member_inputs)])
+        ensemble_outputs = ensemble(ensemble_inputs)
+        th.testing.assert_close(ensemble_outputs, outputs, rtol=1e-5, atol=1e-6)
+
+        output_grad = th.randn_like(outputs)
+        outputs.backward(output_grad)
+        ensemble_outputs.backward(output_grad)
+        self.assert_same_gradients(networks, ensemble)
+        th.testing.assert_close(ensemble_inputs.grad, inputs.grad, rtol=1e-5, atol=1e-6)
+
+    def test_ensemble_linear(self):
+        for input_shape in ((8, 5), (N_MEMBERS, 8, 5)):
+            linears = [nn.Linear(5, 4) for _ in range(N_MEMBERS)]
+            ensemble = EnsembleLinear(N_MEMBERS, 5, 4)
+            copy_to_ensemble(linears, ensemble)
+            self.check_ensemble(linears, ensemble, th.randn(input_shape))
+
+    def test_ensemble_mlp(self):
+        for input_shape in ((8, 5), (N_MEMBERS, 8, 5)):
+            networks = [nn.Sequential(*create_mlp(5, 1, [16, 16])) for _ in range(N_MEMBERS)]
+            ensemble = nn.Sequential(*create_ensemble_mlp(N_MEMBERS, 5, 1, [16, 16]))
+            copy_networks_to_ensemble(networks, ensemble)
+            self.check_ensemble(networks, ensemble, th.randn(input_shape))
+
+    def test_batched_critics(self):
+        observation_space = spaces.Box(-1.0, 1.0, shape=(3,), dtype=np.float32)
+        action_space = spaces.Box(-1.0, 1.0, shape=(2,), dtype=np.float32)
+        critics = [
+            ContinuousCritic(
+                observation_space,
+                action_space,
+                [16, 16],
+                FlattenExtractor(observation_space),
+                3,
+                n_critics=N_MEMBERS,
+                batched_critics=batched_critics,
+            )
+            for batched_critics in (False, True)
+        ]
+        critic, batched_critic = critics
+        copy_networks_to_ensemble(critic.q_networks, batched_critic.q_ensemble)
+
+        observations, actions = th.randn(8, 3), th.randn(8, 2)
+        q_values, batched_q_values = (th.stack(critic_(observations, actions)) for critic_ in critics)
+        self.assertEqual(batched_q_values.shape, (N_MEMBERS, 8, 1))
+        th.testing.assert_close(batched_q_values, q_values, rtol=1e-5, atol=1e-6)
+        th.testing.assert_close(batched_critic.q1_forward(observations, actions), critic.q1_forward(observations, actions))
+
+        output_grad = th.randn_like(q_values)
+        q_values.backward(output_grad)
+        batched_q_values.backward(output_grad)
+        self.assert_same_gradients(critic.q_networks, batched_critic.q_ensemble)
+
+
+if __name__ == '__main__':
+    unittest.main()
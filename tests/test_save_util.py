@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+import torch as th
+
+from stable_baselines3 import SAC
+from stable_baselines3.common import save_util
+
+
+class TestSaveCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.model = SAC("MlpPolicy", "Pendulum-v1", learning_starts=10, policy_kwargs=dict(net_arch=[16]))
+        self.model.learn(20)
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def assert_same_model(self, loaded):
+        for (name, value), (loaded_name, loaded_value) in zip(
+            self.model.policy.state_dict().items(), loaded.policy.state_dict().items()
+        ):
+            self.assertEqual(name, loaded_name)
+            th.testing.assert_close(value, loaded_value)
+        th.testing.assert_close(self.model.log_ent_coef, loaded.log_ent_coef)
+        self.assertEqual(self.model.num_timesteps, loaded.num_timesteps)
+        observation = np.zeros((1, 3), dtype=np.float32)
+        np.testing.assert_allclose(
+            loaded.predict(observation, deterministic=True)[0], self.model.predict(observation, deterministic=True)[0]
+        )
+
+    def test_round_trip(self):
+        for as_directory in (False, True):
+            for asynchronous in (False, True):
+                path = os.path.join(self.folder.name, f"model_{as_directory}_{asynchronous}")
+                future = self.model.save(path, asynchronous=asynchronous, as_directory=as_directory)
+                if asynchronous:
+                    future.result()
+                else:
+                    self.assertIsNone(future)
+                if not as_directory:
+                    path += ".zip"
+                self.assertEqual(os.path.isdir(path), as_directory)
+                self.assert_same_model(SAC.load(path))
+                if as_directory:
+                    self.assert_same_model(SAC.load(path, mmap=True))
+        # Only the checkpoints are left
+        self.assertEqual(len(os.listdir(self.folder.name)), 4)
+
+    def test_asynchronous_save_is_a_snapshot(self):
+        path = os.path.join(self.folder.name, "model")
+        expected = {name: value.clone() for name, value in self.model.policy.state_dict().items()}
+        started, modified = threading.Event(), threading.Event()
+        write_checkpoint = save_util._write_checkpoint
+
+        def wait_and_write_checkpoint(*args, **kwargs):
+            started.set()
+            modified.wait()
+            write_checkpoint(*args, **kwargs)
+
+        with mock.patch.object(save_util, "_write_checkpoint", side_effect=wait_and_write_checkpoint):
+            future = self.model.save(path, asynchronous=True)
+            started.wait()
+            # The parameters keep being updated while the checkpoint is written
+            with th.no_grad():
+                for param in self.model.policy.parameters():
+                    param.add_(1.0)
+            modified.set()
+            future.result()
+        loaded = SAC.load(path + ".zip")
+        for name, value in loaded.policy.state_dict().items():
+            th.testing.assert_close(value, expected[name])
+
+    def test_interrupted_save_leaves_no_partial_checkpoint(self):
+        params = self.model.get_parameters()
+        for as_directory in (False, True):
+            for asynchronous in (False, True):
+                path = os.path.join(self.folder.name, f"model_{as_directory}_{asynchronous}")
+                save_util.save_checkpoint(path, params=params, as_directory=as_directory, asynchronous=False)
+                saved_files = sorted(os.listdir(self.folder.name))
+                # Fail once some of the files are written
+                with mock.patch.object(save_util.th, "save", side_effect=[None, KeyboardInterrupt()]):
+                    with self.assertRaises(KeyboardInterrupt):
+                        future = save_util.save_checkpoint(
+                            path, params=params, as_directory=as_directory, asynchronous=asynchronous
+                        )
+                        if asynchronous:
+                            future.result()
+                # The previous checkpoint is kept, and the temporary files are removed
+                self.assertEqual(sorted(os.listdir(self.folder.name)), saved_files)
+                _, loaded_params, _ = save_util.load_from_zip_file(path if as_directory else path + ".zip")
+                self.assertEqual(loaded_params.keys(), params.keys())
+                for name, state_dict in params.items():
+                    for key, value in state_dict.items():
+                        if isinstance(value, th.Tensor):
+                            th.testing.assert_close(loaded_params[name][key], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import gymnasium as gym
+import numpy as np
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import ReduceSharedStatisticsCallback
+from stable_baselines3.common.running_mean_std import RunningMeanStd
+from stable_baselines3.common.shared_running_mean_std import SharedNormalizeObservation, SharedRunningMeanStd
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+
+def make_normalized_env(client):
+    return SharedNormalizeObservation(gym.make("Pendulum-v1"), client)
+
+
+class TestSharedRunningMeanStd(unittest.TestCase):
+    def test_reduce_merges_the_moments_of_the_workers(self):
+        n_envs, n_steps, sync_interval = 3, 49, 10
+        shared_rms = SharedRunningMeanStd(shape=(3,), n_workers=n_envs)
+        # One env per worker process, the clients (and the lock) are pickled to the workers
+        clients = [shared_rms.client(idx, sync_interval) for idx in range(n_envs)]
+        env = SubprocVecEnv([lambda client=client: make_normalized_env(client) for client in clients])
+        raw_env = DummyVecEnv([lambda: gym.make("Pendulum-v1")] * n_envs)
+        actions = np.random.default_rng(0).uniform(-2, 2, size=(n_steps, n_envs, 1)).astype(np.float32)
+
+        expected = RunningMeanStd(shape=(3,))
+        for vec_env in (env, raw_env):
+            vec_env.seed(0)
+            observations = [vec_env.reset()]
+            for step_actions in actions:
+                observations.append(vec_env.step(step_actions)[0])
+            if vec_env is raw_env:
+                expected.update(np.concatenate(observations))
+
+        # One reset and 49 steps: each worker pushed its moments 5 times
+        self.assertEqual(shared_rms.reduce(), n_envs * (n_steps + 1))
+        np.testing.assert_allclose(shared_rms.rms.mean, expected.mean, rtol=1e-6)
+        np.testing.assert_allclose(shared_rms.rms.var, expected.var, rtol=1e-6)
+        self.assertAlmostEqual(shared_rms.rms.count, expected.count)
+        # Nothing left to merge
+        self.assertEqual(shared_rms.reduce(), 0)
+
+        # The workers normalize with the merged statistics after their next synchronization
+        for _ in range(sync_interval):
+            obs, *_ = env.step(actions[0])
+        raw_obs = np.stack([raw_env.step(actions[0])[0] for _ in range(sync_interval)])[-1]
+        expected_obs = np.clip((raw_obs - expected.mean) / np.sqrt(expected.var + 1e-8), -10, 10)
+        np.testing.assert_allclose(obs, expected_obs, rtol=1e-4, atol=1e-5)
+
+        env.close()
+        raw_env.close()
+        shared_rms.close()
+
+
+class TestReduceSharedStatisticsCallback(unittest.TestCase):
+    def test_statistics_are_reduced_during_training(self):
+        n_envs = 2
+        shared_rms = SharedRunningMeanStd(shape=(3,), n_workers=n_envs)
+        clients = [shared_rms.client(idx, sync_interval=10) for idx in range(n_envs)]
+        env = DummyVecEnv(
+            [lambda client=client: SharedNormalizeObservation(gym.make("Pendulum-v1"), client) for client in clients]
+        )
+        model = PPO("MlpPolicy", env, n_steps=64, batch_size=64, n_epochs=1)
+
+        callback = ReduceSharedStatisticsCallback(shared_rms, reduce_freq=50)
+        calls = []
+        reduce = shared_rms.reduce
+        shared_rms.reduce = lambda: calls.append(reduce()) or calls[-1]
+        model.learn(256, callback=callback)
+
+        # Every 50 timesteps (2 envs: every 25 steps), and at the end of training
+        self.assertEqual(len(calls), 256 // 50 + 1)
+        self.assertGreater(sum(calls), 0)
+        self.assertAlmostEqual(shared_rms.rms.count, sum(calls) + 1e-4)
+        # The workers pull the merged statistics back
+        clients[0].pull()
+        np.testing.assert_allclose(clients[0].rms.mean, shared_rms.rms.mean)
+        self.assertNotEqual(np.abs(shared_rms.rms.mean).sum(), 0.0)
+
+        env.close()
+        shared_rms.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
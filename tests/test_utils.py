@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+import torch as th
+from gymnasium import spaces
+
+from stable_baselines3 import DQN, SAC
+from stable_baselines3.common.utils import sample_actions
+
+N_SAMPLES = 2000
+
+ACTION_SPACES = {
+    "box": spaces.Box(-2.0, np.array([1.0, 3.0]), dtype=np.float32),
+    "box_unbounded": spaces.Box(
+        np.array([-np.inf, -np.inf, 0.0, -1.0]), np.array([np.inf, 1.0, np.inf, 1.0]), dtype=np.float64
+    ),
+    "box_int": spaces.Box(-3, 3, shape=(2,), dtype=np.int64),
+    "discrete": spaces.Discrete(4, start=2),
+    "multi_discrete": spaces.MultiDiscrete([2, 5, 3]),
+    "multi_binary": spaces.MultiBinary(3),
+}
+
+
+class TestSampleActions(unittest.TestCase):
+    def test_samples_are_valid(self):
+        for name, action_space in ACTION_SPACES.items():
+            with self.subTest(name):
+                action_space.seed(0)
+                actions = sample_actions(action_space, N_SAMPLES)
+                self.assertEqual(actions.shape, (N_SAMPLES, *action_space.shape))
+                self.assertEqual(actions.dtype, action_space.dtype)
+                for action in actions:
+                    self.assertTrue(action_space.contains(action), f"{action} is not in {action_space}")
+
+    def test_discrete_samples_cover_the_space(self):
+        for name in ("box_int", "discrete", "multi_discrete", "multi_binary"):
+            action_space = ACTION_SPACES[name]
+            with self.subTest(name):
+                action_space.seed(0)
+                actions = sample_actions(action_space, N_SAMPLES).reshape(N_SAMPLES, -1)
+                # Same values as ``action_space.sample()``
+                expected = np.array([action_space.sample() for _ in range(N_SAMPLES)]).reshape(N_SAMPLES, -1)
+                for dim in range(actions.shape[1]):
+                    self.assertEqual(set(actions[:, dim]), set(expected[:, dim]))
+
+    def test_bounded_box_samples_are_uniform(self):
+        action_space = ACTION_SPACES["box"]
+        action_space.seed(0)
+        actions = sample_actions(action_space, N_SAMPLES)
+        np.testing.assert_allclose(actions.mean(axis=0), (action_space.low + action_space.high) / 2, atol=0.1)
+
+    def test_seeded_samples_are_reproducible(self):
+        for name, action_space in ACTION_SPACES.items():
+            with self.subTest(name):
+                action_space.seed(0)
+                actions = sample_actions(action_space, 10)
+                action_space.seed(0)
+                np.testing.assert_array_equal(sample_actions(action_space, 10), actions)
+                # The generator of the space moves on
+                self.assertFalse(np.array_equal(sample_actions(action_space, 10), actions))
+
+
+class TestPolicyAction(unittest.TestCase):
+    def test_policy_action_matches_predict(self):
+        for model in (
+            SAC("MlpPolicy", "Pendulum-v1", policy_kwargs=dict(net_arch=[16])),
+            DQN("MlpPolicy", "CartPole-v1", policy_kwargs=dict(net_arch=[16])),
+        ):
+            observations = np.stack([model.observation_space.sample() for _ in range(4)])
+            model.policy.set_training_mode(True)
+            th.manual_seed(0)
+            actions = model._policy_action(model.policy, observations)
+            self.assertFalse(model.policy.training)
+            th.manual_seed(0)
+            expected, _ = model.policy.predict(observations, deterministic=False)
+            self.assertEqual(actions.shape, expected.shape)
+            self.assertEqual(actions.dtype, expected.dtype)
+            np.testing.assert_allclose(actions, expected, rtol=1e-6)
+            self.assertTrue(all(model.action_space.contains(action) for action in actions))
+
+
+if __name__ == '__main__':
+    unittest.main()
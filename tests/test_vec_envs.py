@@ -0,0 +1,115 @@
+import functools
+import unittest
+
+import gymnasium as gym
+import numpy as np
+
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
+
+N_ENVS = 5
+
+
+class OutcomeEnv(gym.Env):
+    """
+    Env whose episodes last ``episode_length`` steps, with a reward equal to the step index.
+    Like the flight envs, the outcome is only reported in the info dict at the end of an episode.
+    """
+
+    observation_space = gym.spaces.Box(-1.0, 1.0, shape=(1,))
+    action_space = gym.spaces.Discrete(2)
+
+    def __init__(self, episode_length):
+        self.episode_length = episode_length
+        self.n_steps = 0
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.n_steps = 0
+        return np.zeros(1, dtype=np.float32), {}
+
+    def step(self, action):
+        self.n_steps += 1
+        info = {"step": self.n_steps}
+        terminated = self.n_steps == self.episode_length
+        if terminated:
+            info["outcome"] = "reached" if self.episode_length % 2 == 0 else "timeout"
+            info["is_success"] = self.episode_length % 2 == 0
+        return np.zeros(1, dtype=np.float32), float(self.n_steps), terminated, False, info
+
+
+def run_steps(vec_env, n_steps=100):
+    vec_env.seed(0)
+    rng = np.random.default_rng(0)
+    results = [vec_env.reset()]
+    for _ in range(n_steps):
+        obs, rewards, dones, infos = vec_env.step(rng.integers(0, 2, size=N_ENVS))
+        terminal_obs = [info["terminal_observation"] for info, done in zip(infos, dones) if done]
+        results.extend([obs, rewards, dones, *terminal_obs])
+    vec_env.close()
+    return results
+
+
+class TestSubprocVecEnv(unittest.TestCase):
+    def setUp(self):
+        self.env_fns = [functools.partial(gym.make, "CartPole-v1")] * N_ENVS
+        self.expected = run_steps(DummyVecEnv(self.env_fns))
+
+    def assert_same_results(self, vec_env):
+        results = run_steps(vec_env)
+        self.assertEqual(len(results), len(self.expected))
+        for result, expected in zip(results, self.expected):
+            np.testing.assert_array_equal(result, expected)
+
+    def test_chunked_workers_match_dummy_vec_env(self):
+        vec_env = SubprocVecEnv(self.env_fns, num_workers=2)
+        self.assertEqual(len(vec_env.remotes), 2)
+        self.assert_same_results(vec_env)
+
+    def test_shared_memory_matches_dummy_vec_env(self):
+        self.assert_same_results(SubprocVecEnv(self.env_fns, shared_memory=True))
+
+    def test_chunked_workers_with_shared_memory_match_dummy_vec_env(self):
+        self.assert_same_results(SubprocVecEnv(self.env_fns, shared_memory=True, num_workers=3))
+
+
+class TestVecMonitor(unittest.TestCase):
+    def check_episodes(self, vec_env_cls):
+        episode_lengths = [2, 3, 5]
+        env = VecMonitor(
+            vec_env_cls([functools.partial(OutcomeEnv, length) for length in episode_lengths]),
+            info_keywords=("is_success", "outcome"),
+        )
+        env.reset()
+        episodes = [[] for _ in episode_lengths]
+        for step in range(1, 31):
+            _, _, dones, infos = env.step(np.zeros(len(episode_lengths), dtype=np.int64))
+            for env_idx, (done, info) in enumerate(zip(dones, infos)):
+                # Only the envs that are done are updated, the others must not need the info keywords
+                self.assertEqual("episode" in info, done)
+                self.assertEqual(done, step % episode_lengths[env_idx] == 0)
+                if done:
+                    episodes[env_idx].append(info["episode"])
+            np.testing.assert_array_equal(env.episode_lengths, [step % length for length in episode_lengths])
+            np.testing.assert_array_equal(
+                env.episode_returns, [(step % length) * (step % length + 1) / 2 for length in episode_lengths]
+            )
+        env.close()
+
+        self.assertEqual(env.episode_count, sum(30 // length for length in episode_lengths))
+        for length, env_episodes in zip(episode_lengths, episodes):
+            self.assertEqual(len(env_episodes), 30 // length)
+            for episode in env_episodes:
+                self.assertEqual(episode["l"], length)
+                self.assertEqual(episode["r"], length * (length + 1) / 2)
+                self.assertEqual(episode["is_success"], length % 2 == 0)
+                self.assertEqual(episode["outcome"], "reached" if length % 2 == 0 else "timeout")
+
+    def test_dummy_vec_env(self):
+        self.check_episodes(DummyVecEnv)
+
+    def test_subproc_vec_env(self):
+        self.check_episodes(SubprocVecEnv)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import VecNormalize
+
+N_ENVS = 2
+# Longer than an episode of Pendulum (200 steps), so terminal observations are normalized too
+N_STEPS = 230
+
+
+def run_vec_normalize(**kwargs):
+    """
+    Reset and step a ``VecNormalize`` on Pendulum with fixed actions.
+
+    :return: for the reset and each step, the original and normalized observations and rewards,
+        the normalized terminal observations and the statistics after the step
+    """
+    env = VecNormalize(make_vec_env("Pendulum-v1", n_envs=N_ENVS, seed=0), **kwargs)
+    rng = np.random.default_rng(0)
+    # Copy, the in-place normalization reuses its output buffers
+    obs = env.reset().copy()
+    rewards = np.zeros(N_ENVS)
+    terminal_obs = []
+    batches = []
+    for step in range(N_STEPS + 1):
+        if step > 0:
+            obs, rewards, _, infos = env.step(rng.uniform(-2, 2, size=(N_ENVS, 1)).astype(np.float32))
+            obs = obs.copy()
+            terminal_obs = [info["terminal_observation"] for info in infos if "terminal_observation" in info]
+        batches.append(
+            dict(
+                original_obs=env.get_original_obs(),
+                obs=obs,
+                original_rewards=env.get_original_reward() if step > 0 else rewards,
+                rewards=rewards,
+                terminal_obs=terminal_obs,
+                stats=(env.obs_rms.mean.copy(), env.obs_rms.var.copy(), env.ret_rms.var.copy()),
+            )
+        )
+    env.close()
+    return batches
+
+
+class TestVecNormalize(unittest.TestCase):
+    def test_inplace_matches_default(self):
+        expected = run_vec_normalize()
+        batches = run_vec_normalize(inplace=True)
+        self.assertEqual(sum(len(batch["terminal_obs"]) for batch in batches), N_ENVS)
+        for batch, expected_batch in zip(batches, expected):
+            self.assertEqual(batch["obs"].dtype, np.float32)
+            np.testing.assert_allclose(batch["obs"], expected_batch["obs"], rtol=1e-5, atol=1e-5)
+            np.testing.assert_allclose(batch["rewards"], expected_batch["rewards"], rtol=1e-5, atol=1e-5)
+            self.assertEqual(len(batch["terminal_obs"]), len(expected_batch["terminal_obs"]))
+            for terminal_obs, expected_terminal_obs in zip(batch["terminal_obs"], expected_batch["terminal_obs"]):
+                np.testing.assert_allclose(terminal_obs, expected_terminal_obs, rtol=1e-5, atol=1e-5)
+
+    def test_update_interval_matches_default_at_each_update(self):
+        interval = 7
+        epsilon, clip = 1e-8, 10.0
+        expected = run_vec_normalize()
+        initial_stats = (np.zeros(3), np.ones(3), np.ones(()))
+        for inplace in (False, True):
+            batches = run_vec_normalize(inplace=inplace, stats_update_interval=interval)
+            for idx, batch in enumerate(batches):
+                # The statistics are updated every `interval` batches, with all the batches since the last update
+                last_update = (idx + 1) // interval * interval - 1
+                mean, var, ret_var = expected[last_update]["stats"] if last_update >= 0 else initial_stats
+                for value, expected_value in zip(batch["stats"], (mean, var, ret_var)):
+                    np.testing.assert_allclose(value, expected_value, rtol=1e-6, atol=1e-8)
+                # And the batch is normalized with the statistics after this update
+                expected_obs = np.clip((batch["original_obs"] - mean) / np.sqrt(var + epsilon), -clip, clip)
+                expected_rewards = np.clip(batch["original_rewards"] / np.sqrt(ret_var + epsilon), -clip, clip)
+                np.testing.assert_allclose(batch["obs"], expected_obs, rtol=1e-5, atol=1e-5)
+                np.testing.assert_allclose(batch["rewards"], expected_rewards, rtol=1e-5, atol=1e-5)
+
+    def test_inplace_scale_follows_the_statistics(self):
+        env = VecNormalize(make_vec_env("Pendulum-v1", n_envs=N_ENVS, seed=0), inplace=True)
+        env.reset()
+        obs = env.get_original_obs()
+        # Updates of the statistics outside of the steps
+        for update in (
+            lambda: env.obs_rms.update(obs * 3.0),
+            lambda: env.obs_rms.update_from_moments(np.ones(3), np.full(3, 4.0), 10),
+        ):
+            update()
+            np.testing.assert_allclose(env._normalize_obs_inplace(obs), env.normalize_obs(obs), rtol=1e-5, atol=1e-5)
+        env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,7 +50,8 @@ def main():
     # Create a wrapped, monitored VecEnv
     envs = make_vec_env(config.env_config.env_train,
                         n_envs=config.training.num_processes,
-                        monitor_kwargs={'info_keywords': ["is_success"]})   # Create ShmemVecEnv Object (Wrapper of Vectorized Env)
+                        monitor_kwargs={'info_keywords': ("is_success", "outcome")},
+                        vec_monitor=True)   # Create ShmemVecEnv Object (Wrapper of Vectorized Env)
     eval_env = make_vec_env(config.env_config.env_eval, 3)
     #################################################
     #### 1. RL network (Ego agent)